@@ -0,0 +1,57 @@
+"""Compare speed of compiled loaders with marshmallow when parsing list responses
+
+Run with: python -m benchmarks.deserialization
+"""
+import copy
+import timeit
+
+from gradient.api_sdk import serializers
+from tests import example_responses
+
+COUNT = 2000
+REPEAT = 5
+
+
+def get_cases():
+    notebooks = example_responses.NOTEBOOKS_LIST_RESPONSE_JSON["notebookList"]
+    for notebook in notebooks:
+        notebook["id"] = notebook["handle"]
+
+    return [
+        (serializers.NotebookSchema, notebooks),
+        (serializers.MachineSchema, example_responses.LIST_MACHINES_RESPONSE),
+        (serializers.Model, example_responses.LIST_MODELS_RESPONSE_JSON["modelList"]),
+        (serializers.DatasetVersionSchema, example_responses.LIST_DATASET_VERSIONS_RESPONSE),
+        (serializers.LogRowSchema, example_responses.DEPLOYMENTS_LOGS_RESPONSE),
+    ]
+
+
+def parse_with_marshmallow(schema_cls, items):
+    # how repositories parsed lists before: new schema and full marshmallow load for every object
+    for item in items:
+        schema = schema_cls()
+        schema._compiled_loader = None
+        schema.get_instance(item)
+
+
+def parse_with_compiled_loader(schema_cls, items):
+    schema = schema_cls.get_shared_instance()
+    schema.get_instance(items, many=True)
+
+
+def main():
+    print("{:<24} {:>12} {:>12} {:>8}".format("schema", "marshmallow", "compiled", "speedup"))
+    for schema_cls, examples in get_cases():
+        items = [copy.deepcopy(examples[i % len(examples)]) for i in range(COUNT)]
+        # warm up caches of both paths
+        parse_with_marshmallow(schema_cls, items[:1])
+        parse_with_compiled_loader(schema_cls, items[:1])
+
+        slow = min(timeit.repeat(lambda: parse_with_marshmallow(schema_cls, items), number=1, repeat=REPEAT))
+        fast = min(timeit.repeat(lambda: parse_with_compiled_loader(schema_cls, items), number=1, repeat=REPEAT))
+        print("{:<24} {:>10.1f}ms {:>10.1f}ms {:>7.1f}x".format(
+            schema_cls.__name__, slow * 1000, fast * 1000, slow / fast))
+
+
+if __name__ == "__main__":
+    main()
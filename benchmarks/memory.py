@@ -0,0 +1,60 @@
+"""Compare memory used by model instances and their slotted variants, and by log rows
+kept in a list and in columnar LogRows
+
+Run with: python -m benchmarks.memory
+"""
+import copy
+import gc
+import tracemalloc
+
+from gradient.api_sdk import serializers
+from gradient.api_sdk.models import LogRow, LogRows, get_slotted_class
+from tests import example_responses
+
+COUNT = 10000
+
+
+def get_cases():
+    notebooks = example_responses.NOTEBOOKS_LIST_RESPONSE_JSON["notebookList"]
+    for notebook in notebooks:
+        notebook["id"] = notebook["handle"]
+
+    return [
+        (serializers.NotebookSchema, notebooks),
+        (serializers.MachineSchema, example_responses.LIST_MACHINES_RESPONSE),
+        (serializers.Model, example_responses.LIST_MODELS_RESPONSE_JSON["modelList"]),
+        (serializers.DatasetVersionSchema, example_responses.LIST_DATASET_VERSIONS_RESPONSE),
+    ]
+
+
+def measure(create):
+    """Get number of bytes allocated per object by create() and kept after it returned"""
+    gc.collect()
+    tracemalloc.start()
+    objects = create()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size / float(len(objects))
+
+
+def main():
+    print("{:<24} {:>10} {:>10} {:>8}".format("objects", "plain", "compact", "saved"))
+    for schema_cls, examples in get_cases():
+        schema = schema_cls.get_shared_instance()
+        data = [schema._load(copy.deepcopy(examples[i % len(examples)])) for i in range(COUNT)]
+        model = schema.MODEL
+        slotted_model = get_slotted_class(model)
+
+        plain = measure(lambda: [model(**d) for d in data])
+        compact = measure(lambda: [slotted_model(**d) for d in data])
+        print("{:<24} {:>9.0f}B {:>9.0f}B {:>7.0%}".format(model.__name__, plain, compact, 1 - compact / plain))
+
+    messages = ["log line {}".format(i) for i in range(COUNT)]
+    timestamps = ["2020-05-11T11:27:56.552Z"] * COUNT
+    plain = measure(lambda: [LogRow(i + 100000, messages[i], timestamps[i]) for i in range(COUNT)])
+    compact = measure(lambda: LogRows(LogRow(i + 100000, messages[i], timestamps[i]) for i in range(COUNT)))
+    print("{:<24} {:>9.0f}B {:>9.0f}B {:>7.0%}".format("LogRow", plain, compact, 1 - compact / plain))
+
+
+if __name__ == "__main__":
+    main()
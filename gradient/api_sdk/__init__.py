@@ -4,3 +4,6 @@ from .models import *
 from .repositories import *
 from .archivers import ZipArchiver
 from .sdk_exceptions import *
+from .retry import RetryPolicy
+from .response_cache import ResponseCache
+from .batch import BatchResult
@@ -0,0 +1,49 @@
+from concurrent.futures import ThreadPoolExecutor
+
+
+class BatchResult(object):
+    def __init__(self, item, result=None, error=None):
+        """Result of one call of a batch
+
+        :param item: argument the call was made with, like resource ID
+        :param result: value returned by the call
+        :param Exception error: exception raised by the call
+        """
+        self.item = item
+        self.result = result
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        if self.ok:
+            return "BatchResult({!r}, result={!r})".format(self.item, self.result)
+        return "BatchResult({!r}, error={!r})".format(self.item, self.error)
+
+
+def run_many(fn, items, max_workers):
+    """Call ``fn(item)`` for every item using at most ``max_workers`` threads
+
+    An exception raised for one item does not stop other calls, it is returned
+    in the item's result instead.
+
+    :param callable fn:
+    :param list items:
+    :param int max_workers:
+    :return: results in the order of items
+    :rtype: list[BatchResult]
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    def call(item):
+        try:
+            return BatchResult(item, result=fn(item))
+        except Exception as e:
+            return BatchResult(item, error=e)
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(call, items))
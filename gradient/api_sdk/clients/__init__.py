@@ -12,3 +12,4 @@ from .storage_provider_client import StorageProvidersClient
 from .workflow_client import WorkflowsClient
 
 from .sdk_client import SdkClient
+from .async_sdk_client import AsyncSdkClient
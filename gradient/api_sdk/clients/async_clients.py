@@ -0,0 +1,314 @@
+from .async_http_client import AsyncSessionPool
+from .. import logger as sdk_logger
+from .. import models, repositories
+from ..repositories.async_common import AsyncRepository
+from ..repositories.machines import DeleteMachine, ListMachines
+
+
+class AsyncBaseClient(object):
+    def __init__(
+            self,
+            api_key,
+            ps_client_name=None,
+            logger=sdk_logger.MuteLogger(),
+            session_pool=None,
+            retry_policy=None,
+    ):
+        """
+        Base class of asynchronous clients. All methods sending requests are coroutines.
+
+        :param str api_key: your API key
+        :param str ps_client_name:
+        :param sdk_logger.Logger logger:
+        :param AsyncSessionPool session_pool: connection pool shared by all repositories
+        :param gradient.api_sdk.retry.RetryPolicy retry_policy: retry policy used instead of repositories' defaults
+        """
+        self.api_key = api_key
+        self.ps_client_name = ps_client_name
+        self.logger = logger
+        self.session_pool = session_pool or AsyncSessionPool()
+        self.retry_policy = retry_policy
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        """Close all pooled connections"""
+        await self.session_pool.close()
+
+    def build_repository(self, repository_class, *args, **kwargs):
+        """
+        :param type[BaseRepository] repository_class:
+        :rtype: AsyncRepository
+        """
+        if self.ps_client_name is not None and kwargs.get("ps_client_name") is None:
+            kwargs = dict(kwargs, ps_client_name=self.ps_client_name)
+
+        if self.retry_policy is not None and kwargs.get("retry_policy") is None:
+            kwargs = dict(kwargs, retry_policy=self.retry_policy)
+
+        repository = repository_class(*args, api_key=self.api_key, logger=self.logger, **kwargs)
+        return AsyncRepository(repository, self.session_pool)
+
+
+class AsyncNotebooksClient(AsyncBaseClient):
+    async def get(self, id):
+        """Get Notebook
+
+        :param str id: Notebook ID
+        :rtype: models.Notebook
+        """
+        repository = self.build_repository(repositories.GetNotebook)
+        notebook = await repository.get(id=id)
+        return notebook
+
+    async def list(self, tags=None, limit=None, offset=None, get_meta=False):
+        """Get list of Notebooks
+
+        :rtype: list[models.Notebook]
+        """
+        repository = self.build_repository(repositories.ListNotebooks)
+        notebooks = await repository.list(tags=tags, limit=limit, offset=offset, get_meta=get_meta)
+        return notebooks
+
+    async def start(self, id, machine_type, cluster_id=None, shutdown_timeout=None, is_preemptible=None):
+        """Start existing notebook
+
+        :param str|int id:
+        :param str machine_type:
+        :param str cluster_id:
+        :param int shutdown_timeout:
+        :param bool is_preemptible:
+
+        :return: Notebook ID
+        :rtype str:
+        """
+        notebook = models.NotebookStart(
+            notebook_id=id,
+            machine_type=machine_type,
+            cluster_id=cluster_id,
+            shutdown_timeout=shutdown_timeout,
+            is_preemptible=is_preemptible,
+        )
+
+        repository = self.build_repository(repositories.StartNotebook)
+        handle = await repository.create(notebook)
+        return handle
+
+    async def stop(self, id):
+        """Stop existing notebook
+
+        :param str|int id: Notebook ID
+        """
+        repository = self.build_repository(repositories.StopNotebook)
+        await repository.stop(id)
+
+    async def delete(self, id):
+        """Delete existing notebook
+
+        :param str id: Notebook ID
+        """
+        repository = self.build_repository(repositories.DeleteNotebook)
+        await repository.delete(id)
+
+
+class AsyncMachinesClient(AsyncBaseClient):
+    async def get(self, id):
+        """Get machine instance
+
+        :param str id: ID of a machine [required]
+
+        :return: Machine instance
+        :rtype: models.Machine
+        """
+        repository = self.build_repository(repositories.GetMachine)
+        machine = await repository.get(id=id)
+        return machine
+
+    async def list(self, **filters):
+        """Get list of machines. Accepts the same filters as MachinesClient.list
+
+        :return: List of machines
+        :rtype: list[models.Machine]
+        """
+        repository = self.build_repository(ListMachines)
+        machines = await repository.list(**filters)
+        return machines
+
+    async def start(self, id):
+        """Start machine instance
+
+        :param str id: id of the machine
+        """
+        repository = self.build_repository(repositories.StartMachine)
+        await repository.start(id)
+
+    async def stop(self, id):
+        """Stop machine instance
+
+        :param str id: id of the machine
+        """
+        repository = self.build_repository(repositories.StopMachine)
+        await repository.stop(id)
+
+    async def restart(self, id):
+        """Restart machine instance
+
+        :param str id: id of the machine
+        """
+        repository = self.build_repository(repositories.RestartMachine)
+        await repository.restart(id)
+
+    async def delete(self, machine_id, release_public_ip=False):
+        """Destroy machine with given ID
+
+        :param str machine_id: ID of the machine
+        :param bool release_public_ip: If the assigned public IP should be released
+        """
+        repository = self.build_repository(DeleteMachine)
+        await repository.delete(machine_id, release_public_ip=release_public_ip)
+
+
+class AsyncDatasetsClient(AsyncBaseClient):
+    async def list(self, limit=20, offset=0):
+        """Get a list of datasets
+
+        :param int limit: Limit results
+        :param int offset: Skip results
+
+        :returns: List of datasets
+        :rtype: list[models.Dataset]
+        """
+        repository = self.build_repository(repositories.ListDatasets)
+        return await repository.list(limit=limit, offset=offset)
+
+    async def get(self, dataset_id):
+        """Get a dataset
+
+        :param str dataset_id: Dataset ID [required]
+
+        :returns: Dataset
+        :rtype: models.Dataset
+        """
+        repository = self.build_repository(repositories.GetDataset)
+        return await repository.get(id=dataset_id)
+
+    async def get_ref(self, dataset_ref):
+        """Get dataset with resolved version by reference
+
+        :param str dataset_ref: Dataset reference [required]
+
+        :returns: Dataset with resolved version
+        :rtype: models.DatasetRef
+        """
+        repository = self.build_repository(repositories.GetDatasetRef)
+        return await repository.get(id=dataset_ref)
+
+    async def delete(self, dataset_id):
+        """Delete a dataset
+
+        :param str dataset_id: Dataset ID [required]
+        """
+        repository = self.build_repository(repositories.DeleteDataset)
+        await repository.delete(dataset_id)
+
+
+class AsyncModelsClient(AsyncBaseClient):
+    async def list(self, project_id=None, tags=None):
+        """Get list of models
+
+        :param str project_id: Project ID to filter models
+        :param list[str]|tuple[str] tags: tags to filter models
+
+        :returns: List of Model instances
+        :rtype: list[models.Model]
+        """
+        repository = self.build_repository(repositories.ListModels)
+        return await repository.list(project_id=project_id, tags=tags)
+
+    async def get(self, model_id):
+        """Get model instance
+
+        :param str model_id:
+        :return: Model instance
+        :rtype: models.Model
+        """
+        repository = self.build_repository(repositories.GetModel)
+        return await repository.get(model_id=model_id)
+
+    async def delete(self, model_id):
+        """Delete a model
+
+        :param str model_id: Model ID
+        """
+        repository = self.build_repository(repositories.DeleteModel)
+        await repository.delete(model_id)
+
+
+class AsyncProjectsClient(AsyncBaseClient):
+    async def list(self, tags=None):
+        """Get list of your projects
+
+        :param list[str]|tuple[str] tags: tags to filter with OR
+
+        :returns: list of projects
+        :rtype: list[models.Project]
+        """
+        repository = self.build_repository(repositories.ListProjects)
+        return await repository.list(tags=tags)
+
+    async def get(self, project_id):
+        repository = self.build_repository(repositories.GetProject)
+        return await repository.get(id=project_id)
+
+    async def delete(self, project_id):
+        repository = self.build_repository(repositories.DeleteProject)
+        await repository.delete(project_id)
+
+
+class AsyncWorkflowsClient(AsyncBaseClient):
+    async def list(self, project_id):
+        """List workflows by project
+
+        :param str project_id: project ID
+
+        :returns: list of workflows
+        :rtype: list[models.Workflow]
+        """
+        repository = self.build_repository(repositories.ListWorkflows)
+        return await repository.list(project_id=project_id)
+
+    async def get(self, workflow_id):
+        """Get a Workflow
+
+        :param str workflow_id: Workflow ID [required]
+
+        :returns: workflow
+        :rtype: dict
+        """
+        repository = self.build_repository(repositories.GetWorkflow)
+        return await repository.get_data(id=workflow_id) or {}
+
+    async def list_runs(self, workflow_id):
+        """List workflows runs by workflow id
+
+        :param str workflow_id: workflow ID
+
+        :returns: list of workflow runs
+        """
+        repository = self.build_repository(repositories.ListWorkflowRuns)
+        return await repository.get_data(id=workflow_id) or []
+
+    async def get_run(self, workflow_id, run):
+        """Get workflow run
+
+        :param str workflow_id: workflow ID
+        :param str run: run count
+
+        :returns: workflow run
+        """
+        repository = self.build_repository(repositories.GetWorkflowRun)
+        return await repository.get_data(id=workflow_id, run=run) or {}
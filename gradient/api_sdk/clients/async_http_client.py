@@ -0,0 +1,161 @@
+import asyncio
+import json
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from .http_client import API
+from ..sdk_exceptions import GradientSdkError
+
+
+class AsyncSessionPool(object):
+    DEFAULT_POOL_SIZE = 100
+
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE):
+        """Single aiohttp session shared by all async repositories
+
+        :param int pool_size: max number of simultaneous connections
+        """
+        if aiohttp is None:
+            raise GradientSdkError("aiohttp is required for asynchronous clients. "
+                                   "Install it with: pip install gradient[async]")
+
+        self.pool_size = pool_size
+        self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def get_session(self):
+        """Get session, creating it in the running event loop on first use
+
+        :rtype: aiohttp.ClientSession
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size)
+            self._session = aiohttp.ClientSession(connector=connector)
+
+        return self._session
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+class AsyncResponse(object):
+    def __init__(self, status_code, content, headers, url, request=None):
+        """Fully read response with the interface of requests.Response used by GradientResponse
+
+        :param int status_code:
+        :param bytes content:
+        :param dict headers:
+        :param str url:
+        """
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+        self.url = url
+        self.request = request
+
+    @property
+    def ok(self):
+        return 200 <= self.status_code < 400
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class AsyncAPI(API):
+    def __init__(self, api_url, session_pool, **kwargs):
+        """Asynchronous counterpart of API. Every request method is a coroutine
+
+        :param str api_url: url you want to connect
+        :param AsyncSessionPool session_pool:
+        """
+        super(AsyncAPI, self).__init__(api_url, **kwargs)
+        self.session_pool = session_pool
+
+    async def post(self, url, json=None, params=None, files=None, data=None):
+        if files:
+            raise GradientSdkError("Sending files is not supported by asynchronous clients")
+
+        return await self._request("POST", url, json=json, params=params, data=data)
+
+    async def put(self, url, json=None, params=None, data=None):
+        return await self._request("PUT", url, json=json, params=params, data=data)
+
+    async def get(self, url, json=None, params=None, headers=None):
+        return await self._request("GET", url, json=json, params=params, headers=headers)
+
+    async def delete(self, url, json=None, params=None):
+        return await self._request("DELETE", url, json=json, params=params)
+
+    async def _request(self, method, url, json=None, params=None, data=None, headers=None):
+        path = self.get_path(url)
+        if headers:
+            headers = dict(self.headers, **headers)
+        else:
+            headers = self.headers
+
+        record = self._log_request(method, path, headers, json=json, params=params)
+
+        attempt = 0
+        while True:
+            try:
+                response = await self._send(method, path, json=json, params=params, data=data, headers=headers)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                delay = self._get_retry_delay(method, attempt)
+                if delay is None:
+                    raise
+
+                self.logger.debug("{} request failed: {}. Retrying in {:.2f}s".format(method, e, delay))
+            else:
+                delay = self._get_retry_delay(method, attempt, response)
+                if delay is None:
+                    break
+
+                self.logger.debug("{} request failed with status code {}. Retrying in {:.2f}s"
+                                  .format(method, response.status_code, delay))
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+        self._log_response(record, response)
+        return response
+
+    async def _send(self, method, path, json=None, params=None, data=None, headers=None):
+        session = self.session_pool.get_session()
+        async with session.request(method, path, json=json, params=self._prepare_params(params),
+                                   headers=headers or self.headers, data=data) as response:
+            content = await response.read()
+
+        return AsyncResponse(response.status, content, response.headers, str(response.url))
+
+    @staticmethod
+    def _prepare_params(params):
+        """Encode params the same way requests does: skip None values and repeat keys for lists
+
+        :param dict|None params:
+        :rtype: list[tuple[str,str]]|None
+        """
+        if not params:
+            return None
+
+        prepared = []
+        for key, value in params.items():
+            values = value if isinstance(value, (list, tuple)) else [value]
+            for v in values:
+                if v is not None:
+                    prepared.append((key, str(v)))
+
+        return prepared
@@ -0,0 +1,37 @@
+from .async_clients import AsyncNotebooksClient, AsyncMachinesClient, AsyncDatasetsClient, AsyncModelsClient, \
+    AsyncProjectsClient, AsyncWorkflowsClient
+from .async_http_client import AsyncSessionPool
+from .. import logger as sdk_logger
+
+
+class AsyncSdkClient(object):
+    def __init__(self, api_key, logger=sdk_logger.MuteLogger(), pool_size=AsyncSessionPool.DEFAULT_POOL_SIZE,
+                 session_pool=None, retry_policy=None):
+        """Asynchronous SDK client. All clients share one aiohttp connection pool
+
+        :param str api_key: API key
+        :param sdk_logger.Logger logger:
+        :param int pool_size: max number of simultaneous connections
+        :param AsyncSessionPool session_pool: connection pool to use instead of creating a new one
+        :param gradient.api_sdk.retry.RetryPolicy retry_policy: retry policy used instead of repositories' defaults
+        """
+        self.session_pool = session_pool or AsyncSessionPool(pool_size=pool_size)
+
+        client_kwargs = dict(api_key=api_key, logger=logger, session_pool=self.session_pool,
+                             retry_policy=retry_policy)
+        self.datasets = AsyncDatasetsClient(**client_kwargs)
+        self.machines = AsyncMachinesClient(**client_kwargs)
+        self.models = AsyncModelsClient(**client_kwargs)
+        self.notebooks = AsyncNotebooksClient(**client_kwargs)
+        self.projects = AsyncProjectsClient(**client_kwargs)
+        self.workflows = AsyncWorkflowsClient(**client_kwargs)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        """Close all pooled connections"""
+        await self.session_pool.close()
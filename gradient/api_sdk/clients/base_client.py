@@ -1,16 +1,23 @@
 import copy
 
+from .. import batch
 from .. import logger as sdk_logger
 from ..repositories.common import BaseRepository
 from ..repositories.tags import ListTagRepository, UpdateTagRepository
 
 
 class BaseClient(object):
+    # max number of requests sent at the same time by get_many, if client has no session pool
+    DEFAULT_BATCH_MAX_WORKERS = 10
+
     def __init__(
             self,
             api_key,
             ps_client_name=None,
-            logger=sdk_logger.MuteLogger()
+            logger=sdk_logger.MuteLogger(),
+            session_pool=None,
+            retry_policy=None,
+            response_cache=None,
     ):
         """
         Base class. All client classes inherit from it.
@@ -18,10 +25,28 @@ class BaseClient(object):
         :param str api_key: your API key
         :param str ps_client_name:
         :param sdk_logger.Logger logger:
+        :param http_client.SessionPool session_pool: keep-alive connection pool shared by all repositories
+        :param retry.RetryPolicy retry_policy: retry policy used by all repositories instead of their defaults.
+            Repositories creating or changing resources retry requests only if it is set
+        :param response_cache.ResponseCache response_cache: cache of responses of slowly changing resources
         """
         self.api_key = api_key
         self.ps_client_name = ps_client_name
         self.logger = logger
+        self.session_pool = session_pool
+        self.retry_policy = retry_policy
+        self.response_cache = response_cache
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Close all pooled connections"""
+        if self.session_pool is not None:
+            self.session_pool.close()
 
     def build_repository(self, repository_class, *args, **kwargs):
         """
@@ -33,9 +58,35 @@ class BaseClient(object):
             kwargs = copy.deepcopy(kwargs)
             kwargs["ps_client_name"] = self.ps_client_name
 
+        if self.session_pool is not None and kwargs.get("session_pool") is None:
+            kwargs = dict(kwargs, session_pool=self.session_pool)
+
+        if self.retry_policy is not None and kwargs.get("retry_policy") is None:
+            kwargs = dict(kwargs, retry_policy=self.retry_policy)
+
+        if self.response_cache is not None and kwargs.get("response_cache") is None:
+            kwargs = dict(kwargs, response_cache=self.response_cache)
+
         repository = repository_class(*args, api_key=self.api_key, logger=self.logger, **kwargs)
         return repository
 
+    def _get_many(self, get, ids, max_workers=None):
+        """Call ``get(id)`` concurrently for every ID
+
+        :param callable get: method getting single resource
+        :param list[str] ids:
+        :param int max_workers: max number of requests sent at the same time.
+            Defaults to size of the session pool so every request has a keep-alive connection
+        :rtype: list[batch.BatchResult]
+        """
+        if max_workers is None:
+            if self.session_pool is not None:
+                max_workers = self.session_pool.pool_size
+            else:
+                max_workers = self.DEFAULT_BATCH_MAX_WORKERS
+
+        return batch.run_many(get, ids, max_workers)
+
 
 class TagsSupportMixin(object):
     entity = ""
@@ -40,6 +40,17 @@ class DatasetsClient(BaseClient):
         repository = self.build_repository(repositories.GetDataset)
         return repository.get(id=dataset_id)
 
+    def get_many(self, ids, max_workers=None):
+        """Get datasets concurrently
+
+        :param list[str] ids: Dataset IDs
+        :param int max_workers: max number of requests sent at the same time
+        :return: results in the order of ids. Every result holds models.Dataset
+            or the error raised while getting it
+        :rtype: list[gradient.api_sdk.batch.BatchResult]
+        """
+        return self._get_many(self.get, ids, max_workers=max_workers)
+
     def get_ref(self, dataset_ref):
         """Get dataset with resolved version by reference
 
@@ -1,6 +1,8 @@
-import copy
+import threading
+import time
 
 import requests
+from requests import adapters
 
 from gradient import version
 from .. import utils, logger as sdk_logger
@@ -11,8 +13,94 @@ default_headers = {"X-API-Key": config.PAPERSPACE_API_KEY,
                    "ps_client_version": version.version}
 
 
+class SessionPool(object):
+    DEFAULT_POOL_SIZE = 10
+
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE):
+        """Thread-safe collection of keep-alive sessions, one per api url
+
+        Every session holds up to ``pool_size`` open connections, so repositories
+        sharing the pool reuse TCP and TLS connections instead of opening a new
+        one for every request.
+
+        :param int pool_size: max number of connections kept open per api url
+        """
+        self.pool_size = pool_size
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def get_session(self, api_url):
+        """
+        :param str api_url:
+        :rtype: requests.Session
+        """
+        with self._lock:
+            session = self._sessions.get(api_url)
+            if session is None:
+                session = self._create_session()
+                self._sessions[api_url] = session
+
+            return session
+
+    def close(self):
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+
+        for session in sessions:
+            session.close()
+
+    def _create_session(self):
+        session = requests.Session()
+        adapter = adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+
+class ThreadLocalSessionPool(SessionPool):
+    def __init__(self, pool_size=1):
+        """Collection of keep-alive sessions, one per thread
+
+        For workers sending requests to any host in parallel, like transfers to
+        pre-signed storage provider URLs. Every thread keeps its session and
+        its connections for as long as the pool is not closed.
+
+        :param int pool_size: max number of connections kept open per host and thread
+        """
+        super(ThreadLocalSessionPool, self).__init__(pool_size=pool_size)
+        self._local = threading.local()
+
+    def get_session(self, api_url=None):
+        """
+        :param str api_url: not used, all requests of a thread share its session
+        :rtype: requests.Session
+        """
+        local = self._local
+        session = getattr(local, "session", None)
+        if session is None:
+            session = self._create_session()
+            local.session = session
+            with self._lock:
+                self._sessions[id(session)] = session
+
+        return session
+
+    def close(self):
+        # threads get new sessions if the pool is used after closing
+        self._local = threading.local()
+        super(ThreadLocalSessionPool, self).close()
+
+
 class API(object):
-    def __init__(self, api_url, headers=None, api_key=None, ps_client_name=None, logger=sdk_logger.MuteLogger()):
+    def __init__(self, api_url, headers=None, api_key=None, ps_client_name=None, logger=sdk_logger.MuteLogger(),
+                 session_pool=None, retry_policy=None, rate_limiter=None):
         """
 
         :param str api_url: url you want to connect
@@ -20,6 +108,12 @@ class API(object):
         :param str api_key: your API key
         :param str ps_client_name: Client name
         :param sdk_logger.Logger logger:
+        :param SessionPool session_pool: pool of keep-alive sessions. A new connection
+            is opened for every request if not set
+        :param gradient.api_sdk.retry.RetryPolicy retry_policy: policy of retrying failed requests.
+            Requests are not retried if not set
+        :param gradient.api_sdk.rate_limiter.AdaptiveRateLimiter rate_limiter: limiter of concurrent requests
+            to the api host
         """
         self.api_url = api_url
         headers = headers or default_headers
@@ -32,6 +126,9 @@ class API(object):
             self.ps_client_name = ps_client_name
 
         self.logger = logger
+        self.session_pool = session_pool
+        self.retry_policy = retry_policy
+        self.rate_limiter = rate_limiter
 
     @property
     def api_key(self):
@@ -56,44 +153,116 @@ class API(object):
         full_path = utils.concatenate_urls(self.api_url, url)
         return full_path
 
+    def _get_requester(self):
+        """Get object sending requests: pooled session or the requests module itself
+
+        :rtype: requests.Session
+        """
+        if self.session_pool is None:
+            return requests
+
+        return self.session_pool.get_session(self.api_url)
+
+    def _send(self, method, send, *args, **kwargs):
+        """Call send(*args, **kwargs) and retry transient failures according to the retry policy
+
+        :param str method: HTTP method
+        :param callable send: function sending the request
+        :rtype: requests.Response
+        """
+        attempt = 0
+        while True:
+            try:
+                response = self._send_limited(send, *args, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                delay = self._get_retry_delay(method, attempt)
+                if delay is None:
+                    raise
+
+                self.logger.debug("{} request failed: {}. Retrying in {:.2f}s".format(method, e, delay))
+            else:
+                delay = self._get_retry_delay(method, attempt, response)
+                if delay is None:
+                    return response
+
+                self.logger.debug("{} request failed with status code {}. Retrying in {:.2f}s"
+                                  .format(method, response.status_code, delay))
+
+            time.sleep(delay)
+            attempt += 1
+
+    def _send_limited(self, send, *args, **kwargs):
+        if self.rate_limiter is None:
+            return send(*args, **kwargs)
+
+        response = None
+        slot = self.rate_limiter.acquire()
+        try:
+            response = send(*args, **kwargs)
+            return response
+        finally:
+            self.rate_limiter.release(slot, response)
+
+    def _get_retry_delay(self, method, attempt, response=None):
+        if self.retry_policy is None:
+            return None
+
+        return self.retry_policy.get_retry_delay(method, attempt, response)
+
+    def _log_request(self, method, path, headers, **fields):
+        """Log request if debug messages are enabled
+
+        :rtype: sdk_logger.RequestLogRecord|None
+        """
+        if not self.logger.is_debug_enabled():
+            return None
+
+        record = sdk_logger.RequestLogRecord(method, path, headers, **fields)
+        self.logger.debug(record)
+        return record
+
+    def _log_response(self, record, response):
+        if record is not None:
+            self.logger.debug(sdk_logger.ResponseLogRecord(record, response))
+
     def post(self, url, json=None, params=None, files=None, data=None):
         path = self.get_path(url)
-        headers = copy.deepcopy(self.headers)
+        headers = self.headers
         if data:
-            headers["Content-Type"] = data.content_type
+            headers = dict(headers, **{"Content-Type": data.content_type})
 
-        self.logger.debug("POST request sent to: {} \n\theaders: {}\n\tjson: {}\n\tparams: {}\n\tfiles: {}\n\tdata: {}"
-                          .format(path, headers, json, params, files, data))
-        response = requests.post(path, json=json, params=params, headers=headers, files=files, data=data)
-        self.logger.debug("Response status code: {}".format(response.status_code))
-        self.logger.debug("Response content: {}".format(response.content))
+        record = self._log_request("POST", path, headers, json=json, params=params, files=files, data=data)
+        response = self._send("POST", self._get_requester().post, path, json=json, params=params, headers=headers,
+                              files=files, data=data)
+        self._log_response(record, response)
         return response
 
     def put(self, url, json=None, params=None, data=None):
         path = self.get_path(url)
-        self.logger.debug("PUT request sent to: {} \n\theaders: {}\n\tjson: {}\n\tparams: {}"
-                          .format(path, self.headers, json, params))
-        response = requests.put(path, json=json, params=params, headers=self.headers, data=data)
-        self.logger.debug("Response status code: {}".format(response.status_code))
-        self.logger.debug("Response content: {}".format(response.content))
+        record = self._log_request("PUT", path, self.headers, json=json, params=params)
+        response = self._send("PUT", self._get_requester().put, path, json=json, params=params, headers=self.headers,
+                              data=data)
+        self._log_response(record, response)
         return response
 
-    def get(self, url, json=None, params=None):
+    def get(self, url, json=None, params=None, headers=None):
         path = self.get_path(url)
-        self.logger.debug("GET request sent to: {} \n\theaders: {}\n\tjson: {}\n\tparams: {}"
-                          .format(path, self.headers, json, params))
-        response = requests.get(path, params=params, headers=self.headers, json=json)
-        self.logger.debug("Response status code: {}".format(response.status_code))
-        self.logger.debug("Response content: {}".format(response.content))
+        if headers:
+            headers = dict(self.headers, **headers)
+        else:
+            headers = self.headers
+
+        record = self._log_request("GET", path, headers, json=json, params=params)
+        response = self._send("GET", self._get_requester().get, path, params=params, headers=headers, json=json)
+        self._log_response(record, response)
         return response
 
     def delete(self, url, json=None, params=None):
         path = self.get_path(url)
-        response = requests.delete(path, params=params, headers=self.headers, json=json)
-        self.logger.debug("DELETE request sent to: {} \n\theaders: {}\n\tjson: {}\n\tparams: {}"
-                          .format(response.url, self.headers, json, params))
-        self.logger.debug("Response status code: {}".format(response.status_code))
-        self.logger.debug("Response content: {}".format(response.content))
+        record = self._log_request("DELETE", path, self.headers, json=json, params=params)
+        response = self._send("DELETE", self._get_requester().delete, path, params=params, headers=self.headers,
+                              json=json)
+        self._log_response(record, response)
         return response
 
 
@@ -93,6 +93,17 @@ class MachinesClient(TagsSupportMixin, BaseClient):
         instance = repository.get(id=id)
         return instance
 
+    def get_many(self, ids, max_workers=None):
+        """Get machine instances concurrently
+
+        :param list[str] ids: Machine IDs
+        :param int max_workers: max number of requests sent at the same time
+        :return: results in the order of ids. Every result holds models.Machine
+            or the error raised while getting it
+        :rtype: list[gradient.api_sdk.batch.BatchResult]
+        """
+        return self._get_many(self.get, ids, max_workers=max_workers)
+
     def is_available(self, machine_type, region):
         """Check if specified machine is available in certain region
 
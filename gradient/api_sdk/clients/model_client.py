@@ -103,6 +103,17 @@ class ModelsClient(TagsSupportMixin, BaseClient):
         model = repository.get(model_id=model_id)
         return model
 
+    def get_many(self, ids, max_workers=None):
+        """Get models concurrently
+
+        :param list[str] ids: Model IDs
+        :param int max_workers: max number of requests sent at the same time
+        :return: results in the order of ids. Every result holds models.Model
+            or the error raised while getting it
+        :rtype: list[gradient.api_sdk.batch.BatchResult]
+        """
+        return self._get_many(self.get, ids, max_workers=max_workers)
+
     def get_model_files(self, model_id, links=False, size=False):
         """Get list of models
 
@@ -144,6 +144,17 @@ class NotebooksClient(TagsSupportMixin, BaseClient):
         notebook = repository.get(id=id)
         return notebook
 
+    def get_many(self, ids, max_workers=None):
+        """Get notebooks concurrently
+
+        :param list[str] ids: Notebook IDs
+        :param int max_workers: max number of requests sent at the same time
+        :return: results in the order of ids. Every result holds models.Notebook
+            or the error raised while getting it
+        :rtype: list[gradient.api_sdk.batch.BatchResult]
+        """
+        return self._get_many(self.get, ids, max_workers=max_workers)
+
     def delete(self, id):
         """Delete existing notebook
 
@@ -262,7 +273,7 @@ class NotebooksClient(TagsSupportMixin, BaseClient):
         artifacts = repository.list(notebook_id=notebook_id, files=files, links=links, size=size)
         return artifacts
 
-    def logs(self, notebook_id, line=1, limit=10000):
+    def logs(self, notebook_id, line=1, limit=10000, columnar=False):
         """
         Method to retrieve notebook logs.
 
@@ -279,13 +290,15 @@ class NotebooksClient(TagsSupportMixin, BaseClient):
         :param str notebook_id: id of notebook that we want to retrieve logs
         :param int line: from what line you want to retrieve logs. Default 0
         :param int limit: how much lines you want to retrieve logs. Default 10000
+        :param bool columnar: return compact models.LogRows instead of list of LogRow instances
 
         :returns: list of formatted logs lines
-        :rtype: list
+        :rtype: list|models.LogRows
         """
         notebook = self.get(notebook_id)
         repository = self.build_repository(repositories.ListNotebookLogs)
-        logs = repository.list(job_id=notebook.job_handle, notebook_id=notebook_id, line=line, limit=limit)
+        logs = repository.list(job_id=notebook.job_handle, notebook_id=notebook_id, line=line, limit=limit,
+                               columnar=columnar)
         return logs
 
     def yield_logs(self, notebook_id, line=1, limit=10000):
@@ -72,3 +72,14 @@ class ProjectsClient(TagsSupportMixin, BaseClient):
         repository = self.build_repository(repositories.GetProject)
         project = repository.get(id=project_id)
         return project
+
+    def get_many(self, ids, max_workers=None):
+        """Get projects concurrently
+
+        :param list[str] ids: Project IDs
+        :param int max_workers: max number of requests sent at the same time
+        :return: results in the order of ids. Every result holds models.Project
+            or the error raised while getting it
+        :rtype: list[gradient.api_sdk.batch.BatchResult]
+        """
+        return self._get_many(self.get, ids, max_workers=max_workers)
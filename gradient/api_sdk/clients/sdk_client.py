@@ -1,27 +1,46 @@
 from . import ModelsClient, ProjectsClient, \
     MachinesClient, NotebooksClient, SecretsClient, DatasetsClient, MachineTypesClient, DatasetVersionsClient, \
     DatasetTagsClient, ClustersClient, StorageProvidersClient
+from .http_client import SessionPool
 from .workflow_client import WorkflowsClient
 from .. import logger as sdk_logger
 
 
 class SdkClient(object):
-    def __init__(self, api_key, logger=sdk_logger.MuteLogger()):
+    def __init__(self, api_key, logger=sdk_logger.MuteLogger(), pool_size=SessionPool.DEFAULT_POOL_SIZE,
+                 session_pool=None, retry_policy=None, response_cache=None):
         """
         :param str api_key: API key
         :param sdk_logger.Logger logger:
+        :param int pool_size: max number of keep-alive connections per api host
+        :param SessionPool session_pool: connection pool to use instead of creating a new one
+        :param gradient.api_sdk.retry.RetryPolicy retry_policy: retry policy used instead of repositories' defaults
+        :param gradient.api_sdk.response_cache.ResponseCache response_cache: cache of responses of slowly
+            changing resources, like machine types or clusters
         """
-        self.clusters = ClustersClient(api_key=api_key, logger=logger)
-        self.datasets = DatasetsClient(api_key=api_key, logger=logger)
-        self.dataset_tags = DatasetTagsClient(api_key=api_key, logger=logger)
-        self.dataset_versions = DatasetVersionsClient(
-            api_key=api_key, logger=logger)
-        self.machine_types = MachineTypesClient(api_key=api_key, logger=logger)
-        self.machines = MachinesClient(api_key=api_key, logger=logger)
-        self.models = ModelsClient(api_key=api_key, logger=logger)
-        self.notebooks = NotebooksClient(api_key=api_key, logger=logger)
-        self.projects = ProjectsClient(api_key=api_key, logger=logger)
-        self.secrets = SecretsClient(api_key=api_key, logger=logger)
-        self.storage_providers = StorageProvidersClient(
-            api_key=api_key, logger=logger)
-        self.workflows = WorkflowsClient(api_key=api_key, logger=logger)
+        self.session_pool = session_pool or SessionPool(pool_size=pool_size)
+
+        client_kwargs = dict(api_key=api_key, logger=logger, session_pool=self.session_pool,
+                             retry_policy=retry_policy, response_cache=response_cache)
+        self.clusters = ClustersClient(**client_kwargs)
+        self.datasets = DatasetsClient(**client_kwargs)
+        self.dataset_tags = DatasetTagsClient(**client_kwargs)
+        self.dataset_versions = DatasetVersionsClient(**client_kwargs)
+        self.machine_types = MachineTypesClient(**client_kwargs)
+        self.machines = MachinesClient(**client_kwargs)
+        self.models = ModelsClient(**client_kwargs)
+        self.notebooks = NotebooksClient(**client_kwargs)
+        self.projects = ProjectsClient(**client_kwargs)
+        self.secrets = SecretsClient(**client_kwargs)
+        self.storage_providers = StorageProvidersClient(**client_kwargs)
+        self.workflows = WorkflowsClient(**client_kwargs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Close all pooled connections"""
+        self.session_pool.close()
@@ -109,7 +109,7 @@ class WorkflowsClient(BaseClient):
         logs = repository.yield_logs(id=job_id, line=line, limit=limit)
         return logs
     
-    def logs(self, job_id, line=1, limit=10000):
+    def logs(self, job_id, line=1, limit=10000, columnar=False):
         """Get log generator. Polls the API for new logs
 
         .. code-block:: python
@@ -125,11 +125,12 @@ class WorkflowsClient(BaseClient):
         :param str job_id:
         :param int line: line number at which logs starts to display on screen
         :param int limit: maximum lines displayed on screen, default set to 10 000
+        :param bool columnar: return compact models.LogRows instead of list of LogRow instances
 
         :returns: generator yielding LogRow instances
         :rtype: Iterator[models.LogRow]
         """
 
         repository = self.build_repository(repositories.ListWorkflowLogs)
-        logs = repository.list(id=job_id, line=line, limit=limit)
+        logs = repository.list(id=job_id, line=line, limit=limit, columnar=columnar)
         return logs
\ No newline at end of file
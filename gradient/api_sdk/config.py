@@ -55,6 +55,9 @@ class config(object):
     PAPERSPACE_API_KEY = os.environ.get(
         "PAPERSPACE_API_KEY", get_api_key(CONFIG_DIR_PATH, CONFIG_FILE_NAME))
 
+    RATE_LIMITER_USE_LOCK_FILES = os.environ.get("PAPERSPACE_RATE_LIMITER_USE_LOCK_FILES") in ("true", "1")
+    USE_RESPONSE_CACHE = os.environ.get("PAPERSPACE_USE_RESPONSE_CACHE") in ("true", "1")
+
     HELP_HEADERS_COLOR = os.environ.get(
         "PAPERSPACE_HELP_HEADERS_COLOR", _DEFAULT_HELP_HEADERS_COLOR)
     HELP_OPTIONS_COLOR = os.environ.get(
@@ -1,4 +1,5 @@
 import abc
+import time
 
 import six
 
@@ -20,6 +21,13 @@ class Logger(object):
     def debug(self, msg, *args, **kwargs):
         pass
 
+    def is_debug_enabled(self):
+        """Check if debug messages are written anywhere, so that building them can be skipped
+
+        :rtype: bool
+        """
+        return type(self).debug is not Logger.debug
+
 
 class MuteLogger(Logger):
     def log(self, msg, *args, **kwargs):
@@ -30,3 +38,67 @@ class MuteLogger(Logger):
 
     def error(self, msg, *args, **kwargs):
         pass
+
+
+class RequestLogRecord(object):
+    REDACTED_HEADERS = frozenset(("x-api-key",))
+    REDACTED_VALUE = "<redacted>"
+
+    def __init__(self, method, url, headers, **fields):
+        """Debug record of a request. Formatted only when converted to string
+
+        :param str method: HTTP method
+        :param str url:
+        :param dict headers:
+        :param fields: other request fields, like json or params
+        """
+        self.method = method
+        self.url = url
+        self.headers = headers
+        self.fields = fields
+        self.started = time.time()
+
+    def get_headers(self):
+        return {key: self.REDACTED_VALUE if key.lower() in self.REDACTED_HEADERS else value
+                for key, value in self.headers.items()}
+
+    def to_dict(self):
+        d = {
+            "method": self.method,
+            "url": self.url,
+            "headers": self.get_headers(),
+            "started": self.started,
+        }
+        d.update(self.fields)
+        return d
+
+    def __str__(self):
+        msg = "{} request sent to: {} \n\theaders: {}".format(self.method, self.url, self.get_headers())
+        for key, value in self.fields.items():
+            msg += "\n\t{}: {}".format(key, value)
+        return msg
+
+
+class ResponseLogRecord(object):
+    def __init__(self, request_record, response):
+        """Debug record of a response. Formatted only when converted to string
+
+        :param RequestLogRecord request_record:
+        :param requests.Response response:
+        """
+        self.request_record = request_record
+        self.status_code = response.status_code
+        self.content = response.content
+        self.elapsed = time.time() - request_record.started
+
+    def to_dict(self):
+        return {
+            "method": self.request_record.method,
+            "url": self.request_record.url,
+            "status_code": self.status_code,
+            "elapsed": self.elapsed,
+            "content": self.content,
+        }
+
+    def __str__(self):
+        return "Response status code: {} ({:.3f}s)\n\tcontent: {}".format(self.status_code, self.elapsed, self.content)
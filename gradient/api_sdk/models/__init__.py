@@ -4,7 +4,7 @@ from .dataset import Dataset, DatasetRef
 from .dataset_tag import DatasetTag, DatasetVersionSummary
 from .dataset_version import DatasetVersion, DatasetVersionPreSignedS3Call, DatasetVersionPreSignedURL, \
     DatasetVersionTagSummary
-from .log import LogRow
+from .log import LogRow, LogRows
 from .machine import Machine, MachineEvent, MachineUtilization
 from .model import Model, ModelFile
 from .notebook import Notebook, NotebookStart
@@ -15,3 +15,4 @@ from .storage_provider import StorageProvider
 from .tag import Tag
 from .vm_type import VmType, VmTypeGpuModel
 from .workflows import Workflow, WorkflowRun, WorkflowSpec
+from .slotted import get_slotted_class
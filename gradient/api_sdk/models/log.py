@@ -1,3 +1,72 @@
+import array
 from collections import namedtuple
 
+try:
+    from collections.abc import Sequence
+except ImportError:
+    from collections import Sequence
+
 LogRow = namedtuple("LogRow", "line message timestamp")
+
+
+class LogRows(Sequence):
+    def __init__(self, rows=()):
+        """Columnar list of log rows
+
+        Line numbers are kept in an array of machine integers and messages and timestamps
+        in their own lists, so a row does not need a tuple and a boxed integer.
+        Rows are returned as LogRow instances created on access.
+
+        :param Iterable[LogRow] rows:
+        """
+        self.lines = array.array("q")
+        self.messages = []
+        self.timestamps = []
+        self.extend(rows)
+
+    def append(self, row):
+        """
+        :param LogRow row:
+        """
+        self.lines.append(row.line)
+        self.messages.append(row.message)
+        self.timestamps.append(row.timestamp)
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    def __len__(self):
+        return len(self.lines)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            rows = LogRows()
+            rows.lines = self.lines[index]
+            rows.messages = self.messages[index]
+            rows.timestamps = self.timestamps[index]
+            return rows
+
+        return LogRow(self.lines[index], self.messages[index], self.timestamps[index])
+
+    def __iter__(self):
+        for row in zip(self.lines, self.messages, self.timestamps):
+            yield LogRow(*row)
+
+    def __eq__(self, other):
+        if isinstance(other, LogRows):
+            return (self.lines, self.messages, self.timestamps) == (other.lines, other.messages, other.timestamps)
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "LogRows({!r})".format(list(self))
@@ -0,0 +1,65 @@
+import attr
+
+_slotted_classes = {}
+
+
+def _eq(self, other):
+    base = _get_model_class(self)
+    if not isinstance(other, base) or _get_model_class(other) is not base:
+        return NotImplemented
+
+    return all(getattr(self, field.name) == getattr(other, field.name) for field in attr.fields(base))
+
+
+def _ne(self, other):
+    result = _eq(self, other)
+    if result is NotImplemented:
+        return result
+
+    return not result
+
+
+def _reduce(self):
+    base = _get_model_class(self)
+    values = {field.name: getattr(self, field.name) for field in attr.fields(base)}
+    return _restore, (base, values)
+
+
+def _restore(model_class, values):
+    return get_slotted_class(model_class)(**values)
+
+
+def _get_model_class(instance):
+    return getattr(type(instance), "_model_class", type(instance))
+
+
+def get_slotted_class(model_class):
+    """Get variant of attrs model class keeping values of attributes in slots
+
+    Instances of the variant need a fraction of memory of the model instances as they do not
+    have a dictionary of attributes. The variant is a subclass of the model class with
+    the same name, so isinstance checks and attributes work as before.
+    Instances compare equal to the model instances with the same values.
+
+    :param type model_class: attrs class. Other classes are returned unchanged
+    :rtype: type
+    """
+    if not attr.has(model_class):
+        return model_class
+
+    slotted_class = _slotted_classes.get(model_class)
+    if slotted_class is None:
+        namespace = {
+            "__slots__": tuple(field.name for field in attr.fields(model_class)),
+            "__module__": model_class.__module__,
+            "__doc__": model_class.__doc__,
+            "__eq__": _eq,
+            "__ne__": _ne,
+            "__hash__": None,
+            "__reduce__": _reduce,
+            "_model_class": model_class,
+        }
+        slotted_class = type(model_class.__name__, (model_class,), namespace)
+        _slotted_classes[model_class] = slotted_class
+
+    return slotted_class
@@ -0,0 +1,254 @@
+import os
+import re
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from six.moves.urllib.parse import urlparse
+
+from .config import config
+
+
+class LockFileSlots(object):
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, lock_dir, name):
+        """Request slots shared by all processes through lock files
+
+        Slot ``i`` is taken while a process holds an exclusive lock on its lock file,
+        so processes using the same lock directory never exceed the limit together.
+
+        :param str lock_dir: directory of lock files
+        :param str name: name of the limited resource, like api host
+        """
+        self.lock_dir = lock_dir
+        self.name = re.sub(r"[^\w.-]", "_", name)
+        self._files = {}
+        self._taken = set()
+        self._lock = threading.Lock()
+
+    def acquire(self, limit):
+        """Block until one of the first ``limit`` slots is free
+
+        :param int limit:
+        :return: number of taken slot
+        :rtype: int
+        """
+        while True:
+            slot = self._try_acquire(limit)
+            if slot is not None:
+                return slot
+
+            time.sleep(self.POLL_INTERVAL)
+
+    def release(self, slot):
+        with self._lock:
+            fcntl.flock(self._files[slot], fcntl.LOCK_UN)
+            self._taken.discard(slot)
+
+    def _try_acquire(self, limit):
+        with self._lock:
+            for slot in range(limit):
+                if slot in self._taken:
+                    continue
+
+                try:
+                    fcntl.flock(self._get_file(slot), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except (IOError, OSError):
+                    continue
+
+                self._taken.add(slot)
+                return slot
+
+    def _get_file(self, slot):
+        f = self._files.get(slot)
+        if f is None:
+            if not os.path.exists(self.lock_dir):
+                os.makedirs(self.lock_dir)
+
+            path = os.path.join(self.lock_dir, "{}.{}.lock".format(self.name, slot))
+            f = self._files[slot] = open(path, "a")
+
+        return f
+
+
+class AdaptiveRateLimiter(object):
+    THROTTLING_STATUS_CODES = frozenset((429, 503))
+
+    def __init__(
+            self,
+            initial_limit=8,
+            min_limit=1,
+            max_limit=64,
+            decrease_factor=0.5,
+            decrease_cooldown=1.0,
+            slots=None,
+    ):
+        """Concurrency limiter adjusting number of simultaneous requests to a single host (AIMD)
+
+        Limit grows by one for every ``limit`` successful responses and is multiplied by
+        ``decrease_factor`` when the server throttles requests with 429 or 503.
+        Throttled responses received during ``decrease_cooldown`` seconds after a decrease
+        were sent with the old limit, so they do not shrink the limit again.
+
+        :param int initial_limit:
+        :param int min_limit:
+        :param int max_limit:
+        :param float decrease_factor:
+        :param float decrease_cooldown: seconds
+        :param LockFileSlots slots: coordinates limit with other processes if set
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        self.decrease_cooldown = decrease_cooldown
+        self.slots = slots
+
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._last_decrease = 0
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self):
+        return int(self._limit)
+
+    def acquire(self):
+        """Block until a request can be sent
+
+        :return: slot shared with other processes or None
+        :rtype: int|None
+        """
+        with self._condition:
+            while self._in_flight >= self.limit:
+                self._condition.wait()
+
+            self._in_flight += 1
+
+        if self.slots is None:
+            return None
+
+        try:
+            return self.slots.acquire(self.limit)
+        except BaseException:
+            self._release()
+            raise
+
+    def release(self, slot=None, response=None):
+        """Release request slot and adjust limit using the response
+
+        :param int|None slot: slot returned by acquire
+        :param requests.Response|None response: None if request failed without a response
+        """
+        if slot is not None:
+            self.slots.release(slot)
+
+        with self._condition:
+            if response is not None:
+                if response.status_code in self.THROTTLING_STATUS_CODES:
+                    self._decrease()
+                elif response.ok:
+                    self._increase()
+
+        self._release()
+
+    def _release(self):
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def _increase(self):
+        self._limit = min(self._limit + 1.0 / self._limit, self.max_limit)
+
+    def _decrease(self):
+        now = time.time()
+        if now - self._last_decrease < self.decrease_cooldown:
+            return
+
+        self._last_decrease = now
+        self._limit = max(self._limit * self.decrease_factor, self.min_limit)
+
+
+class BandwidthLimiter(object):
+    def __init__(self, rate, burst=None, clock=time.monotonic, sleep=time.sleep):
+        """Token bucket limiting bytes per second transferred by all threads sharing it
+
+        Threads take tokens for bytes they transfer. Taking more tokens than the bucket
+        holds leaves it in debt and the thread waits until the debt would be paid back,
+        so threads together never transfer more than ``rate`` bytes per second on average.
+
+        :param float rate: bytes per second
+        :param float burst: max bytes transferred without waiting after an idle time.
+            One second of transfer by default
+        :param callable clock:
+        :param callable sleep:
+        """
+        if rate <= 0:
+            raise ValueError("Bandwidth limit must be positive")
+
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else rate)
+        self.clock = clock
+        self.sleep = sleep
+
+        self._tokens = self.burst
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def consume(self, byte_count):
+        """Take tokens for transferred bytes, waiting while the bucket is in debt
+
+        :param int byte_count:
+        """
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self._tokens + (now - self._updated) * self.rate, self.burst)
+            self._updated = now
+            self._tokens -= byte_count
+            delay = -self._tokens / self.rate
+
+        if delay > 0:
+            self.sleep(delay)
+
+
+class RateLimiterRegistry(object):
+    def __init__(self, lock_dir=None, **limiter_kwargs):
+        """Rate limiters shared by all repositories, one per api host
+
+        :param str lock_dir: if set, limits are coordinated with other processes
+            using lock files in this directory
+        :param limiter_kwargs: arguments passed to every AdaptiveRateLimiter
+        """
+        self.lock_dir = lock_dir if fcntl is not None else None
+        self.limiter_kwargs = limiter_kwargs
+        self._limiters = {}
+        self._lock = threading.Lock()
+
+    def get(self, api_url):
+        """
+        :param str api_url:
+        :rtype: AdaptiveRateLimiter
+        """
+        host = urlparse(api_url).netloc or api_url
+        with self._lock:
+            limiter = self._limiters.get(host)
+            if limiter is None:
+                limiter = self._limiters[host] = self._create_limiter(host)
+
+            return limiter
+
+    def _create_limiter(self, host):
+        slots = None
+        if self.lock_dir:
+            slots = LockFileSlots(self.lock_dir, host)
+
+        return AdaptiveRateLimiter(slots=slots, **self.limiter_kwargs)
+
+
+default_registry = RateLimiterRegistry(
+    lock_dir=os.path.join(config.CONFIG_DIR_PATH, "rate_limits") if config.RATE_LIMITER_USE_LOCK_FILES else None,
+)
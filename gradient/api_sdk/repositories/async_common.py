@@ -0,0 +1,112 @@
+from ..clients import http_client, async_http_client
+
+
+class AsyncRepository(object):
+    def __init__(self, repository, session_pool):
+        """Asynchronous wrapper around a synchronous repository
+
+        The wrapped repository still builds urls, request payloads and parses responses.
+        Only sending requests is done with an AsyncAPI client, so every repository
+        built on top of the common base classes works without changes.
+
+        :param BaseRepository repository:
+        :param async_http_client.AsyncSessionPool session_pool:
+        """
+        self.repository = repository
+        self.session_pool = session_pool
+        self._clients = {}
+
+    def _get_client(self, **kwargs):
+        """
+        :rtype: async_http_client.AsyncAPI
+        """
+        api_url = self.repository._get_api_url(**kwargs)
+        client = self._clients.get(api_url)
+        if client is None:
+            client = async_http_client.AsyncAPI(
+                api_url=api_url,
+                session_pool=self.session_pool,
+                api_key=self.repository.api_key,
+                logger=self.repository.logger,
+                ps_client_name=self.repository.ps_client_name,
+                retry_policy=self.repository.retry_policy,
+            )
+            self._clients[api_url] = client
+
+        return client
+
+    async def _get(self, **kwargs):
+        repository = self.repository
+        json_ = repository._get_request_json(kwargs)
+        params = repository._get_request_params(kwargs)
+        url = repository.get_request_url(**kwargs)
+        client = self._get_client(**kwargs)
+        response = await repository._send_request(client, url, json=json_, params=params)
+        gradient_response = http_client.GradientResponse.interpret_response(response)
+        return gradient_response
+
+    async def get(self, **kwargs):
+        """Async version of GetResource.get"""
+        response = await self._get(**kwargs)
+        self.repository._validate_response(response)
+        instance = self.repository._get_instance(response, **kwargs)
+        return instance
+
+    async def get_data(self, **kwargs):
+        """Send GET request and return raw response data, for repositories without a serializer"""
+        response = await self._get(**kwargs)
+        self.repository._validate_response(response)
+        return response.data
+
+    async def list(self, **kwargs):
+        """Async version of ListResources.list"""
+        response = await self._get(**kwargs)
+        self.repository._validate_response(response)
+        instances = self.repository._get_instances(response, **kwargs)
+        if kwargs.get("get_meta"):
+            meta_data = self.repository._get_meta_data(response)
+            return instances, meta_data
+        return instances
+
+    async def create(self, instance, data=None):
+        """Async version of CreateResource.create"""
+        repository = self.repository
+        instance_dict = repository._get_instance_dict(instance)
+        url = repository.get_request_url(**instance_dict)
+        client = self._get_client(**instance_dict)
+        json_ = repository._get_request_json(instance_dict)
+        params = repository._get_request_params(instance_dict)
+        response = await client.post(url, params=params, json=json_, data=data)
+        gradient_response = http_client.GradientResponse.interpret_response(response)
+        repository._validate_response(gradient_response)
+        repository._invalidate_response_cache()
+        handle = repository._process_response(gradient_response)
+        return handle
+
+    async def update(self, id, instance):
+        """Async version of AlterResource.update"""
+        instance_dict = self.repository._get_instance_dict(instance)
+        await self._run(id=id, **instance_dict)
+
+    async def delete(self, id_, **kwargs):
+        await self._run(id=id_, **kwargs)
+
+    async def start(self, id_, **kwargs):
+        await self._run(id=id_, **kwargs)
+
+    async def stop(self, id_, **kwargs):
+        await self._run(id=id_, **kwargs)
+
+    async def restart(self, id_, **kwargs):
+        await self._run(id=id_, **kwargs)
+
+    async def _run(self, **kwargs):
+        repository = self.repository
+        url = repository.get_request_url(**kwargs)
+        client = self._get_client(**kwargs)
+        json_data = repository._get_request_json(kwargs)
+        response = await repository._send_request(client, url, json_data=json_data)
+        gradient_response = http_client.GradientResponse.interpret_response(response)
+        repository._validate_response(gradient_response)
+        repository._invalidate_response_cache()
+        return gradient_response
@@ -34,6 +34,8 @@ class ValidateClusterRepository(GetResource):
 
 class ListClusters(ListResources):
     SERIALIZER_CLS = ClusterSchema
+    CACHE_FAMILY = "clusters"
+    CACHE_TTL = 300
 
     def get_request_url(self, **kwargs):
         return "/clusters/getClusters"
@@ -2,14 +2,17 @@ import abc
 import collections
 import datetime
 import json
+import time
 
 import dateutil
 import six
 import websocket
 
-from .. import serializers, sdk_exceptions
+from .. import serializers, sdk_exceptions, rate_limiter, retry, singleflight
+from .. import response_cache as response_cache_module
 from ..clients import http_client
 from ..config import config
+from ..models import LogRows
 from ..sdk_exceptions import ResourceFetchingError, ResourceCreatingDataError, ResourceCreatingError, GradientSdkError
 from ..utils import MessageExtractor, concatenate_urls
 
@@ -17,11 +20,28 @@ from ..utils import MessageExtractor, concatenate_urls
 @six.add_metaclass(abc.ABCMeta)
 class BaseRepository(object):
     VALIDATION_ERROR_MESSAGE = "Failed to fetch data"
-
-    def __init__(self, api_key, logger, ps_client_name=None):
+    # requests of repositories changing data are not retried unless a retry policy is set explicitly
+    RETRY_POLICY = None
+    # concurrency limiters shared by all repositories, one per api host
+    RATE_LIMITERS = rate_limiter.default_registry
+    # responses of repositories with the same family are invalidated when any of them changes data
+    CACHE_FAMILY = None
+    # seconds a response is kept in the response cache. Responses are not cached if not set
+    CACHE_TTL = None
+    # identical GET requests sent concurrently share one call if set
+    IN_FLIGHT_REQUESTS = None
+
+    def __init__(self, api_key, logger, ps_client_name=None, session_pool=None, retry_policy=None,
+                 response_cache=None):
         self.api_key = api_key
         self.logger = logger
         self.ps_client_name = ps_client_name
+        self.session_pool = session_pool
+        self.retry_policy = retry_policy or self.RETRY_POLICY
+        if response_cache is None and config.USE_RESPONSE_CACHE:
+            response_cache = response_cache_module.get_default_cache()
+        self.response_cache = response_cache
+        self._clients = {}
 
     @abc.abstractmethod
     def get_request_url(self, **kwargs):
@@ -44,26 +64,107 @@ class BaseRepository(object):
         :rtype: http_client.API
         """
         api_url = self._get_api_url(**kwargs)
-        client = http_client.API(
-            api_url=api_url,
-            api_key=self.api_key,
-            logger=self.logger,
-            ps_client_name=self.ps_client_name,
-        )
+        client = self._clients.get(api_url)
+        if client is None:
+            client = http_client.API(
+                api_url=api_url,
+                api_key=self.api_key,
+                logger=self.logger,
+                ps_client_name=self.ps_client_name,
+                session_pool=self.session_pool,
+                retry_policy=self.retry_policy,
+                rate_limiter=self._get_rate_limiter(api_url),
+            )
+            self._clients[api_url] = client
+
         return client
 
+    def _get_rate_limiter(self, api_url):
+        if self.RATE_LIMITERS is None:
+            return None
+
+        return self.RATE_LIMITERS.get(api_url)
+
     def _get(self, **kwargs):
         json_ = self._get_request_json(kwargs)
         params = self._get_request_params(kwargs)
         url = self.get_request_url(**kwargs)
         client = self._get_client(**kwargs)
+        if self.IN_FLIGHT_REQUESTS is None:
+            return self._get_response(client, url, json_, params)
+
+        key = response_cache_module.ResponseCache.make_key(self.api_key, client.get_path(url), params, json_)
+        return self.IN_FLIGHT_REQUESTS.do(key, lambda: self._get_response(client, url, json_, params))
+
+    def _get_response(self, client, url, json_, params):
+        if self._is_response_cached():
+            return self._get_cached(client, url, json_, params)
+
         response = self._send_request(client, url, json=json_, params=params)
         gradient_response = http_client.GradientResponse.interpret_response(response)
 
         return gradient_response
 
-    def _send_request(self, client, url, json=None, params=None):
-        response = client.get(url, json=json, params=params)
+    def _is_response_cached(self):
+        return self.response_cache is not None and bool(self.CACHE_TTL) and self.CACHE_FAMILY is not None
+
+    def _get_cached(self, client, url, json_, params):
+        """Get response from the response cache, fetching or revalidating it with ETag when it expired
+
+        :rtype: http_client.GradientResponse
+        """
+        key = self.response_cache.make_key(self.api_key, client.get_path(url), params, json_)
+        entry = self.response_cache.get(self.CACHE_FAMILY, key)
+        if entry is not None and entry.is_fresh:
+            return self._get_response_from_cache_entry(entry)
+
+        if entry is not None and entry.etag:
+            response = self._send_request(client, url, json=json_, params=params,
+                                          headers={"If-None-Match": entry.etag})
+            if response.status_code == 304:
+                entry.expires = time.time() + self.CACHE_TTL
+                self.response_cache.set(key, entry)
+                return self._get_response_from_cache_entry(entry)
+        else:
+            response = self._send_request(client, url, json=json_, params=params)
+
+        gradient_response = http_client.GradientResponse.interpret_response(response)
+        if 200 <= gradient_response.code < 300:
+            content = response.content
+            if isinstance(content, six.binary_type):
+                content = content.decode("utf-8")
+
+            entry = response_cache_module.CachedResponse(
+                family=self.CACHE_FAMILY,
+                content=content,
+                status_code=gradient_response.code,
+                expires=time.time() + self.CACHE_TTL,
+                etag=response.headers.get("ETag"),
+            )
+            self.response_cache.set(key, entry)
+
+        return gradient_response
+
+    def _get_response_from_cache_entry(self, entry):
+        """Build a new response for every call so callers do not share parsed data
+
+        :param response_cache_module.CachedResponse entry:
+        :rtype: http_client.GradientResponse
+        """
+        body = entry.content.encode("utf-8")
+        try:
+            data = json.loads(entry.content)
+        except ValueError:
+            data = body or None
+
+        return http_client.GradientResponse(body, entry.status_code, {"ETag": entry.etag}, data)
+
+    def _invalidate_response_cache(self):
+        if self.response_cache is not None and self.CACHE_FAMILY is not None:
+            self.response_cache.invalidate(self.CACHE_FAMILY)
+
+    def _send_request(self, client, url, json=None, params=None, headers=None):
+        response = client.get(url, json=json, params=params, headers=headers)
         return response
 
     def _validate_response(self, response):
@@ -84,6 +185,10 @@ class BaseRepository(object):
 @six.add_metaclass(abc.ABCMeta)
 class ListResources(BaseRepository):
     SERIALIZER_CLS = None
+    RETRY_POLICY = retry.DEFAULT_RETRY_POLICY
+    IN_FLIGHT_REQUESTS = singleflight.default_group
+    # lists can hold many thousands of objects, so they are built from slotted variants of models
+    SLOTTED_MODELS = True
 
     def _parse_objects(self, data, **kwargs):
         instances = []
@@ -105,7 +210,8 @@ class ListResources(BaseRepository):
         :param dict instance_dict:
         :return: model instance
         """
-        instance = self.SERIALIZER_CLS().get_instance(instance_dict)
+        serializer = self.SERIALIZER_CLS.get_shared_instance()
+        instance = serializer.get_instance(instance_dict, slotted=self.SLOTTED_MODELS)
         return instance
 
     def list(self, **kwargs):
@@ -129,13 +235,15 @@ class ListResources(BaseRepository):
 @six.add_metaclass(abc.ABCMeta)
 class GetResource(BaseRepository):
     SERIALIZER_CLS = None
+    RETRY_POLICY = retry.DEFAULT_RETRY_POLICY
+    IN_FLIGHT_REQUESTS = singleflight.default_group
 
     def _parse_object(self, instance_dict, **kwargs):
         """
         :param dict instance_dict:
         :return: model instance
         """
-        instance = self.SERIALIZER_CLS().get_instance(instance_dict)
+        instance = self.SERIALIZER_CLS.get_shared_instance().get_instance(instance_dict)
         return instance
 
     def get(self, **kwargs):
@@ -166,6 +274,7 @@ class CreateResource(BaseRepository):
         instance_dict = self._get_instance_dict(instance)
         response = self._send_create_request(instance_dict, data=data, path=path)
         self._validate_response(response)
+        self._invalidate_response_cache()
         handle = self._process_response(response)
         return handle
 
@@ -235,6 +344,7 @@ class AlterResource(BaseRepository):
         url = self.get_request_url(**kwargs)
         response = self._send(url, **kwargs)
         self._validate_response(response)
+        self._invalidate_response_cache()
         return response
 
     def _send(self, url, **kwargs):
@@ -563,6 +673,9 @@ class ListLogs(ListResources):
                 line += 1
 
     def _parse_objects(self, log_rows, **kwargs):
-        serializer = serializers.LogRowSchema()
-        log_rows = [serializer.get_instance(row) for row in log_rows]
-        return log_rows
+        serializer = serializers.LogRowSchema.get_shared_instance()
+        log_rows = (serializer.get_instance(row) for row in log_rows)
+        if kwargs.get("columnar"):
+            return LogRows(log_rows)
+
+        return list(log_rows)
@@ -1,6 +1,6 @@
 from .common import BaseRepository, AlterResource, CreateResource, DeleteResource, GetResource, ListResources
 from .datasets import DatasetMixin
-from .. import serializers
+from .. import retry, serializers
 
 
 class DatasetVersionMixin(DatasetMixin):
@@ -55,6 +55,9 @@ class DeleteDatasetVersion(DatasetVersionMixin, DeleteResource):
 
 
 class GenerateDatasetVersionPreSignedS3Urls(DatasetVersionMixin, BaseRepository):
+    # generating pre-signed urls does not change any data so it is safe to retry the POST request
+    RETRY_POLICY = retry.RetryPolicy(retry_all_methods=True)
+
     @classmethod
     def get_request_url(cls, id=None, **kwargs):
         return super(GenerateDatasetVersionPreSignedS3Urls, cls).get_request_url(id=id) + "/s3/preSignedUrls"
@@ -4,6 +4,7 @@ from .. import config, serializers
 
 class DatasetMixin(object):
     SERIALIZER_CLS = serializers.DatasetSchema
+    CACHE_FAMILY = "datasets"
 
     @staticmethod
     def _get_api_url(**kwargs):
@@ -33,7 +34,7 @@ class CreateDataset(DatasetMixin, CreateResource):
 
 
 class GetDataset(DatasetMixin, GetResource):
-    pass
+    CACHE_TTL = 60
 
 
 class UpdateDataset(DatasetMixin, AlterResource):
@@ -50,6 +51,7 @@ class DeleteDataset(DatasetMixin, DeleteResource):
 
 class GetDatasetRef(DatasetMixin, GetResource):
     SERIALIZER_CLS = serializers.DatasetRefSchema
+    CACHE_TTL = 60
 
     @staticmethod
     def get_request_url(**kwargs):
@@ -6,6 +6,10 @@ from ..repositories.common import ListResources
 
 class ListMachineTypes(ListResources):
     SERIALIZER_CLS = serializers.VmTypeSchema
+    CACHE_FAMILY = "machine_types"
+    CACHE_TTL = 3600
+    # _get_instance_dicts changes response data, so the response can not be shared with other callers
+    IN_FLIGHT_REQUESTS = None
 
     def get_request_url(self, **kwargs):
         return "vmTypes/getVmTypesByClusters"
@@ -57,7 +57,8 @@ class ListMachines(MachinesApiUrlMixin, ListResources):
         instances = []
 
         for machine_dict in data:
-            machine = serializers.MachineSchema().get_instance(machine_dict)
+            machine = serializers.MachineSchema.get_shared_instance().get_instance(
+                machine_dict, slotted=self.SLOTTED_MODELS)
             instances.append(machine)
 
         return instances
@@ -170,10 +171,13 @@ class GetMachineUtilization(MachinesApiUrlMixin, GetResource):
 
 
 class WaitForState(object):
-    def __init__(self, api_key, logger, ps_client_name=None):
+    def __init__(self, api_key, logger, ps_client_name=None, session_pool=None, retry_policy=None,
+                 response_cache=None):
         self.api_key = api_key
         self.logger = logger
-        self.get_machine_repository = GetMachine(api_key=api_key, logger=logger, ps_client_name=ps_client_name)
+        self.get_machine_repository = GetMachine(api_key=api_key, logger=logger, ps_client_name=ps_client_name,
+                                                 session_pool=session_pool, retry_policy=retry_policy,
+                                                 response_cache=response_cache)
 
     def wait_for_state(self, machine_id, state, interval=5):
 
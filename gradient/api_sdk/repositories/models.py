@@ -27,8 +27,9 @@ class ListModels(GetBaseModelsApiUrlMixin, ParseModelDictMixin, ListResources):
 
     def _parse_objects(self, data, **kwargs):
         models = []
+        serializer = serializers.Model.get_shared_instance()
         for model_dict in data["modelList"]:
-            model = self._parse_object(model_dict)
+            model = serializer.get_instance(model_dict, slotted=self.SLOTTED_MODELS)
             models.append(model)
 
         return models
@@ -131,8 +131,8 @@ class ListNotebooks(GetNotebookApiUrlMixin, ListResources):
         for d in notebook_dicts:
             d["id"] = d["handle"]
 
-        serializer = serializers.NotebookSchema()
-        notebooks = serializer.get_instance(notebook_dicts, many=True)
+        serializer = serializers.NotebookSchema.get_shared_instance()
+        notebooks = serializer.get_instance(notebook_dicts, many=True, slotted=self.SLOTTED_MODELS)
         return notebooks
 
     def _get_request_params(self, kwargs):
@@ -163,7 +163,8 @@ class GetNotebookMetrics(GetMetrics):
     OBJECT_TYPE = "notebook"
 
     def _get_instance_by_id(self, instance_id, **kwargs):
-        repository = GetNotebook(self.api_key, logger=self.logger, ps_client_name=self.ps_client_name)
+        repository = GetNotebook(self.api_key, logger=self.logger, ps_client_name=self.ps_client_name,
+                                 session_pool=self.session_pool, retry_policy=self.retry_policy)
         instance = repository.get(id=instance_id)
         return instance
 
@@ -178,7 +179,8 @@ class ListNotebookMetrics(ListMetrics):
     OBJECT_TYPE = "notebook"
 
     def _get_instance_by_id(self, instance_id, **kwargs):
-        repository = GetNotebook(self.api_key, logger=self.logger, ps_client_name=self.ps_client_name)
+        repository = GetNotebook(self.api_key, logger=self.logger, ps_client_name=self.ps_client_name,
+                                 session_pool=self.session_pool, retry_policy=self.retry_policy)
         instance = repository.get(id=instance_id)
         return instance
 
@@ -193,7 +195,8 @@ class StreamNotebookMetrics(StreamMetrics):
     OBJECT_TYPE = "notebook"
 
     def _get_metrics_api_url(self, instance_id, protocol="https"):
-        repository = GetNotebook(api_key=self.api_key, logger=self.logger, ps_client_name=self.ps_client_name)
+        repository = GetNotebook(api_key=self.api_key, logger=self.logger, ps_client_name=self.ps_client_name,
+                                 session_pool=self.session_pool, retry_policy=self.retry_policy)
         deployment = repository.get(id=instance_id)
 
         metrics_api_url = super(StreamNotebookMetrics, self)._get_metrics_api_url(deployment, protocol="wss")
@@ -5,6 +5,8 @@ from ..sdk_exceptions import ResourceFetchingError
 
 
 class GetBaseProjectsApiUrlMixin(object):
+    CACHE_FAMILY = "projects"
+
     def _get_api_url(self, **_):
         return config.config.CONFIG_HOST
 
@@ -18,6 +20,7 @@ class CreateProject(GetBaseProjectsApiUrlMixin, CreateResource):
 
 class ListProjects(GetBaseProjectsApiUrlMixin, ListResources):
     SERIALIZER_CLS = serializers.Project
+    CACHE_TTL = 60
 
     def get_request_url(self, **kwargs):
         return "/projects/"
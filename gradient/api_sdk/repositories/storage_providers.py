@@ -4,6 +4,7 @@ from .. import config, serializers
 
 class StorageProviderMixin(object):
     SERIALIZER_CLS = serializers.StorageProviderSchema
+    CACHE_FAMILY = "storage_providers"
 
     @staticmethod
     def _get_api_url(**kwargs):
@@ -18,6 +19,8 @@ class StorageProviderMixin(object):
 
 
 class ListStorageProviders(StorageProviderMixin, ListResources):
+    CACHE_TTL = 300
+
     def _get_request_params(self, kwargs):
         limit = kwargs.get("limit") or 20
         offset = kwargs.get("offset") or 0
@@ -0,0 +1,158 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+
+from .config import config
+
+
+class CachedResponse(object):
+    def __init__(self, family, content, status_code, expires, etag=None):
+        """Response stored in cache
+
+        :param str family: resource family, like "datasets"
+        :param str content: response body
+        :param int status_code:
+        :param float expires: timestamp after which response has to be fetched or revalidated
+        :param str etag: ETag header value, used for revalidation
+        """
+        self.family = family
+        self.content = content
+        self.status_code = status_code
+        self.expires = expires
+        self.etag = etag
+
+    @property
+    def is_fresh(self):
+        return time.time() < self.expires
+
+    def to_dict(self):
+        return {
+            "family": self.family,
+            "content": self.content,
+            "status_code": self.status_code,
+            "expires": self.expires,
+            "etag": self.etag,
+        }
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(d["family"], d["content"], d["status_code"], d["expires"], etag=d.get("etag"))
+
+
+class ResponseCache(object):
+    def __init__(self, directory=None):
+        """Cache of API responses kept in memory and, if directory is set, on disk
+
+        Entries are grouped by resource family, so that changing a resource
+        can invalidate all cached responses of the same family at once.
+        Directory of a family is removed on invalidation, which makes it visible
+        to other processes sharing the cache.
+
+        :param str directory: path to directory of cache files
+        """
+        self.directory = directory
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(api_key, url, params=None, json_=None):
+        """
+        :rtype: str
+        """
+        key_data = json.dumps([api_key, url, params, json_], sort_keys=True, default=str)
+        return hashlib.sha1(key_data.encode("utf-8")).hexdigest()
+
+    def get(self, family, key):
+        """
+        :param str family:
+        :param str key:
+        :rtype: CachedResponse|None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+        if entry is None and self.directory:
+            entry = self._read(family, key)
+            if entry is not None:
+                with self._lock:
+                    self._entries[key] = entry
+
+        # entry could have been invalidated on disk by another process
+        if entry is not None and self.directory and not os.path.exists(self._get_path(family, key)):
+            with self._lock:
+                self._entries.pop(key, None)
+            return None
+
+        return entry
+
+    def set(self, key, entry):
+        """
+        :param str key:
+        :param CachedResponse entry:
+        """
+        with self._lock:
+            self._entries[key] = entry
+
+        if self.directory:
+            self._write(key, entry)
+
+    def invalidate(self, family):
+        """Remove all cached responses of resource family
+
+        :param str family:
+        """
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if entry.family == family:
+                    del self._entries[key]
+
+        if self.directory:
+            shutil.rmtree(self._get_family_dir(family), ignore_errors=True)
+
+    def _get_family_dir(self, family):
+        return os.path.join(self.directory, family)
+
+    def _get_path(self, family, key):
+        return os.path.join(self._get_family_dir(family), key + ".json")
+
+    def _read(self, family, key):
+        try:
+            with open(self._get_path(family, key)) as f:
+                return CachedResponse.from_dict(json.load(f))
+        except (IOError, OSError, ValueError, KeyError):
+            return None
+
+    def _write(self, key, entry):
+        family_dir = self._get_family_dir(entry.family)
+        path = self._get_path(entry.family, key)
+        tmp_path = "{}.tmp-{}-{}".format(path, os.getpid(), threading.current_thread().ident)
+        try:
+            if not os.path.exists(family_dir):
+                os.makedirs(family_dir)
+
+            with open(tmp_path, "w") as f:
+                json.dump(entry.to_dict(), f)
+            os.rename(tmp_path, path)
+        except (IOError, OSError):
+            # cache is only an optimization so failing to persist a response is not an error
+            pass
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache():
+    """Get cache persisted in CONFIG_DIR_PATH, shared by all repositories of the process
+
+    :rtype: ResponseCache
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache(directory=os.path.join(config.CONFIG_DIR_PATH, "cache"))
+
+        return _default_cache
@@ -0,0 +1,89 @@
+import datetime
+import email.utils
+import random
+
+
+class RetryPolicy(object):
+    IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "OPTIONS", "PUT", "DELETE"))
+    RETRY_STATUS_CODES = frozenset((429, 502, 503, 504))
+
+    def __init__(
+            self,
+            max_retries=3,
+            backoff_factor=0.5,
+            max_backoff=30,
+            max_retry_after=300,
+            status_codes=RETRY_STATUS_CODES,
+            retry_all_methods=False,
+    ):
+        """Exponential backoff with full jitter for failed API requests
+
+        :param int max_retries: max number of retries of a single request
+        :param float backoff_factor: base delay in seconds. Delay before n-th retry is drawn
+            from [0, backoff_factor * 2**n]
+        :param float max_backoff: max delay in seconds computed from backoff
+        :param float max_retry_after: max delay in seconds accepted from Retry-After header
+        :param frozenset[int] status_codes: response status codes considered transient
+        :param bool retry_all_methods: retry also non-idempotent requests, like POST.
+            Only use it for requests that are safe to send twice
+        """
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self.status_codes = frozenset(status_codes)
+        self.retry_all_methods = retry_all_methods
+
+    def is_retryable_method(self, method):
+        return self.retry_all_methods or method.upper() in self.IDEMPOTENT_METHODS
+
+    def get_retry_delay(self, method, attempt, response=None):
+        """Get delay before next attempt or None if request should not be retried
+
+        Pass response if a response was received or nothing if the request failed with
+        a connection error.
+
+        :param str method: HTTP method
+        :param int attempt: number of retries done so far
+        :param requests.Response response:
+        :rtype: float|None
+        """
+        if attempt >= self.max_retries or not self.is_retryable_method(method):
+            return None
+
+        if response is not None:
+            if response.status_code not in self.status_codes:
+                return None
+
+            retry_after = self._get_retry_after(response)
+            if retry_after is not None:
+                return min(retry_after, self.max_retry_after)
+
+        return self.get_backoff(attempt)
+
+    def get_backoff(self, attempt):
+        max_delay = min(self.max_backoff, self.backoff_factor * (2 ** attempt))
+        return random.uniform(0, max_delay)
+
+    @staticmethod
+    def _get_retry_after(response):
+        headers = response.headers or {}
+        value = headers.get("Retry-After")
+        if not value:
+            return None
+
+        try:
+            return max(float(value), 0)
+        except ValueError:
+            pass
+
+        try:
+            retry_at = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+
+        now = datetime.datetime.now(tz=retry_at.tzinfo)
+        return max((retry_at - now).total_seconds(), 0)
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
@@ -1,5 +1,9 @@
 import marshmallow
 
+from . import compiled_loader
+from .. import models
+from .compiled_loader import FALLBACK
+
 
 class BaseSchema(marshmallow.Schema):
     MODEL = None
@@ -11,36 +15,79 @@ class BaseSchema(marshmallow.Schema):
             if value not in (None, {}, [])
         }
 
-    def get_instance(self, obj_dict, many=False):
+    def get_instance(self, obj_dict, many=False, slotted=False):
+        """
+        :param dict|list[dict] obj_dict:
+        :param bool many:
+        :param bool slotted: create instances of slotted variant of the model, using less memory
+        """
         if not self.MODEL:
             raise NotImplementedError
 
+        model = models.get_slotted_class(self.MODEL) if slotted else self.MODEL
         if not many:
-            return self._get_instance(obj_dict)
+            return self._get_instance(obj_dict, model)
 
-        instances = [self._get_instance(obj_d) for obj_d in obj_dict]
+        instances = [self._get_instance(obj_d, model) for obj_d in obj_dict]
         return instances
 
-    def _get_instance(self, obj_dict):
-        obj = self.load(obj_dict)
-        if obj.data is None:
+    @classmethod
+    def get_shared_instance(cls):
+        """Get schema instance shared by all callers. It must not be changed
+
+        :rtype: BaseSchema
+        """
+        shared = _shared_instances.get(cls)
+        if shared is None:
+            shared = _shared_instances[cls] = cls()
+
+        return shared
+
+    def _get_loader(self):
+        """Get loader compiled for schema class or None if this instance has to be loaded by marshmallow"""
+        try:
+            return self._compiled_loader
+        except AttributeError:
+            pass
+
+        shared = self.get_shared_instance()
+        loader = _compiled_loaders.get(type(self), FALLBACK)
+        if loader is FALLBACK:
+            loader = _compiled_loaders[type(self)] = compiled_loader.compile_loader(shared)
+
+        # schemas created with non-default options are loaded with marshmallow
+        if self is not shared and not compiled_loader.has_default_options(self):
+            loader = None
+
+        self._compiled_loader = loader
+        return loader
+
+    def _load(self, obj_dict):
+        loader = self._get_loader()
+        if loader is not None:
+            data = loader(obj_dict)
+            if data is not FALLBACK:
+                return data
+
+        return self.load(obj_dict).data
+
+    def _get_instance(self, obj_dict, model=None):
+        data = self._load(obj_dict)
+        if data is None:
             return None
 
-        instance = self.MODEL(**obj.data)
+        instance = (model or self.MODEL)(**data)
         self._get_nested(instance, obj_dict)
         return instance
 
     def _get_nested(self, instance, obj_dict):
-        for field_name, field_type in self.fields.items():
-            if not isinstance(field_type, marshmallow.fields.Nested):
-                continue
-
+        for field_name, field_type in self._get_nested_fields():
             load_from = field_type.load_from or field_name
             field_dict = obj_dict.get(load_from, {})
             if field_dict is None:
                 continue
 
-            serializer = field_type.nested()
+            serializer = field_type.nested.get_shared_instance()
             field_data = serializer.get_instance(field_dict, many=field_type.many)
 
             if field_type.only:
@@ -51,3 +98,17 @@ class BaseSchema(marshmallow.Schema):
 
             if field_data:
                 setattr(instance, field_name, field_data)
+
+    def _get_nested_fields(self):
+        try:
+            return self._nested_fields
+        except AttributeError:
+            pass
+
+        self._nested_fields = [(field_name, field_type) for field_name, field_type in self.fields.items()
+                               if isinstance(field_type, marshmallow.fields.Nested)]
+        return self._nested_fields
+
+
+_shared_instances = {}
+_compiled_loaders = {}
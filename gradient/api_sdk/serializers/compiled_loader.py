@@ -0,0 +1,189 @@
+"""Plain Python loaders generated from marshmallow schemas
+
+``Schema.load`` goes through a lot of generic machinery for every object: an unmarshaller,
+error bookkeeping and a call of ``Field.deserialize`` for every field. Loaders generated here
+do the same work with straight-line code, checking types of the most common values
+(strings, integers, booleans and dicts) inline and calling the field's ``deserialize``
+for anything else. Schemas using features the generator does not know about
+(validators, dotted attributes, strict mode) are not compiled and are loaded by marshmallow.
+"""
+import marshmallow
+from marshmallow import fields, utils
+from marshmallow.decorators import POST_LOAD, PRE_LOAD, VALIDATES, VALIDATES_SCHEMA
+
+# returned by loaders for input they can not handle, it has to be loaded with marshmallow
+FALLBACK = object()
+
+_ERROR = object()
+
+# field classes which deserialize values of these types without changing them
+_PASS_THROUGH_TYPES = {
+    fields.String: "str",
+    fields.Integer: "int",
+    fields.Boolean: "bool",
+    fields.Dict: "dict",
+}
+
+
+def _deserialize(field, value, attr, data):
+    try:
+        return field.deserialize(value, attr, data)
+    except marshmallow.ValidationError:
+        return _ERROR
+
+
+def has_default_options(schema):
+    """Check if schema instance was created without options changing how it loads data
+
+    :param marshmallow.Schema schema:
+    :rtype: bool
+    """
+    if schema.strict or schema.many or schema.partial or schema.context:
+        return False
+
+    if schema.only is not None or schema.exclude or schema.load_only or schema.dump_only:
+        return False
+
+    return True
+
+
+def _can_compile(schema):
+    if not has_default_options(schema):
+        return False
+
+    processors = schema.__processors__
+    for tag in (VALIDATES, VALIDATES_SCHEMA):
+        if processors.get((tag, False)) or processors.get((tag, True)):
+            return False
+
+    for tag in (PRE_LOAD, POST_LOAD):
+        if processors.get((tag, True)):
+            return False
+
+    for field in schema.fields.values():
+        if field.attribute and "." in field.attribute:
+            return False
+
+    return True
+
+
+def _get_field_lines(index, attr_name, field):
+    key = field.attribute or attr_name
+    lines = ['    value = data.get({!r}, MISSING)'.format(attr_name)]
+    if field.load_from:
+        lines += [
+            '    if value is MISSING:',
+            '        value = data.get({!r}, MISSING)'.format(field.load_from),
+        ]
+
+    if field.missing is not utils.missing:
+        lines += [
+            '    if value is MISSING:',
+            '        value = field_{0}.missing() if callable(field_{0}.missing) else field_{0}.missing'.format(index),
+        ]
+    elif field.required:
+        lines += [
+            '    if value is MISSING:',
+            '        errors = True',
+        ]
+
+    deserialize_lines = [
+        '        value = deserialize(field_{}, value, {!r}, data)'.format(index, field.load_from or attr_name),
+        '        if value is ERROR:',
+        '            errors = True',
+        '        elif value is not MISSING:',
+        '            result[{!r}] = value'.format(key),
+    ]
+
+    type_name = _PASS_THROUGH_TYPES.get(type(field))
+    if type_name is None or field.validators:
+        return lines + ['    if value is not MISSING:'] + deserialize_lines
+
+    if type_name == "bool":
+        check = 'value is True or value is False'
+    else:
+        check = 'value.__class__ is {}'.format(type_name)
+
+    lines += [
+        '    if value is MISSING:',
+        '        pass',
+        '    elif {}:'.format(check),
+        '        result[{!r}] = value'.format(key),
+        '    elif value is None:',
+    ]
+    if field.allow_none:
+        lines.append('        result[{!r}] = None'.format(key))
+    else:
+        lines.append('        errors = True')
+
+    lines.append('    else:')
+    lines += deserialize_lines
+    return lines
+
+
+def compile_loader(schema):
+    """Generate function loading dicts the same way ``schema.load(data).data`` does
+
+    The function returns ``FALLBACK`` if input is not a dict.
+
+    :param marshmallow.Schema schema: instance used by the loader. It must not be changed later
+    :return: loader function or None if schema can not be compiled
+    :rtype: callable|None
+    """
+    if not _can_compile(schema):
+        return None
+
+    namespace = {
+        "MISSING": utils.missing,
+        "ERROR": _ERROR,
+        "FALLBACK": FALLBACK,
+        "Mapping": utils.Mapping,
+        "ValidationError": marshmallow.ValidationError,
+        "deserialize": _deserialize,
+        "schema": schema,
+        "PRE_LOAD": PRE_LOAD,
+        "POST_LOAD": POST_LOAD,
+    }
+    processors = schema.__processors__
+    lines = [
+        'def load(data):',
+        '    if data.__class__ is not dict:',
+        '        return FALLBACK',
+        '    original_data = data',
+    ]
+    if processors.get((PRE_LOAD, False)):
+        lines += [
+            '    try:',
+            '        data = schema._invoke_load_processors(PRE_LOAD, data, False, original_data=data)',
+            '    except ValidationError:',
+            '        return None',
+            '    if not isinstance(data, Mapping):',
+            '        return None',
+        ]
+
+    lines += [
+        '    result = {}',
+        '    errors = False',
+    ]
+    for index, (attr_name, field) in enumerate(schema.fields.items()):
+        if field.dump_only:
+            continue
+
+        namespace["field_{}".format(index)] = field
+        lines += _get_field_lines(index, attr_name, field)
+
+    if processors.get((POST_LOAD, False)):
+        lines += [
+            '    if not errors:',
+            '        try:',
+            '            result = schema._invoke_load_processors(',
+            '                POST_LOAD, result, False, original_data=original_data)',
+            '        except ValidationError:',
+            '            pass',
+        ]
+
+    lines.append('    return result')
+    source = "\n".join(lines)
+    code = compile(source, "<compiled loader of {}>".format(type(schema).__name__), "exec")
+    exec(code, namespace)
+    return namespace["load"]
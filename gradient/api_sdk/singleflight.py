@@ -0,0 +1,59 @@
+import threading
+
+
+class _Call(object):
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+    def wait(self):
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+
+        return self.result
+
+
+class SingleFlight(object):
+    def __init__(self):
+        """Group of in-flight calls. Concurrent calls with the same key share one execution
+
+        The first caller of a key runs the function, callers arriving before it finishes
+        wait for it and get the same result or exception.
+        """
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        """
+        :param str key:
+        :param callable fn:
+        :return: result of fn
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                is_leader = False
+            else:
+                call = self._calls[key] = _Call()
+                is_leader = True
+
+        if not is_leader:
+            return call.wait()
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result
+
+
+# identical GET requests sent at the same time by repositories of one process
+default_group = SingleFlight()
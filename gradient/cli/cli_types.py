@@ -1,4 +1,5 @@
 import json
+import re
 
 import click
 
@@ -25,3 +26,31 @@ def json_string(val):
     if not isinstance(val, (dict, list)):
         val = json.loads(val)
     return val
+
+
+class ByteSizeType(click.ParamType):
+    """Converts sizes like 1048576, 64KB, 15MB or 1.5GiB to number of bytes"""
+    name = "size"
+
+    UNITS = {
+        "": 1,
+        "B": 1,
+        "KB": 1000,
+        "MB": 1000 ** 2,
+        "GB": 1000 ** 3,
+        "TB": 1000 ** 4,
+        "KIB": 1024,
+        "MIB": 1024 ** 2,
+        "GIB": 1024 ** 3,
+        "TIB": 1024 ** 4,
+    }
+
+    def convert(self, value, param, ctx):
+        if isinstance(value, int):
+            return value
+
+        match = re.match(r"^\s*(\d+(?:\.\d+)?)\s*([a-zA-Z]*)\s*$", str(value))
+        if not match or match.group(2).upper() not in self.UNITS:
+            self.fail("{} is not a valid size".format(value), param, ctx)
+
+        return int(float(match.group(1)) * self.UNITS[match.group(2).upper()])
@@ -1,6 +1,7 @@
 import click
 
 from gradient.cli import common
+from gradient.cli.cli_types import ByteSizeType
 from gradient.cli.cli import cli
 from gradient.cli.common import ClickGroup, api_key_option
 from gradient.commands import datasets as commands
@@ -299,6 +300,13 @@ def show_dataset_version_details(api_key, dataset_version_id, options_file):
     cls=common.GradientOption,
     multiple=True,
 )
+@click.option(
+    "--deriveFrom",
+    "base_dataset_version_id",
+    help="Dataset version to copy files unchanged in source directories from instead of uploading them "
+         "(ex: {}:{})".format(EXAMPLE_ID, EXAMPLE_VERSION),
+    cls=common.GradientOption,
+)
 @common.api_key_option
 @common.options_file
 def create_dataset_version(
@@ -306,12 +314,16 @@ def create_dataset_version(
         message,
         api_key,
         source_paths,
+        base_dataset_version_id,
         options_file,
 ):
     validate_dataset_id(dataset_id)
+    if base_dataset_version_id:
+        validate_dataset_id(base_dataset_version_id, ref_type='version')
     command = commands.CreateDatasetVersionCommand(api_key=api_key)
     command.execute(dataset_id=dataset_id, message=message,
-                    source_paths=source_paths)
+                    source_paths=source_paths,
+                    base_dataset_version_id=base_dataset_version_id)
 
 
 @dataset_versions.command("update", help="Update dataset version")
@@ -434,13 +446,44 @@ def list_dataset_files(api_key, dataset_version_id, path, recursive, options_fil
     cls=common.GradientOption,
     required=True,
 )
+@click.option(
+    "--skipExisting",
+    "skip_existing",
+    help="Do not download files already downloaded to the target path",
+    cls=common.GradientOption,
+    is_flag=True,
+)
+@click.option(
+    "--maxBandwidth",
+    "max_bandwidth",
+    help="Max bytes per second transferred by all workers together (ex: 50MB)",
+    cls=common.GradientOption,
+    type=ByteSizeType(),
+)
+@click.option(
+    "--jsonProgress",
+    "json_progress",
+    is_flag=True,
+    help="Print progress events as JSON lines instead of a status line",
+    cls=common.GradientOption,
+)
+@click.option(
+    "--noChecksums",
+    "no_checksums",
+    is_flag=True,
+    help="Do not verify MD5 checksums of transferred files against their ETags",
+    cls=common.GradientOption,
+)
 @api_key_option
 @common.options_file
-def get_dataset_files(api_key, dataset_version_id, source_paths, target_path, options_file):
+def get_dataset_files(api_key, dataset_version_id, source_paths, target_path, skip_existing, max_bandwidth,
+                      json_progress, no_checksums, options_file):
     validate_dataset_id(dataset_version_id, ref_type='version')
     command = commands.GetDatasetFilesCommand(api_key=api_key)
     command.execute(dataset_version_id=dataset_version_id,
-                    source_paths=source_paths, target_path=target_path)
+                    source_paths=source_paths, target_path=target_path, skip_existing=skip_existing,
+                    max_bandwidth=max_bandwidth, json_progress=json_progress,
+                    verify_checksums=not no_checksums)
 
 
 @dataset_version_files.command("put", help="Put files")
@@ -465,13 +508,59 @@ def get_dataset_files(api_key, dataset_version_id, source_paths, target_path, op
     help="Target dataset file path",
     cls=common.GradientOption,
 )
+@click.option(
+    "--partSize",
+    "part_size",
+    help="Size of parts of multipart uploads (ex: 64MB). Computed from file size and throughput by default",
+    cls=common.GradientOption,
+    type=ByteSizeType(),
+)
+@click.option(
+    "--noResume",
+    "no_resume",
+    is_flag=True,
+    help="Do not resume an interrupted upload of the same files and do not keep a journal of this one",
+    cls=common.GradientOption,
+)
+@click.option(
+    "--abortStaleUploads",
+    "abort_stale_uploads",
+    is_flag=True,
+    help="Abort multipart uploads left by an interrupted upload of the same files and upload the files again",
+    cls=common.GradientOption,
+)
+@click.option(
+    "--maxBandwidth",
+    "max_bandwidth",
+    help="Max bytes per second transferred by all workers together (ex: 50MB)",
+    cls=common.GradientOption,
+    type=ByteSizeType(),
+)
+@click.option(
+    "--jsonProgress",
+    "json_progress",
+    is_flag=True,
+    help="Print progress events as JSON lines instead of a status line",
+    cls=common.GradientOption,
+)
+@click.option(
+    "--noChecksums",
+    "no_checksums",
+    is_flag=True,
+    help="Do not verify MD5 checksums of transferred files against their ETags",
+    cls=common.GradientOption,
+)
 @api_key_option
 @common.options_file
-def put_dataset_files(api_key, dataset_version_id, source_paths, target_path, options_file):
+def put_dataset_files(api_key, dataset_version_id, source_paths, target_path, part_size, no_resume,
+                      abort_stale_uploads, max_bandwidth, json_progress, no_checksums, options_file):
     validate_dataset_id(dataset_version_id, ref_type='version')
     command = commands.PutDatasetFilesCommand(api_key=api_key)
     command.execute(dataset_version_id=dataset_version_id,
-                    source_paths=source_paths, target_path=target_path)
+                    source_paths=source_paths, target_path=target_path,
+                    part_size=part_size, resume=not no_resume,
+                    abort_stale_uploads=abort_stale_uploads, max_bandwidth=max_bandwidth,
+                    json_progress=json_progress, verify_checksums=not no_checksums)
 
 
 @dataset_version_files.command("delete", help="Delete files")
@@ -496,3 +585,83 @@ def delete_dataset_files(api_key, dataset_version_id, paths, options_file):
     command = commands.DeleteDatasetFilesCommand(api_key=api_key)
     command.execute(dataset_version_id=dataset_version_id,
                     paths=paths or ['/'])
+
+
+@dataset_version_files.command(
+    "sync",
+    help="Upload new and changed files of SOURCE_PATH directory to TARGET dataset version path "
+         "(ex: {}:{}:/path)".format(EXAMPLE_ID, EXAMPLE_VERSION),
+)
+@click.argument(
+    "SOURCE_PATH",
+    required=True,
+    type=click.Path(exists=True, file_okay=False),
+    cls=common.GradientArgument,
+)
+@click.argument(
+    "TARGET",
+    required=True,
+    cls=common.GradientArgument,
+)
+@click.option(
+    "--delete",
+    "delete",
+    is_flag=True,
+    help="Delete files of the dataset path which do not exist in the local directory",
+    cls=common.GradientOption,
+)
+@click.option(
+    "--dryRun",
+    "dry_run",
+    is_flag=True,
+    help="Only print files which would be uploaded and deleted",
+    cls=common.GradientOption,
+)
+@click.option(
+    "--compare",
+    "compare",
+    type=click.Choice([commands.SyncDatasetFilesCommand.COMPARE_ETAG, commands.SyncDatasetFilesCommand.COMPARE_MTIME]),
+    default=commands.SyncDatasetFilesCommand.COMPARE_ETAG,
+    help="Compare files of the same size by ETag/MD5 checksum, or trust the size and modification "
+         "time of files synced before",
+    cls=common.GradientOption,
+)
+@click.option(
+    "--partSize",
+    "part_size",
+    help="Size of parts of multipart uploads (ex: 64MB). Computed from file size and throughput by default",
+    cls=common.GradientOption,
+    type=ByteSizeType(),
+)
+@click.option(
+    "--maxBandwidth",
+    "max_bandwidth",
+    help="Max bytes per second transferred by all workers together (ex: 50MB)",
+    cls=common.GradientOption,
+    type=ByteSizeType(),
+)
+@click.option(
+    "--jsonProgress",
+    "json_progress",
+    is_flag=True,
+    help="Print progress events as JSON lines instead of a status line",
+    cls=common.GradientOption,
+)
+@click.option(
+    "--noChecksums",
+    "no_checksums",
+    is_flag=True,
+    help="Do not verify MD5 checksums of transferred files against their ETags",
+    cls=common.GradientOption,
+)
+@api_key_option
+@common.options_file
+def sync_dataset_files(api_key, source_path, target, delete, dry_run, compare, part_size, max_bandwidth,
+                       json_progress, no_checksums, options_file):
+    dataset_version_id, _, target_path = target.partition(':/')
+    validate_dataset_id(dataset_version_id, ref_type='version')
+    command = commands.SyncDatasetFilesCommand(api_key=api_key)
+    command.execute(source_path=source_path, dataset_version_id=dataset_version_id,
+                    target_path='/' + target_path, delete=delete, dry_run=dry_run,
+                    compare=compare, part_size=part_size, max_bandwidth=max_bandwidth,
+                    json_progress=json_progress, verify_checksums=not no_checksums)
@@ -24,3 +24,6 @@ class CliLogger(Logger):
     def debug(self, message, *args, **kwargs):
         if config.DEBUG:
             self._log("DEBUG: {}".format(message))
+
+    def is_debug_enabled(self):
+        return bool(config.DEBUG)
@@ -1,9 +1,17 @@
 import abc
+import base64
+import collections
+import contextlib
+import datetime
+import hashlib
+import json
 import mimetypes
 import multiprocessing
 import os
 import re
+import shlex
 import threading
+import time
 import uuid
 import math
 try:
@@ -11,9 +19,11 @@ try:
 except ImportError:
     import Queue as queue
 from xml.etree import ElementTree
-from urllib.parse import urlparse
+from urllib.parse import parse_qsl, urlparse
 from ..api_sdk.clients import http_client
 from ..api_sdk.config import config
+from ..api_sdk.rate_limiter import BandwidthLimiter
+from ..api_sdk.retry import RetryPolicy
 from ..cli_constants import CLI_PS_CLIENT_NAME
 
 import halo
@@ -24,9 +34,35 @@ from gradient import api_sdk
 from gradient.api_sdk.sdk_exceptions import ResourceFetchingError
 from gradient.cli_constants import CLI_PS_CLIENT_NAME
 from gradient.commands.common import BaseCommand, DetailsCommandMixin, ListCommandPagerMixin
-from gradient.exceptions import ApplicationError
+from gradient.exceptions import ApplicationError, ChecksumMismatchError
 
 S3_XMLNS = 'http://s3.amazonaws.com/doc/2006-03-01/'
+# limit of keys deleted by a single S3 DeleteObjects request
+DELETE_OBJECTS_BATCH_SIZE = 1000
+
+# every request to the storage provider is sent up to 5 times after transient failures.
+# POST requests are retried too, DeleteObjects can be safely sent again
+TRANSFER_RETRY_POLICY = RetryPolicy(
+    max_retries=4,
+    status_codes=(408, 429, 500, 502, 503, 504),
+    retry_all_methods=True,
+)
+TRANSIENT_REQUEST_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+
+class TransientStorageError(ApplicationError):
+    def __init__(self, message, response=None):
+        """Failure of request to storage provider which can succeed when sent again
+
+        :param str message:
+        :param requests.Response response: response, if the request was answered
+        """
+        super(TransientStorageError, self).__init__(message)
+        self.response = response
 
 
 class WorkerPool(object):
@@ -59,22 +95,24 @@ class WorkerPool(object):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if self._exception:
-            raise self._exception
+        if exc_val is not None:
+            self.set_exception(exc_val)
 
+        # running tasks are finished even after a failure,
+        # so nothing uses their files once the pool is left
         for _ in range(self.worker_count):
-            try:
-                self._work.put(None, block=True, timeout=1)
-            except queue.Full:
-                break
+            self._work.put(None, block=True)
 
         self._work.join()
 
         for thread in self._threads:
             thread.join()
 
+        if self._exception:
+            raise self._exception
+
     def _worker(self):
-        while not self.has_exception():
+        while True:
             try:
                 work = self._work.get(block=True, timeout=1)
             except queue.Empty:
@@ -84,6 +122,11 @@ class WorkerPool(object):
                 if work is None:
                     return
 
+                # work left in the queue after a failure is dropped,
+                # so that joining the queue does not wait for it
+                if self.has_exception():
+                    continue
+
                 (func, args, kwargs) = work
                 func(*args, **kwargs)
 
@@ -115,6 +158,298 @@ class WorkerPool(object):
             return self._completed_count
 
 
+def prefetch(iterable, max_size=1):
+    """Iterate over iterable in a background thread keeping up to max_size next items ready
+
+    Exceptions raised by iterable are raised in the consuming thread.
+
+    :param Iterable iterable:
+    :param int max_size:
+    :rtype: Iterator
+    """
+    items = queue.Queue(maxsize=max_size)
+    stopped = threading.Event()
+    end = object()
+
+    def put(item):
+        while not stopped.is_set():
+            try:
+                items.put(item, block=True, timeout=1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        iterator = iter(iterable)
+        try:
+            for item in iterator:
+                if not put((item, None)):
+                    break
+            else:
+                put((end, None))
+        except Exception as e:
+            put((end, e))
+        finally:
+            # stops prefetching of a chained iterable when the consumer is gone
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                close()
+
+    thread = threading.Thread(target=produce)
+    thread.daemon = True
+    thread.start()
+
+    try:
+        while True:
+            item, exception = items.get()
+            if exception is not None:
+                raise exception
+            if item is end:
+                return
+            yield item
+    finally:
+        stopped.set()
+
+
+def get_bandwidth_limiter(max_bandwidth):
+    """
+    :param int|BandwidthLimiter max_bandwidth: bytes per second or limiter shared with other transfers
+    :rtype: BandwidthLimiter|None
+    """
+    if not max_bandwidth:
+        return None
+    if isinstance(max_bandwidth, (int, float)):
+        return BandwidthLimiter(max_bandwidth)
+    return max_bandwidth
+
+
+def is_transient_s3_response(response):
+    """
+    :param requests.Response response:
+    :rtype: bool
+    """
+    if response.status_code in TRANSFER_RETRY_POLICY.status_codes:
+        return True
+
+    # S3 closes connections which did not send data in time
+    return response.status_code == 400 and 'RequestTimeout' in (response.text or '')
+
+
+def call_with_retries(func, *args, **kwargs):
+    """Call function sending requests to storage provider and call it again after transient failures
+
+    Delays between attempts grow exponentially according to TRANSFER_RETRY_POLICY.
+
+    :param callable func: raises TransientStorageError or one of TRANSIENT_REQUEST_ERRORS
+        when a request fails in a way it can succeed when sent again
+    """
+    attempt = 0
+    while True:
+        try:
+            return func(*args, **kwargs)
+        except TransientStorageError as e:
+            delay = TRANSFER_RETRY_POLICY.get_retry_delay('PUT', attempt, e.response)
+            if delay is None:
+                raise
+        except TRANSIENT_REQUEST_ERRORS as e:
+            delay = TRANSFER_RETRY_POLICY.get_retry_delay('PUT', attempt)
+            if delay is None:
+                raise ApplicationError('Failed to execute request against storage provider: %s' % e)
+
+        time.sleep(delay)
+        attempt += 1
+
+
+# throughput is measured over transfers of the last seconds
+PROGRESS_WINDOW_SECONDS = 10
+# min delay between progress events reporting bytes
+PROGRESS_EVENT_INTERVAL = 1
+
+
+def format_byte_size(size):
+    """
+    :param float size:
+    :rtype: str
+    """
+    for unit in ('B', 'KB', 'MB', 'GB', 'TB'):
+        if abs(size) < 1000 or unit == 'TB':
+            break
+        size /= 1000.0
+    return '{:.0f}{}'.format(size, unit) if unit == 'B' else '{:.1f}{}'.format(size, unit)
+
+
+class ProgressReader(object):
+    def __init__(self, f, length, on_read, checksum=None):
+        """File-like request body reporting bytes read by requests while they are sent
+
+        Not more than length bytes are read from f, so the body can be a slice of a larger file
+        streamed by requests in small blocks.
+
+        :param f: file-like object positioned at the first byte of body
+        :param int length: body length, sent as Content-Length
+        :param callable on_read: called with number of bytes read
+        :param checksum: hashlib object updated with bytes read, so the body does not have to be read again
+        """
+        self.f = f
+        self.length = length
+        self.on_read = on_read
+        self.checksum = checksum
+        self.read_count = 0
+
+    def __len__(self):
+        return self.length
+
+    def read(self, size=-1):
+        remaining = self.length - self.read_count
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+
+        data = self.f.read(size)
+        self.read_count += len(data)
+        if data:
+            if self.checksum is not None:
+                self.checksum.update(data)
+            self.on_read(len(data))
+        return data
+
+
+class TransferProgress(object):
+    def __init__(self, callback=None, clock=time.monotonic):
+        """Bytes and files transferred so far with rolling throughput and ETA
+
+        Workers report bytes as they are sent or received, so stats include files
+        still in transfer. Events are passed to callback as dicts with ``event`` and
+        the current stats:
+
+        - ``file_done`` with ``key`` and ``size`` when a file is transferred
+        - ``progress`` at most every PROGRESS_EVENT_INTERVAL seconds while bytes are transferred
+        - ``finished`` when the transfer ends
+
+        :param callable callback: called with every event. It can be called from worker threads
+        :param callable clock:
+        """
+        self.callback = callback
+        self.clock = clock
+
+        self.bytes_total = 0
+        self.bytes_done = 0
+        self.files_total = 0
+        self.files_done = 0
+        # bytes done of files in transfer by key
+        self._in_flight = {}
+
+        self._started = clock()
+        self._samples = collections.deque([(self._started, 0)])
+        self._last_event_time = self._started
+        self._lock = threading.Lock()
+
+    def add(self, key, size):
+        """Add file to transfer
+
+        :param str key:
+        :param int size:
+        """
+        with self._lock:
+            self.files_total += 1
+            self.bytes_total += size
+
+    def update(self, key, byte_count):
+        """Add bytes transferred of a file, negative if they have to be sent again
+
+        :param str key:
+        :param int byte_count:
+        """
+        with self._lock:
+            self._in_flight[key] = self._in_flight.get(key, 0) + byte_count
+            self.bytes_done += byte_count
+
+            now = self.clock()
+            self._samples.append((now, self.bytes_done))
+            while len(self._samples) > 2 and self._samples[1][0] < now - PROGRESS_WINDOW_SECONDS:
+                self._samples.popleft()
+
+            event = None
+            if now - self._last_event_time >= PROGRESS_EVENT_INTERVAL:
+                self._last_event_time = now
+                event = self._get_event('progress')
+
+        if event:
+            self._emit(event)
+
+    def file_done(self, key, size):
+        """
+        :param str key:
+        :param int size:
+        """
+        with self._lock:
+            self.bytes_done += size - self._in_flight.pop(key, 0)
+            self.files_done += 1
+            self._samples.append((self.clock(), self.bytes_done))
+            event = self._get_event('file_done', key=key, size=size)
+
+        self._emit(event)
+
+    def close(self):
+        with self._lock:
+            event = self._get_event('finished')
+
+        self._emit(event)
+
+    def get_stats(self):
+        """
+        :return: bytes and files done and total, bytes done of files in transfer,
+            throughput in bytes per second and ETA in seconds, None if not known yet
+        :rtype: dict
+        """
+        with self._lock:
+            return self._get_stats()
+
+    def _get_stats(self):
+        first_time, first_bytes = self._samples[0]
+        last_time, last_bytes = self._samples[-1]
+        throughput = (last_bytes - first_bytes) / (last_time - first_time) if last_time > first_time else None
+
+        eta = None
+        if throughput:
+            eta = max(self.bytes_total - self.bytes_done, 0) / throughput
+
+        return {
+            'bytes_done': self.bytes_done,
+            'bytes_total': self.bytes_total,
+            'bytes_in_flight': sum(self._in_flight.values()),
+            'files_done': self.files_done,
+            'files_total': self.files_total,
+            'throughput': throughput,
+            'eta': eta,
+            'elapsed': self.clock() - self._started,
+        }
+
+    def _get_event(self, name, **values):
+        event = {'event': name}
+        event.update(values)
+        event.update(self._get_stats())
+        return event
+
+    def _emit(self, event):
+        if self.callback:
+            self.callback(event)
+
+    def format(self):
+        """
+        :rtype: str
+        """
+        stats = self.get_stats()
+        text = '{} of {} ({} of {} files)'.format(
+            format_byte_size(stats['bytes_done']), format_byte_size(stats['bytes_total']),
+            stats['files_done'], stats['files_total'])
+        if stats['throughput']:
+            text += ', {}/s'.format(format_byte_size(stats['throughput']))
+        if stats['eta'] is not None:
+            text += ', ETA {}'.format(datetime.timedelta(seconds=round(stats['eta'])))
+        return text
+
+
 @six.add_metaclass(abc.ABCMeta)
 class BaseDatasetsCommand(BaseCommand):
     def _get_client(self, api_key, logger):
@@ -222,7 +557,15 @@ class ShowDatasetVersionDetailsCommand(DetailsCommandMixin, BaseDatasetVersionsC
 
 
 class CreateDatasetVersionCommand(BaseDatasetVersionsCommand):
-    def execute(self, dataset_id, message=None, source_paths=None):
+    def execute(self, dataset_id, message=None, source_paths=None, base_dataset_version_id=None):
+        """
+        :param str dataset_id:
+        :param str message:
+        :param list[str] source_paths: files and directories to put into the version
+        :param str base_dataset_version_id: dataset version the new one is derived from.
+            Files of directories unchanged since the base version are copied from it on
+            the storage provider side instead of being uploaded
+        """
         if source_paths:
             for source_path in source_paths:
                 if not os.path.exists(source_path):
@@ -234,15 +577,49 @@ class CreateDatasetVersionCommand(BaseDatasetVersionsCommand):
         self.logger.log(
             'Created dataset version: {}'.format(dataset_version_id))
 
-        if source_paths:
-            create = PutDatasetFilesCommand(
-                api_key=self.api_key, logger=self.logger)
-            create.execute(dataset_version_id,
-                           source_paths=source_paths, target_path='/')
+        if not source_paths:
+            return
+
+        # the version is committed only when all its files were uploaded
+        if base_dataset_version_id:
+            self._derive(dataset_version_id, source_paths, base_dataset_version_id)
+        else:
+            self._put(dataset_version_id, source_paths)
+
+        commit = CommitDatasetVersionCommand(
+            api_key=self.api_key, logger=self.logger)
+        commit.execute(dataset_version_id)
 
-            commit = CommitDatasetVersionCommand(
+    def _derive(self, dataset_version_id, source_paths, base_dataset_version_id):
+        file_paths = []
+        for source_path in source_paths:
+            if not os.path.isdir(source_path):
+                file_paths.append(source_path)
+                continue
+
+            # keys of files are the same as they would be with PutDatasetFilesCommand
+            target_path = '/'
+            if not source_path.endswith(os.path.sep):
+                target_path += os.path.basename(os.path.abspath(source_path))
+
+            sync = SyncDatasetFilesCommand(
                 api_key=self.api_key, logger=self.logger)
-            commit.execute(dataset_version_id)
+            sync.execute(source_path, dataset_version_id, target_path=target_path,
+                         base_dataset_version_id=base_dataset_version_id)
+
+        if file_paths:
+            self._put(dataset_version_id, file_paths)
+
+    def _put(self, dataset_version_id, source_paths):
+        create = PutDatasetFilesCommand(
+            api_key=self.api_key, logger=self.logger)
+        # running create again would create another version instead of resuming the upload
+        create.resume_hint = (
+            'Dataset version {id} was not committed. Resume the upload with "gradient datasets files put '
+            '--id {id} {paths} --target-path /" and commit it with "gradient datasets versions commit --id {id}"'
+        ).format(id=dataset_version_id, paths=' '.join('--source-path ' + shlex.quote(p) for p in source_paths))
+        create.execute(dataset_version_id,
+                       source_paths=source_paths, target_path='/')
 
 
 class UpdateDatasetVersionCommand(BaseDatasetVersionsCommand):
@@ -318,6 +695,42 @@ class BaseDatasetFilesCommand(BaseDatasetVersionsCommand):
             logger=self.logger,
             ps_client_name=CLI_PS_CLIENT_NAME,
         )
+        # every worker thread reuses its connections to the storage provider
+        self.sessions = http_client.ThreadLocalSessionPool()
+        self.progress = TransferProgress()
+        self.progress_callback = None
+        self.json_progress = False
+        # limits shared by all workers, uploads and downloads are limited separately
+        self.upload_limiter = None
+        self.download_limiter = None
+        # MD5 of transferred bytes is compared with ETags returned by the storage provider
+        self.verify_checksums = True
+        self._delete_errors = []
+        self._delete_errors_lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def _show_progress(self, status_text):
+        """Track progress of transfer and show it in status line or as JSON lines
+
+        Events of the progress are passed to progress_callback too.
+
+        :param str status_text:
+        """
+        with halo.Halo(text=status_text, spinner='dots', enabled=not self.json_progress) as status:
+            def on_event(event):
+                if self.json_progress:
+                    self.logger.log(json.dumps(event))
+                else:
+                    status.text = '{}: {}'.format(status_text, self.progress.format())
+
+                if self.progress_callback:
+                    self.progress_callback(event)
+
+            self.progress = TransferProgress(callback=on_event)
+            try:
+                yield status
+            finally:
+                self.progress.close()
 
     def assert_supported(self, dataset_id):
         dataset_id, _, _ = dataset_id.partition(':')
@@ -340,8 +753,11 @@ class BaseDatasetFilesCommand(BaseDatasetVersionsCommand):
     @staticmethod
     def validate_s3_response(response):
         if not response.ok:
-            raise ApplicationError('Failed to execute request against storage provider: %s\n\n%s' %
-                                   (response.status_code, response.text))
+            message = 'Failed to execute request against storage provider: %s\n\n%s' % (
+                response.status_code, response.text)
+            if is_transient_s3_response(response):
+                raise TransientStorageError(message, response)
+            raise ApplicationError(message)
 
     @staticmethod
     def report_connection_error(exception):
@@ -376,7 +792,11 @@ class BaseDatasetFilesCommand(BaseDatasetVersionsCommand):
             self.validate_s3_response(response)
 
             size = response.headers.get('Content-Length', 0)
-            return {'key': path, 'size': size}
+            result = {'key': path, 'size': size}
+            etag = response.headers.get('ETag')
+            if etag:
+                result['etag'] = etag.strip('"')
+            return result
         except requests.exceptions.ConnectionError as e:
             return self.report_connection_error(e)
 
@@ -429,6 +849,9 @@ class BaseDatasetFilesCommand(BaseDatasetVersionsCommand):
                     if not is_dir:
                         result['size'] = item.find(
                             '{' + S3_XMLNS + '}Size').text
+                        etag = item.find('{' + S3_XMLNS + '}ETag')
+                        if etag is not None and etag.text:
+                            result['etag'] = etag.text.strip('"')
 
                     results.append(result)
                 elif name == 'NextContinuationToken':
@@ -445,6 +868,79 @@ class BaseDatasetFilesCommand(BaseDatasetVersionsCommand):
             if not next_continuation_token:
                 break
 
+    @staticmethod
+    def _get_delete_objects_body(keys):
+        root = ElementTree.Element('Delete', xmlns=S3_XMLNS)
+        for key in keys:
+            ElementTree.SubElement(ElementTree.SubElement(root, 'Object'), 'Key').text = key
+        ElementTree.SubElement(root, 'Quiet').text = 'true'
+        return ElementTree.tostring(root, encoding='utf-8')
+
+    def _delete_objects(self, url, keys):
+        """Delete objects with a single S3 DeleteObjects request
+
+        :param str url: pre-signed URL of deleteObjects
+        :param list[str] keys:
+        :return: key, code and message of objects which were not deleted
+        :rtype: list[tuple[str,str,str]]
+        """
+        body = self._get_delete_objects_body(keys)
+        headers = {
+            'Content-Type': 'application/xml',
+            'Content-MD5': base64.b64encode(hashlib.md5(body).digest()).decode(),
+        }
+
+        def send():
+            response = self.sessions.get_session().post(url, data=body, headers=headers)
+            self.validate_s3_response(response)
+            return response
+
+        r = call_with_retries(send)
+
+        if not r.content:
+            return []
+
+        errors = []
+        for error in ElementTree.fromstring(r.content).iter('{%s}Error' % S3_XMLNS):
+            errors.append(tuple(error.findtext('{%s}%s' % (S3_XMLNS, name), '')
+                                for name in ('Key', 'Code', 'Message')))
+        return errors
+
+    def _delete_batch(self, url, keys):
+        errors = self._delete_objects(url, keys)
+        if errors:
+            with self._delete_errors_lock:
+                self._delete_errors.extend(errors)
+
+    def _sign_and_delete(self, dataset_version_id, pool, results, update_status):
+        batches = [[r['key'] for r in results[i:i + DELETE_OBJECTS_BATCH_SIZE]]
+                   for i in range(0, len(results), DELETE_OBJECTS_BATCH_SIZE)]
+        if not batches:
+            return
+
+        pre_signeds = self.client.generate_pre_signed_s3_urls(
+            dataset_version_id,
+            calls=[dict(method='deleteObjects', params=dict(
+                Delete=dict(Objects=[dict(Key=key) for key in keys], Quiet=True))) for keys in batches],
+        )
+
+        for keys, pre_signed in zip(batches, pre_signeds):
+            update_status()
+            pool.put(self._delete_batch, url=pre_signed.url, keys=keys)
+
+    def _raise_delete_errors(self, max_reported_count=20):
+        """Raise error listing files which were not deleted by earlier DeleteObjects requests"""
+        with self._delete_errors_lock:
+            errors, self._delete_errors = self._delete_errors, []
+
+        if not errors:
+            return
+
+        lines = ['{}: {} {}'.format(key, code, message).rstrip() for key, code, message in errors[:max_reported_count]]
+        if len(errors) > max_reported_count:
+            lines.append('and {} more'.format(len(errors) - max_reported_count))
+        raise ApplicationError('Failed to delete {} files:\n{}'.format(len(errors), '\n'.join(lines)))
+
 
 class ListDatasetFilesCommand(ListCommandPagerMixin, BaseDatasetFilesCommand):
     def _get_table_data(self, objects):
@@ -465,238 +961,1036 @@ class ListDatasetFilesCommand(ListCommandPagerMixin, BaseDatasetFilesCommand):
         return self.list_objects(**kwargs)
 
 
-class GetDatasetFilesCommand(BaseDatasetFilesCommand):
+DOWNLOAD_BUFFER_SIZE = 1024 ** 2  # 1MiB
+DOWNLOAD_PART_SIZE = 64 * 1024 ** 2  # 64MiB
+# objects over this size are downloaded in byte ranges by all workers of the pool
+RANGED_DOWNLOAD_THRESHOLD = 2 * DOWNLOAD_PART_SIZE
+# pages of objects listed and pre-signed ahead of the downloads
+DOWNLOAD_PREFETCH_PAGE_COUNT = 2
+
+
+def write_at(fd, data, offset, lock=None):
+    """Write data at offset of file descriptor without moving a shared file position
+
+    :param int fd:
+    :param bytes data:
+    :param int offset:
+    :param threading.Lock lock: used where os.pwrite is not available
+    """
+    if hasattr(os, 'pwrite'):
+        while data:
+            written = os.pwrite(fd, data, offset)
+            data = data[written:]
+            offset += written
+        return
+
+    with lock:
+        os.lseek(fd, offset, os.SEEK_SET)
+        while data:
+            written = os.write(fd, data)
+            data = data[written:]
+
+
+def get_tmp_path(path, etag=None):
+    """Get path of temporary file of a download
+
+    Files of objects with an ETag are named after it, so an interrupted download
+    of the same object can be resumed.
+
+    :param str path:
+    :param str etag:
+    :rtype: str
+    """
+    if etag:
+        return '{}.tmp-{}'.format(path, re.sub(r'[^0-9A-Za-z-]', '', etag))
+    return path + '.tmp-%s' % uuid.uuid4()
+
+
+class RangedDownload(object):
+
+    def __init__(self, path, size, ranges, etag=None, key=None):
+        """Download of an object in byte ranges written in place to a temporary file
+
+        The temporary file is preallocated to the object size and renamed to path
+        when its last range is written. For objects with an ETag, written ranges are
+        recorded next to the temporary file, so an interrupted download can be resumed.
+
+        :param str path:
+        :param int size:
+        :param list[tuple[int,int]] ranges: first and last bytes of ranges
+        :param str etag:
+        :param str key: key of the object
+        """
+        self.path = path
+        self.size = size
+        self.etag = etag
+        self.key = key
+        self.tmp_path = get_tmp_path(path, etag)
+        self.ranges_path = self.tmp_path + '.ranges' if etag else None
+
+        done_ranges = set()
+        if self.ranges_path and os.path.isfile(self.tmp_path):
+            done_ranges = self._read_done_ranges()
+        self.pending_ranges = [r for r in ranges if r not in done_ranges]
+
+        self._remaining_count = len(self.pending_ranges)
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+        self.fd = os.open(self.tmp_path, os.O_RDWR | os.O_CREAT | getattr(os, 'O_BINARY', 0), 0o666)
+        if os.fstat(self.fd).st_size > size:
+            os.ftruncate(self.fd, size)
+        try:
+            os.posix_fallocate(self.fd, 0, size)
+        except (AttributeError, OSError):
+            os.ftruncate(self.fd, size)
+
+        self._ranges_file = None
+        if self.ranges_path:
+            self._ranges_file = open(self.ranges_path, 'a' if done_ranges else 'w')
+
+    def _read_done_ranges(self):
+        done_ranges = set()
+        try:
+            with open(self.ranges_path) as f:
+                for line in f:
+                    first_byte, _, last_byte = line.strip().partition('-')
+                    if first_byte.isdigit() and last_byte.isdigit():
+                        done_ranges.add((int(first_byte), int(last_byte)))
+        except IOError:
+            pass
+        return done_ranges
+
+    def write(self, data, offset):
+        write_at(self.fd, data, offset, lock=self._write_lock)
+
+    def range_done(self, first_byte, last_byte):
+        """
+        :return: True if it was the last range and the download is finished
+        :rtype: bool
+        """
+        with self._lock:
+            if self._ranges_file:
+                self._ranges_file.write('{}-{}\n'.format(first_byte, last_byte))
+                self._ranges_file.flush()
+
+            self._remaining_count -= 1
+            if self._remaining_count:
+                return False
+
+        self.finish()
+        return True
+
+    def _close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+        if self._ranges_file:
+            self._ranges_file.close()
+            self._ranges_file = None
+
+    def finish(self):
+        self._close()
+        os.replace(self.tmp_path, self.path)
+        if self.ranges_path and os.path.isfile(self.ranges_path):
+            os.remove(self.ranges_path)
+
+    @property
+    def is_done(self):
+        return self.fd is None and not os.path.exists(self.tmp_path)
+
+    def abort(self):
+        """Stop the download, keeping what was downloaded if it can be resumed"""
+        self._close()
+        if not self.ranges_path and os.path.isfile(self.tmp_path):
+            os.remove(self.tmp_path)
 
-    @classmethod
-    def _get(cls, url, path):
-        dir_path = os.path.dirname(path)
-        tmp_path = path + '.tmp-%s' % uuid.uuid4()
 
+class GetDatasetFilesCommand(BaseDatasetFilesCommand):
+    def __init__(self, *args, **kwargs):
+        super(GetDatasetFilesCommand, self).__init__(*args, **kwargs)
+        self._ranged_downloads = []
+        self.target_path = None
+        self.index = None
+        self._skipped_count = 0
+
+    @staticmethod
+    def _prepare_path(path):
         if os.path.exists(path) and not os.path.isfile(path):
             raise ApplicationError('%s already exists' % path)
 
-        os.makedirs(dir_path, exist_ok=True)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def _file_downloaded(self, key, path, size, etag):
+        self.progress.file_done(key, size)
 
+        if self.index and etag:
+            stat = os.stat(path)
+            self.index.update(os.path.relpath(path, self.target_path), stat.st_size, stat.st_mtime_ns,
+                              etag=etag, synced=True)
+
+    def _is_downloaded(self, path, result):
+        if not os.path.isfile(path):
+            return False
+
+        stat = os.stat(path)
+        if stat.st_size != int(result.get('size') or 0):
+            return False
+
+        return self.index.matches(os.path.relpath(path, self.target_path), path, stat.st_size,
+                                  stat.st_mtime_ns, result.get('etag'))
+
+    def _get(self, url, path, key, size=None, etag=None):
+        tmp_path = get_tmp_path(path, etag)
+        self._prepare_path(path)
+
+        # data of an interrupted download of the same object is kept
+        offset = os.path.getsize(tmp_path) if etag and os.path.isfile(tmp_path) else 0
+        if size is None or offset > size or (offset and offset == size and not self._is_complete(tmp_path, etag)):
+            # a leftover of full size is kept only if its checksum matches the ETag
+            offset = 0
+            if etag and os.path.isfile(tmp_path):
+                os.remove(tmp_path)
+
+        if offset:
+            self.progress.update(key, offset)
+
+        completed = False
         try:
-            with requests.Session() as session:
-                try:
-                    with session.get(url, stream=True) as r:
-                        cls.validate_s3_response(r)
-                        with open(tmp_path, 'wb') as f:
-                            for chunk in r.iter_content(chunk_size=8192):
-                                f.write(chunk)
-                except requests.exceptions.ConnectionError as e:
-                    return cls.report_connection_error(e)
-
-            os.rename(tmp_path, path)
+            if not offset or offset < size:
+                call_with_retries(self._get_to_file, url, tmp_path, key, resume=bool(etag))
+
+            os.replace(tmp_path, path)
+            completed = True
         finally:
-            if os.path.isfile(tmp_path):
+            if not completed and not etag and os.path.isfile(tmp_path):
                 os.remove(tmp_path)
 
-    def execute(self, dataset_version_id, source_paths, target_path):
+        self._file_downloaded(key, path, size, etag)
+
+    def _is_complete(self, tmp_path, etag):
+        """Check if temporary file of full size left by an interrupted download has content of the object
+
+        :rtype: bool
+        """
+        return self.verify_checksums and is_md5_etag(etag) and file_md5(tmp_path) == etag
+
+    def _chunk_downloaded(self, key, byte_count):
+        self.progress.update(key, byte_count)
+        if self.download_limiter:
+            self.download_limiter.consume(byte_count)
+
+    def _get_to_file(self, url, tmp_path, key, resume=False):
+        """
+        :param bool resume: continue from the end of existing temporary file
+        """
+        offset = os.path.getsize(tmp_path) if resume and os.path.isfile(tmp_path) else 0
+        headers = {'Range': 'bytes={}-'.format(offset)} if offset else {}
+        written = 0
+        etag = None
+        md5 = None
+
+        try:
+            with self.sessions.get_session().get(url, headers=headers, stream=True) as r:
+                self.validate_s3_response(r)
+                # the whole object is sent if range is not supported
+                if offset and r.status_code != 206:
+                    self.progress.update(key, -offset)
+                    offset = 0
+
+                etag = get_response_etag(r) if self.verify_checksums else None
+                if etag:
+                    # only bytes kept by an interrupted download are read again
+                    md5 = file_md5(tmp_path, as_hex=False) if offset else hashlib.md5()
+
+                with open(tmp_path, 'ab' if offset else 'wb') as f:
+                    for chunk in r.iter_content(chunk_size=DOWNLOAD_BUFFER_SIZE):
+                        f.write(chunk)
+                        if md5 is not None:
+                            md5.update(chunk)
+                        written += len(chunk)
+                        self._chunk_downloaded(key, len(chunk))
+        except Exception:
+            # bytes which are not kept are downloaded again
+            if written and not resume:
+                self.progress.update(key, -written)
+            raise
+
+        if md5 is not None and md5.hexdigest() != etag:
+            os.remove(tmp_path)
+            self.progress.update(key, -(offset + written))
+            verify_checksum(key, md5.hexdigest(), etag)
+
+    def _get_range_to_file(self, url, download, first_byte, last_byte):
+        headers = {'Range': 'bytes={}-{}'.format(first_byte, last_byte)}
+        offset = first_byte
+
+        try:
+            with self.sessions.get_session().get(url, headers=headers, stream=True) as r:
+                self.validate_s3_response(r)
+                if r.status_code != 206:
+                    raise ApplicationError('Storage provider did not return byte range of %s' % download.path)
+
+                for chunk in r.iter_content(chunk_size=DOWNLOAD_BUFFER_SIZE):
+                    download.write(chunk, offset)
+                    offset += len(chunk)
+                    self._chunk_downloaded(download.key, len(chunk))
+
+            if offset != last_byte + 1:
+                raise TransientStorageError('Incomplete download of %s' % download.path)
+        except Exception:
+            # the whole range is downloaded again
+            self.progress.update(download.key, first_byte - offset)
+            raise
+
+    def _get_range(self, url, download, first_byte, last_byte):
+        call_with_retries(self._get_range_to_file, url, download, first_byte, last_byte)
+
+        if download.range_done(first_byte, last_byte):
+            self._file_downloaded(download.key, download.path, download.size, download.etag)
+
+    def _get_ranged(self, pool, url, path, key, size, etag=None):
+        self._prepare_path(path)
+
+        ranges = [(first_byte, min(first_byte + DOWNLOAD_PART_SIZE, size) - 1)
+                  for first_byte in range(0, size, DOWNLOAD_PART_SIZE)]
+        download = RangedDownload(path, size, ranges, etag=etag, key=key)
+        self._ranged_downloads.append(download)
+
+        # ranges written before the download was interrupted
+        done_size = size - sum(last_byte - first_byte + 1 for first_byte, last_byte in download.pending_ranges)
+        if done_size:
+            self.progress.update(key, done_size)
+
+        if not download.pending_ranges:
+            download.finish()
+            self._file_downloaded(key, path, size, etag)
+            return
+
+        for first_byte, last_byte in download.pending_ranges:
+            pool.put(self._get_range, url, download, first_byte, last_byte)
+
+    def execute(self, dataset_version_id, source_paths, target_path, skip_existing=False, progress_callback=None,
+                json_progress=False, max_bandwidth=None, verify_checksums=True):
+        """
+        :param str dataset_version_id:
+        :param list[str] source_paths:
+        :param str target_path:
+        :param bool skip_existing: do not download objects already downloaded to the target path.
+            Files are compared by size and ETag, which is recorded for files downloaded with this option,
+            so they do not have to be hashed
+        :param callable progress_callback: called with progress events, see TransferProgress
+        :param bool json_progress: log progress events as JSON lines instead of showing a status line
+        :param int|BandwidthLimiter max_bandwidth: max bytes per second downloaded by all workers.
+            The same limiter can be passed to several commands to limit them together
+        :param bool verify_checksums: compare MD5 of downloaded files with their ETags.
+            Files downloaded in ranges and files uploaded with multipart uploads are not verified
+        """
         self.assert_supported(dataset_version_id)
+        self.progress_callback = progress_callback
+        self.json_progress = json_progress
+        self.download_limiter = get_bandwidth_limiter(max_bandwidth)
+        self.verify_checksums = verify_checksums
 
         dataset_version_id = self.resolve_dataset_version_id(
             dataset_version_id)
 
         target_path = os.path.abspath(target_path)
+        self.target_path = target_path
+        # downloaded files are recorded only to be skipped by later downloads
+        self.index = SyncState.open(target_path, dataset_version_id, '/') if skip_existing else None
 
         if not source_paths:
             source_paths = ['/']
 
-        status_text = 'Downloading files'
+        try:
+            self._get_files(dataset_version_id, source_paths, target_path, skip_existing)
+        finally:
+            for download in self._ranged_downloads:
+                if not download.is_done:
+                    download.abort()
+            self._ranged_downloads = []
+            if self.index:
+                self.index.save()
+
+    def _list_downloads(self, dataset_version_id, source_paths, target_path, max_keys, skip_existing=False):
+        """Yield pages of objects to download with their target paths
+
+        :rtype: Iterator[list[tuple[dict,str]]]
+        """
+        for source_path in source_paths:
+            source_path = self.normalize_path(source_path)
+
+            list_objects = None
+            is_file = False
+            has_trailing_slash = source_path.endswith('/')
+
+            if not has_trailing_slash:
+                result = self.get_object(
+                    dataset_version_id, source_path)
+                if result is not None:
+                    list_objects = [([result], False)]
+                    is_file = True
+
+            if not list_objects:
+                list_objects = self.list_objects(
+                    dataset_version_id=dataset_version_id,
+                    path=source_path,
+                    recursive=True,
+                    absolute=True,
+                    max_keys=max_keys,
+                )
 
-        with halo.Halo(text=status_text, spinner='dots') as status:
-            with WorkerPool() as pool:
-                for source_path in source_paths:
-                    source_path = self.normalize_path(source_path)
+            for results, _ in list_objects:
+                if not results:
+                    break
+
+                downloads = []
+                for result in results:
+                    if is_file:
+                        path = target_path
+                    elif has_trailing_slash:
+                        path = os.path.join(
+                            target_path, result['key'][len(source_path)-1:])
+                    else:
+                        path = os.path.join(target_path, result['key'])
+
+                    if skip_existing and self._is_downloaded(path, result):
+                        self._skipped_count += 1
+                        continue
 
-                    list_objects = None
-                    is_file = False
-                    has_trailing_slash = source_path.endswith('/')
+                    downloads.append((result, path))
 
-                    if not has_trailing_slash:
-                        result = self.get_object(
-                            dataset_version_id, source_path)
-                        if result is not None:
-                            list_objects = [([result], False)]
-                            is_file = True
-
-                    if not list_objects:
-                        list_objects = self.list_objects(
-                            dataset_version_id=dataset_version_id,
-                            path=source_path,
-                            recursive=True,
-                            absolute=True,
-                            max_keys=max(pool.worker_count * 2, 64)
-                        )
+                if downloads:
+                    yield downloads
 
-                    def update_status():
-                        status.text = '{}: {} ({})  '.format(
-                            status_text, source_path, pool.completed_count())
+    def _pre_sign_downloads(self, dataset_version_id, pages):
+        """Yield pages of objects to download with their target paths and pre-signed URLs
 
-                    for results, _ in list_objects:
-                        if not results:
-                            break
+        :rtype: Iterator[list[tuple[dict,str,str]]]
+        """
+        for downloads in pages:
+            pre_signeds = self.client.generate_pre_signed_s3_urls(
+                dataset_version_id,
+                calls=[dict(method='getObject', params=dict(
+                    Key=result['key'])) for result, _ in downloads],
+            )
 
-                        pre_signeds = self.client.generate_pre_signed_s3_urls(
-                            dataset_version_id,
-                            calls=[dict(method='getObject', params=dict(
-                                Key=r['key'])) for r in results],
-                        )
+            yield [(result, path, pre_signed.url) for (result, path), pre_signed in zip(downloads, pre_signeds)]
 
-                        for result, pre_signed in zip(results, pre_signeds):
-                            if is_file:
-                                path = target_path
-                            elif has_trailing_slash:
-                                path = os.path.join(
-                                    target_path, result['key'][len(source_path)-1:])
-                            else:
-                                path = os.path.join(target_path, result['key'])
+    def _get_files(self, dataset_version_id, source_paths, target_path, skip_existing=False):
+        status_text = 'Downloading files'
+        self._skipped_count = 0
+
+        with self._show_progress(status_text):
+            with self.sessions, WorkerPool() as pool:
+                # objects are listed and pre-signed in their own threads a few pages ahead,
+                # so workers do not wait for them between pages
+                pages = prefetch(self._list_downloads(
+                    dataset_version_id, source_paths, target_path,
+                    max_keys=max(pool.worker_count * 2, 64),
+                    skip_existing=skip_existing,
+                ), max_size=DOWNLOAD_PREFETCH_PAGE_COUNT)
+                pre_signed_pages = prefetch(self._pre_sign_downloads(dataset_version_id, pages),
+                                            max_size=DOWNLOAD_PREFETCH_PAGE_COUNT)
+
+                for downloads in pre_signed_pages:
+                    if pool.has_exception():
+                        pre_signed_pages.close()
+                        break
+
+                    for result, path, url in downloads:
+                        key = result['key']
+                        size = int(result.get('size') or 0)
+                        etag = result.get('etag')
+                        self.progress.add(key, size)
+                        if size > RANGED_DOWNLOAD_THRESHOLD:
+                            self._get_ranged(pool, url, path, key, size, etag=etag)
+                        else:
+                            pool.put(self._get, url=url, path=path, key=key, size=size, etag=etag)
 
-                            update_status()
-                            pool.put(self._get, url=pre_signed.url, path=path)
+        if self._skipped_count:
+            self.logger.log('Skipped {} files already downloaded'.format(self._skipped_count))
 
 
 MULTIPART_CHUNK_SIZE = int(15e6)  # 15MB
 PUT_TIMEOUT = 300  # 5 minutes
+PART_PRE_SIGN_BATCH_SIZE = 100
+
+# limits of S3 multipart uploads
+MIN_PART_SIZE = 5 * 1024 ** 2  # 5MiB
+MAX_PART_SIZE = 5 * 1024 ** 3  # 5GiB
+MAX_PART_COUNT = 10000
+
+# objects over this size have to be copied with a multipart upload
+MAX_COPY_OBJECT_SIZE = 5 * 1024 ** 3  # 5GiB
+COPY_PART_SIZE = 1024 ** 3  # 1GiB
+
+# with a known throughput parts are sized to be uploaded in about this many seconds
+PART_UPLOAD_SECONDS = 10
+
+
+def get_part_size(size, part_size=None, throughput=None):
+    """Get size of parts of multipart upload of a file
+
+    Unless part size is given, parts are sized to take about PART_UPLOAD_SECONDS
+    to upload with the given throughput, but not less than MULTIPART_CHUNK_SIZE.
+    Part size is raised if needed to fit the file in MAX_PART_COUNT parts
+    and kept between MIN_PART_SIZE and MAX_PART_SIZE.
+
+    :param int size: file size in bytes
+    :param int part_size: requested part size in bytes
+    :param float throughput: measured upload throughput of a single stream in bytes per second
+    :rtype: int
+    """
+    if size > MAX_PART_SIZE * MAX_PART_COUNT:
+        raise ApplicationError('File too large to upload: {} bytes'.format(size))
+
+    if not part_size:
+        part_size = MULTIPART_CHUNK_SIZE
+        if throughput:
+            part_size = max(part_size, int(throughput * PART_UPLOAD_SECONDS))
+
+    part_size = max(part_size, math.ceil(size / MAX_PART_COUNT), MIN_PART_SIZE)
+    return min(part_size, MAX_PART_SIZE)
+
+
+class ThroughputMeter(object):
+
+    def __init__(self, smoothing=0.3):
+        """Moving average of throughput of single transfers
+
+        :param float smoothing: weight of the latest measurement
+        """
+        self.smoothing = smoothing
+        self._throughput = None
+        self._lock = threading.Lock()
+
+    def add(self, byte_count, seconds):
+        """
+        :param int byte_count:
+        :param float seconds:
+        """
+        if byte_count <= 0 or seconds <= 0:
+            return
+
+        throughput = byte_count / seconds
+        with self._lock:
+            if self._throughput is None:
+                self._throughput = throughput
+            else:
+                self._throughput += self.smoothing * (throughput - self._throughput)
+
+    def get(self):
+        """
+        :return: bytes per second or None if nothing was measured yet
+        :rtype: float|None
+        """
+        with self._lock:
+            return self._throughput
+
+
+class UploadJournal(object):
+
+    def __init__(self, path):
+        """Journal of uploaded files and parts allowing to resume an interrupted upload
+
+        Events are appended to the journal file as JSON lines, so recording a part
+        does not rewrite the file. A journal is read by replaying its events; a line
+        left incomplete by an interrupted process is ignored.
+
+        :param str path: journal file path
+        """
+        self.path = path
+        self.files = {}
+        self.uploads = {}
+
+        self._file = None
+        self._lock = threading.Lock()
+
+        self._load()
+
+    @classmethod
+    def open(cls, dataset_version_id, source_paths, target_path, directory=None):
+        """Open journal of upload of source paths to dataset version
+
+        :param str dataset_version_id:
+        :param list[str] source_paths:
+        :param str target_path:
+        :param str directory: journals directory, CONFIG_DIR_PATH/transfers by default
+        :rtype: UploadJournal
+        """
+        if directory is None:
+            directory = os.path.join(config.CONFIG_DIR_PATH, 'transfers')
+
+        # trailing separator of source path changes keys of uploaded files
+        source_paths = sorted(os.path.abspath(p) + ('/' if p.endswith(os.path.sep) else '') for p in source_paths)
+        name_data = json.dumps([dataset_version_id, source_paths, target_path])
+        name = hashlib.sha1(name_data.encode('utf-8')).hexdigest()
+        return cls(os.path.join(directory, 'upload-{}.jsonl'.format(name)))
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                lines = f.readlines()
+        except IOError:
+            return
+
+        for line in lines:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            self._apply(event)
+
+    def _apply(self, event):
+        name = event['event']
+        key = event['key']
+
+        if name == 'file_done':
+            self.files[key] = (event['size'], event['mtime'])
+            self.uploads.pop(key, None)
+        elif name == 'upload_started':
+            self.files.pop(key, None)
+            self.uploads[key] = {
+                'upload_id': event['upload_id'],
+                'size': event['size'],
+                'mtime': event['mtime'],
+                'part_size': event['part_size'],
+                'parts': {},
+            }
+        elif name == 'part_done':
+            upload = self.uploads.get(key)
+            if upload and upload['upload_id'] == event['upload_id']:
+                upload['parts'][event['part_number']] = event['etag']
+        elif name == 'upload_aborted':
+            self.uploads.pop(key, None)
+
+    def _record(self, **event):
+        with self._lock:
+            self._apply(event)
+
+            if self._file is None:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                self._file = open(self.path, 'a')
+            self._file.write(json.dumps(event) + '\n')
+            self._file.flush()
+
+    def is_file_done(self, key, size, mtime):
+        with self._lock:
+            return self.files.get(key) == (size, mtime)
+
+    def get_upload(self, key):
+        """Get multipart upload of the file started by an earlier run
+
+        :return: dict with upload_id, size, mtime, part_size and parts or None
+        :rtype: dict|None
+        """
+        with self._lock:
+            upload = self.uploads.get(key)
+            if upload:
+                return dict(upload, parts=dict(upload['parts']))
+
+    def file_done(self, key, size, mtime):
+        self._record(event='file_done', key=key, size=size, mtime=mtime)
+
+    def upload_started(self, key, upload_id, size, mtime, part_size):
+        self._record(event='upload_started', key=key, upload_id=upload_id, size=size, mtime=mtime,
+                     part_size=part_size)
+
+    def part_done(self, key, upload_id, part_number, etag):
+        self._record(event='part_done', key=key, upload_id=upload_id, part_number=part_number, etag=etag)
+
+    def upload_aborted(self, key):
+        self._record(event='upload_aborted', key=key)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def remove(self):
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class MultipartUpload(object):
+
+    def __init__(self, api_client, url, dataset_version_id, key, upload_id, part_count, path=None, size=None,
+                 mtime=None, parts=None, journal=None, on_complete=None):
+        """Multipart upload of a file completed when its last part is uploaded
+
+        Parts are uploaded by workers of a pool in any order. The worker adding the last
+        part calls ``completeMultipartUpload``.
+
+        :param http_client.API api_client:
+        :param str url: pre-signed URLs endpoint of dataset version
+        :param str dataset_version_id:
+        :param str key:
+        :param str upload_id:
+        :param int part_count:
+        :param str path: local file path
+        :param int size: file size
+        :param int mtime: file modification time in nanoseconds
+        :param dict[int,str] parts: ETags of parts uploaded earlier
+        :param UploadJournal journal:
+        :param callable on_complete: called with key, size, mtime and ETag when the upload is completed
+        """
+        self.api_client = api_client
+        self.url = url
+        self.dataset_version_id = dataset_version_id
+        self.key = key
+        self.upload_id = upload_id
+        self.part_count = part_count
+        self.path = path
+        self.size = size
+        self.mtime = mtime
+        self.journal = journal
+        self.on_complete = on_complete
+        self.is_completed = False
+
+        self._parts = dict(parts or {})
+        self._lock = threading.Lock()
+
+    @property
+    def is_uploaded(self):
+        with self._lock:
+            return len(self._parts) == self.part_count
+
+    def add_part(self, part_number, etag):
+        """Add uploaded part and complete the upload if it was the last one
+
+        :param int part_number:
+        :param str etag:
+        """
+        with self._lock:
+            self._parts[part_number] = etag
+            uploaded_count = len(self._parts)
+
+        if self.journal:
+            self.journal.part_done(self.key, self.upload_id, part_number, etag)
+
+        if uploaded_count == self.part_count:
+            self.complete()
+
+    def complete(self):
+        with self._lock:
+            parts = [{'ETag': etag, 'PartNumber': part_number}
+                     for part_number, etag in sorted(self._parts.items())]
+
+        response = call_s3_method(
+            self.api_client, self.url, self.dataset_version_id, 'completeMultipartUpload', {
+                'Key': self.key,
+                'UploadId': self.upload_id,
+                'MultipartUpload': {'Parts': parts},
+            })
+        if not response.ok:
+            raise ApplicationError(f'Unable to complete upload of {self.path}')
+
+        etag = get_multipart_etag([part['ETag'] for part in parts])
+        result = response.json()[0].get('url')
+        remote_etag = result.get('ETag') if isinstance(result, dict) else None
+        if etag and remote_etag:
+            verify_checksum(self.path, etag, remote_etag.strip('"'))
+        self.is_completed = True
+
+        if self.on_complete:
+            self.on_complete(self.key, self.size, self.mtime, etag=etag)
+
+
+def call_s3_method(api_client, url, dataset_version_id, method, params):
+    dataset_id, _, version = dataset_version_id.partition(':')
+    return api_client.post(
+        url=url,
+        json={
+            'datasetId': dataset_id,
+            'version': version,
+            'calls': [{'method': method, 'params': params}],
+        }
+    )
 
 
 class PutDatasetFilesCommand(BaseDatasetFilesCommand):
+    # shown when files are left pending in the journal
+    resume_hint = 'Run the command again to resume the upload'
+
+    def __init__(self, *args, **kwargs):
+        super(PutDatasetFilesCommand, self).__init__(*args, **kwargs)
+        self.part_size = None
+        self.throughput = ThroughputMeter()
+        self.journal = None
+        # multipart uploads started by this run
+        self._uploads = []
+        self._upload_errors = []
+        self._upload_errors_lock = threading.Lock()
+
+    def _put_body(self, url, f, length, key, headers, checksum=None):
+        """Send request body read from file to url reporting its bytes to progress
+
+        :param str url:
+        :param f: file-like object positioned at the first byte of body
+        :param int length:
+        :param str key: key of the file in progress
+        :param dict headers:
+        :param checksum: hashlib object updated with bytes of the body
+        :rtype: requests.Response
+        """
+        def on_read(byte_count):
+            self.progress.update(key, byte_count)
+            if self.upload_limiter:
+                self.upload_limiter.consume(byte_count)
+
+        body = ProgressReader(f, length, on_read, checksum=checksum)
+        response = None
+        try:
+            response = self.sessions.get_session().put(url, data=body, headers=headers, timeout=PUT_TIMEOUT)
+            return response
+        finally:
+            # bytes of failed requests are sent again
+            if response is None or not response.ok:
+                self.progress.update(key, -body.read_count)
 
-    # @classmethod
-    def _put(self, session, path, url, content_type, dataset_version_id=None, key=None):
+    def _put(self, path, url, content_type, key=None, mtime=None):
         size = os.path.getsize(path)
         headers = {'Content-Type': content_type}
 
-        try:
+        def send():
+            md5 = hashlib.md5() if self.verify_checksums else None
             if size <= 0:
                 headers.update({'Content-Size': '0'})
-                r = session.put(url, data='', headers=headers, timeout=5)
-            # for files under 15MB
-            elif size <= (MULTIPART_CHUNK_SIZE):
-                with open(path, 'rb') as f:
-                    r = session.put(
-                        url, data=f, headers=headers, timeout=PUT_TIMEOUT)
-            # # for chonky files, use a multipart upload
+                response = self.sessions.get_session().put(url, data='', headers=headers, timeout=5)
             else:
-                # Chunks need to be at least 5MB or AWS throws an
-                # EntityTooSmall error; we'll arbitrarily choose a
-                # 15MB chunksize
-                #
-                # Note also that AWS limits the max number of chunks
-                # in a multipart upload to 10000, so this setting
-                # currently enforces a hard limit on 150GB per file.
-                #
-                # We can dynamically assign a larger part size if needed,
-                # but for the majority of use cases we should be fine
-                # as-is
-                part_minsize = MULTIPART_CHUNK_SIZE
-                dataset_id, _, version = dataset_version_id.partition(":")
-                mpu_url = f'/datasets/{dataset_id}/versions/{version}/s3/preSignedUrls'
-                api_client = http_client.API(
-                    api_url=config.CONFIG_HOST,
-                    api_key=self.api_key,
-                    ps_client_name=CLI_PS_CLIENT_NAME
-                )
+                with open(path, 'rb') as f:
+                    response = self._put_body(url, f, size, key or path, headers, checksum=md5)
 
-                mpu_create_res = api_client.post(
-                    url=mpu_url,
-                    json={
-                        'datasetId': dataset_id,
-                        'version': version,
-                        'calls': [{
-                            'method': 'createMultipartUpload',
-                            'params': {'Key': key}
-                        }]
-                    }
-                )
+            if not response.ok and is_transient_s3_response(response):
+                raise TransientStorageError('Unable to upload %s' % path, response)
+            if response.ok and md5 is not None:
+                verify_checksum(path, md5.hexdigest(), get_response_etag(response))
+            return response
 
-                mpu_data = mpu_create_res.json()[0]['url']
+        try:
+            started = time.monotonic()
+            r = call_with_retries(send)
+            self.validate_s3_response(r)
+            if size > 0:
+                self.throughput.add(size, time.monotonic() - started)
+
+            etag = r.headers.get('ETag') if r.headers else None
+            self._file_uploaded(key, size, mtime, etag=etag.strip('"') if etag else None)
+        except Exception as e:
+            # other files are uploaded, failures are raised when the pool is done.
+            # Failed files are not recorded in the journal, so running the upload again sends them again
+            self._upload_failed(key or path, e)
 
-                parts = []
-                with open(path, 'rb') as f:
-                    # we +1 the number of parts since we count from zero
-                    # to match what AWS expects for part numbers. We use
-                    # `ceil` to capture any remaining data less than
-                    # part_minsize at the end of upload
-                    for part in range(1, math.ceil(size / part_minsize) + 1):
-                        presigned_url_res = api_client.post(
-                            url=mpu_url,
-                            json={
-                                'datasetId': dataset_id,
-                                'version': version,
-                                'calls': [{
-                                    'method': 'uploadPart',
-                                    'params': {
-                                        'Key': key,
-                                        'UploadId': mpu_data['UploadId'],
-                                        'PartNumber': part
-                                    }
-                                }]
-                            }
-                        )
+    def _upload_failed(self, key, exception):
+        with self._upload_errors_lock:
+            self._upload_errors.append((key, exception))
 
-                        presigned_url = presigned_url_res.json()[0]['url']
-
-                        chunk = f.read(part_minsize)
-
-                        for attempt in range(0, 5):
-                            part_res = session.put(
-                                presigned_url,
-                                data=chunk,
-                                headers=headers,
-                                timeout=PUT_TIMEOUT)
-
-                            if part_res.status_code == 200:
-                                break
-
-                        if part_res.status_code != 200:
-                            # Why do we silence exceptions that get
-                            # explicitly raised? Mystery for the ages, but
-                            # there you have it I guess...
-                            print(f'\nUnable to complete upload of {path}')
-                            raise ApplicationError(
-                                f'Unable to complete upload of {path}')
-                        etag = part_res.headers['ETag'].replace('"', '')
-                        parts.append({'ETag': etag, 'PartNumber': part})
-                        # This is a pretty jank way to get about multipart
-                        # upload status updates, but we structure the Halo
-                        # spinner to report on the number of completed
-                        # tasks dispatched to the workers in the pool.
-                        # Since it's more of a PITA to properly distribute
-                        # this MPU among all workers than I really want to
-                        # deal with, that means we can't easily plug into
-                        # Halo for these updates. But we can print to
-                        # console! Which again, jank and noisy, but arguably
-                        # better than a task sitting forever, never either
-                        # completing or emitting an error message.
-                        print(
-                            f'\nUploaded {len(parts) * part_minsize / 10e5}MB '
-                            f'of {int(size / 10e5)}MB for '
-                            f'{path}'
-                        )
+    def _raise_upload_errors(self, max_reported_count=20, hint=''):
+        """Raise error listing files which were not uploaded by earlier requests
 
-                r = api_client.post(
-                    url=mpu_url,
-                    json={
-                        'datasetId': dataset_id,
-                        'version': version,
-                        'calls': [{
-                            'method': 'completeMultipartUpload',
-                            'params': {
-                                'Key': key,
-                                'UploadId': mpu_data['UploadId'],
-                                'MultipartUpload': {'Parts': parts}
-                            }
-                        }]
-                    }
-                )
+        :param str hint: appended to the message
+        """
+        with self._upload_errors_lock:
+            errors, self._upload_errors = self._upload_errors, []
 
-        except requests.exceptions.ConnectionError as e:
-            return self.report_connection_error(e)
-        except Exception as e:
-            return e
+        if not errors:
+            return
+
+        lines = ['{}: {}'.format(key, exception) for key, exception in errors[:max_reported_count]]
+        if len(errors) > max_reported_count:
+            lines.append('and {} more'.format(len(errors) - max_reported_count))
+
+        error_class = ApplicationError
+        if all(isinstance(exception, ChecksumMismatchError) for _, exception in errors):
+            error_class = ChecksumMismatchError
+        raise error_class('Failed to upload {} files:\n{}{}'.format(len(errors), '\n'.join(lines), hint))
+
+    def _file_uploaded(self, key, size, mtime, etag=None):
+        self.progress.file_done(key, size)
+
+        if self.journal:
+            self.journal.file_done(key, size, mtime)
+
+    def _get_api_client(self):
+        return http_client.API(
+            api_url=config.CONFIG_HOST,
+            api_key=self.api_key,
+            ps_client_name=CLI_PS_CLIENT_NAME
+        )
+
+    @staticmethod
+    def _get_pre_signed_urls_url(dataset_version_id):
+        dataset_id, _, version = dataset_version_id.partition(':')
+        return f'/datasets/{dataset_id}/versions/{version}/s3/preSignedUrls'
+
+    def _abort_upload(self, api_client, url, dataset_version_id, key, upload_id):
+        response = call_s3_method(api_client, url, dataset_version_id, 'abortMultipartUpload', {
+            'Key': key,
+            'UploadId': upload_id,
+        })
+        # an upload which does not exist anymore does not need to be aborted
+        if not response.ok and response.status_code != 404:
+            raise ApplicationError(f'Unable to abort upload of {key}')
+
+        if self.journal:
+            self.journal.upload_aborted(key)
+
+    def _abort_stale_uploads(self, dataset_version_id):
+        url = self._get_pre_signed_urls_url(dataset_version_id)
+        api_client = self._get_api_client()
+
+        for key, upload in list(self.journal.uploads.items()):
+            self._abort_upload(api_client, url, dataset_version_id, key, upload['upload_id'])
+            self.logger.log('Aborted upload of {}'.format(key))
+
+    def _abort_journaled_upload(self, dataset_version_id, key):
+        """Abort multipart upload of the file started by an earlier run which is not continued"""
+        started_upload = self.journal.get_upload(key) if self.journal else None
+        if started_upload:
+            self._abort_upload(self._get_api_client(), self._get_pre_signed_urls_url(dataset_version_id),
+                               dataset_version_id, key, started_upload['upload_id'])
+
+    def _abort_incomplete_uploads(self):
+        """Abort multipart uploads of this run which were not completed and can not be resumed
+
+        Parts of uploads which are neither completed nor aborted are kept and billed by the storage provider.
+        """
+        uploads, self._uploads = self._uploads, []
+        if self.journal:
+            return
+
+        for upload in uploads:
+            if upload.is_completed:
+                continue
+            try:
+                self._abort_upload(upload.api_client, upload.url, upload.dataset_version_id, upload.key,
+                                   upload.upload_id)
+            except Exception as e:
+                self.logger.warning('Unable to abort upload of {}: {}'.format(upload.key, e))
+
+    def _put_multipart(self, pool, path, content_type, dataset_version_id, key, mtime=None):
+        """Start or resume multipart upload and put its parts to the pool"""
+        size = os.path.getsize(path)
+        url = self._get_pre_signed_urls_url(dataset_version_id)
+        api_client = self._get_api_client()
+
+        started_upload = self.journal.get_upload(key) if self.journal else None
+        if started_upload and (started_upload['size'], started_upload['mtime']) != (size, mtime):
+            # the file was changed since the upload was started
+            self._abort_upload(api_client, url, dataset_version_id, key, started_upload['upload_id'])
+            started_upload = None
+
+        if started_upload:
+            upload_id = started_upload['upload_id']
+            part_size = started_upload['part_size']
+            parts = started_upload['parts']
+        else:
+            part_size = get_part_size(size, part_size=self.part_size, throughput=self.throughput.get())
+            parts = {}
+
+            response = call_s3_method(
+                api_client, url, dataset_version_id, 'createMultipartUpload', {'Key': key})
+            if not response.ok:
+                raise ApplicationError(f'Unable to start upload of {path}')
+            upload_id = response.json()[0]['url']['UploadId']
+
+            if self.journal:
+                self.journal.upload_started(key, upload_id, size, mtime, part_size)
+
+        # we use `ceil` to capture any remaining data less than
+        # part_size at the end of upload
+        part_count = math.ceil(size / part_size)
+
+        # parts uploaded before the upload was interrupted
+        done_size = sum(min(part_size, size - (part_number - 1) * part_size) for part_number in parts)
+        if done_size:
+            self.progress.update(key, done_size)
+
+        upload = MultipartUpload(api_client, url, dataset_version_id, key, upload_id, part_count, path=path,
+                                 size=size, mtime=mtime, parts=parts, journal=self.journal,
+                                 on_complete=self._file_uploaded)
+        self._uploads.append(upload)
+        if upload.is_uploaded:
+            upload.complete()
+            return upload
+
+        # part numbers count from one to match what AWS expects
+        part_numbers = [part_number for part_number in range(1, part_count + 1) if part_number not in parts]
+
+        # URLs of the next batch of parts are pre-signed while the workers
+        # upload parts of the current one
+        pre_signed_batches = prefetch(self._pre_sign_parts(dataset_version_id, key, upload_id, part_numbers,
+                                                           pool=pool))
+        for pre_signed_parts in pre_signed_batches:
+            if pool.has_exception():
+                # parts of a failed upload are not pre-signed anymore
+                pre_signed_batches.close()
+                break
+
+            for part_number, pre_signed_url in pre_signed_parts:
+                offset = (part_number - 1) * part_size
+                pool.put(self._put_part,
+                         upload,
+                         part_number,
+                         pre_signed_url,
+                         offset=offset,
+                         length=min(part_size, size - offset),
+                         content_type=content_type)
+
+        return upload
+
+    def _pre_sign_parts(self, dataset_version_id, key, upload_id, part_numbers, method='uploadPart',
+                        get_params=None, pool=None):
+        """
+        :param callable get_params: returns additional params of a part, called with part number
+        :param WorkerPool pool: pool of workers sending the parts, batches are not pre-signed
+            after one of its workers failed
+        """
+        for i in range(0, len(part_numbers), PART_PRE_SIGN_BATCH_SIZE):
+            if pool is not None and pool.has_exception():
+                return
+            batch_part_numbers = part_numbers[i:i + PART_PRE_SIGN_BATCH_SIZE]
+            calls = []
+            for part_number in batch_part_numbers:
+                params = dict(Key=key, UploadId=upload_id, PartNumber=part_number)
+                if get_params:
+                    params.update(get_params(part_number))
+                calls.append(dict(method=method, params=params))
+
+            pre_signeds = self.client.generate_pre_signed_s3_urls(dataset_version_id, calls=calls)
+            yield [(part_number, pre_signed.url) for part_number, pre_signed in zip(batch_part_numbers, pre_signeds)]
+
+    def _put_part(self, upload, part_number, url, offset, length, content_type):
+        headers = {'Content-Type': content_type}
+
+        def send():
+            started = time.monotonic()
+            md5 = hashlib.md5() if self.verify_checksums else None
+            # the part is streamed from its slice of the file instead of being kept in memory,
+            # every attempt reads the slice again from its first byte
+            with open(upload.path, 'rb') as f:
+                f.seek(offset)
+                response = self._put_body(url, f, length, upload.key, headers, checksum=md5)
+            if response.status_code != 200 and is_transient_s3_response(response):
+                raise TransientStorageError(f'Unable to complete upload of {upload.path}', response)
+            if response.status_code == 200:
+                self.throughput.add(length, time.monotonic() - started)
+                if md5 is not None:
+                    verify_checksum('part {} of {}'.format(part_number, upload.path), md5.hexdigest(),
+                                    get_response_etag(response))
+            return response
+
+        part_res = call_with_retries(send)
+        if part_res.status_code != 200:
+            raise ApplicationError(
+                f'Unable to complete upload of {upload.path}')
+
+        etag = part_res.headers['ETag'].replace('"', '')
+        upload.add_part(part_number, etag)
 
     @staticmethod
     def _list_files(source_path):
@@ -713,25 +2007,83 @@ class PutDatasetFilesCommand(BaseDatasetFilesCommand):
         raise ApplicationError('Invalid source path: ' + source_path)
 
     def _sign_and_put(self, dataset_version_id, pool, results, update_status):
-        pre_signeds = self.client.generate_pre_signed_s3_urls(
-            dataset_version_id,
-            calls=[dict(method='putObject', params=dict(
-                Key=r['key'], ContentType=r['mimetype'])) for r in results],
-        )
+        small_results = []
+        large_results = []
+        for result in results:
+            self.progress.add(result['key'], result['size'])
+            if result['size'] > (self.part_size or MULTIPART_CHUNK_SIZE):
+                large_results.append(result)
+            else:
+                small_results.append(result)
 
-        with requests.Session() as session:
-            for pre_signed, result in zip(pre_signeds, results):
-                update_status()
-                pool.put(self._put,
-                         session,
-                         result['path'],
-                         pre_signed.url,
-                         content_type=result['mimetype'],
-                         dataset_version_id=dataset_version_id,
-                         key=result['key'])
-
-    def execute(self, dataset_version_id, source_paths, target_path):
+        pre_signeds = []
+        if small_results:
+            pre_signeds = self.client.generate_pre_signed_s3_urls(
+                dataset_version_id,
+                calls=[dict(method='putObject', params=dict(
+                    Key=r['key'], ContentType=r['mimetype'])) for r in small_results],
+            )
+
+        for pre_signed, result in zip(pre_signeds, small_results):
+            update_status()
+            # the file was uploaded in parts before its size or the part size changed
+            self._abort_journaled_upload(dataset_version_id, result['key'])
+            pool.put(self._put,
+                     result['path'],
+                     pre_signed.url,
+                     content_type=result['mimetype'],
+                     key=result['key'],
+                     mtime=result['mtime'])
+
+        # for files over the part size parts are distributed
+        # among all workers of the pool
+        for result in large_results:
+            update_status()
+            self._put_multipart(pool,
+                                result['path'],
+                                content_type=result['mimetype'],
+                                dataset_version_id=dataset_version_id,
+                                key=result['key'],
+                                mtime=result['mtime'])
+
+    def _put_results(self, dataset_version_id, pool, results, update_status):
+        batch = []
+        for result in results:
+            batch.append(result)
+            if len(batch) == pool.worker_count:
+                self._sign_and_put(
+                    dataset_version_id, pool, batch, update_status)
+                batch = []
+
+        if batch:
+            self._sign_and_put(
+                dataset_version_id, pool, batch, update_status)
+
+    def execute(self, dataset_version_id, source_paths, target_path, part_size=None, resume=True,
+                abort_stale_uploads=False, progress_callback=None, json_progress=False, max_bandwidth=None,
+                verify_checksums=True):
+        """
+        :param str dataset_version_id:
+        :param list[str] source_paths:
+        :param str target_path:
+        :param int part_size: size of parts of multipart uploads in bytes.
+            Computed from file size and measured throughput by default
+        :param bool resume: keep a journal of the upload in CONFIG_DIR_PATH, so running
+            the same upload again skips uploaded files and continues multipart uploads
+        :param bool abort_stale_uploads: abort multipart uploads left by an interrupted
+            run and upload the files again instead of continuing them
+        :param callable progress_callback: called with progress events, see TransferProgress
+        :param bool json_progress: log progress events as JSON lines instead of showing a status line
+        :param int|BandwidthLimiter max_bandwidth: max bytes per second uploaded by all workers.
+            The same limiter can be passed to several commands to limit them together
+        :param bool verify_checksums: compare MD5 of uploaded files and parts with their ETags
+        """
         self.assert_supported(dataset_version_id)
+        self.part_size = part_size
+        self.progress_callback = progress_callback
+        self.json_progress = json_progress
+        self.upload_limiter = get_bandwidth_limiter(max_bandwidth)
+        self.verify_checksums = verify_checksums
 
         if not target_path:
             target_path = '/'
@@ -740,19 +2092,45 @@ class PutDatasetFilesCommand(BaseDatasetFilesCommand):
             if not target_path.endswith('/'):
                 target_path += '/'
 
+        self.journal = None
+        if resume:
+            self.journal = UploadJournal.open(dataset_version_id, source_paths, target_path)
+            if abort_stale_uploads:
+                self._abort_stale_uploads(dataset_version_id)
+
+        try:
+            pending_keys = self._put_files(dataset_version_id, source_paths, target_path)
+        finally:
+            self._abort_incomplete_uploads()
+            if self.journal:
+                self.journal.close()
+
+        if self.journal and not pending_keys:
+            self.journal.remove()
+
+        hint = '\n' + self.resume_hint if pending_keys else ''
+        self._raise_upload_errors(hint=hint)
+        if pending_keys:
+            raise ApplicationError('{} files were not uploaded.{}'.format(len(pending_keys), hint))
+
+    def _put_files(self, dataset_version_id, source_paths, target_path):
+        """
+        :return: keys of files not recorded in journal as uploaded
+        :rtype: list[str]
+        """
+        keys = []
         status_text = 'Uploading files'
 
-        with halo.Halo(text=status_text, spinner='dots') as status:
-            with WorkerPool() as pool:
+        with self._show_progress(status_text) as status:
+            with self.sessions, WorkerPool() as pool:
+                def update_status():
+                    status.text = '{}: {}'.format(status_text, self.progress.format())
+
                 for source_path in source_paths:
                     has_trailing_slash = source_path.endswith(os.path.sep)
                     source_path = os.path.abspath(source_path)
                     source_name = os.path.basename(source_path)
 
-                    def update_status():
-                        status.text = '{}: {} ({})'.format(
-                            status_text, source_path, pool.completed_count())
-
                     results = []
 
                     for source_path_is_file, path in self._list_files(source_path):
@@ -766,40 +2144,32 @@ class PutDatasetFilesCommand(BaseDatasetFilesCommand):
                                 key += source_name + '/'
                             key += path[len(source_path)+1:]
 
+                        stat = os.stat(path)
+                        keys.append((key, stat.st_size, stat.st_mtime_ns))
+                        if self.journal and self.journal.is_file_done(key, stat.st_size, stat.st_mtime_ns):
+                            continue
+
                         mimetype = mimetypes.guess_type(
                             key)[0] or 'application/octet-stream'
 
-                        results.append(
-                            dict(key=key, path=path, mimetype=mimetype))
+                        results.append(dict(key=key, path=path, mimetype=mimetype,
+                                            size=stat.st_size, mtime=stat.st_mtime_ns))
 
-                        if len(results) == pool.worker_count:
-                            self._sign_and_put(
-                                dataset_version_id, pool, results, update_status)
-                            results = []
+                    self._put_results(dataset_version_id, pool, results, update_status)
 
-                    if results:
-                        self._sign_and_put(
-                            dataset_version_id, pool, results, update_status)
+        if not self.journal:
+            return []
+        return [key for key, size, mtime in keys if not self.journal.is_file_done(key, size, mtime)]
 
 
 class DeleteDatasetFilesCommand(BaseDatasetFilesCommand):
-
-    @classmethod
-    def _delete(cls, url):
-        with requests.Session() as session:
-            try:
-                r = session.delete(url)
-                cls.validate_s3_response(r)
-            except requests.exceptions.ConnectionError as e:
-                return cls.report_connection_error(e)
-
     def execute(self, dataset_version_id, paths):
         self.assert_supported(dataset_version_id)
 
         status_text = 'Deleting files'
 
         with halo.Halo(text=status_text, spinner='dots') as status:
-            with WorkerPool() as pool:
+            with self.sessions, WorkerPool() as pool:
                 for path in paths:
                     path = self.normalize_path(path)
 
@@ -821,18 +2191,495 @@ class DeleteDatasetFilesCommand(BaseDatasetFilesCommand):
                             path=path,
                             recursive=True,
                             absolute=True,
+                            max_keys=DELETE_OBJECTS_BATCH_SIZE,
                         )
 
                     for results, _ in list_objects:
                         if not results:
                             break
 
-                        pre_signeds = self.client.generate_pre_signed_s3_urls(
-                            dataset_version_id,
-                            calls=[dict(method='deleteObject', params=dict(
-                                Key=r['key'])) for r in results],
-                        )
+                        self._sign_and_delete(
+                            dataset_version_id, pool, results, update_status)
+
+        self._raise_delete_errors()
+
+
+def file_md5(path, chunk_size=8 * 1024 ** 2, as_hex=True):
+    """
+    :param bool as_hex: return hex digest instead of hashlib object which can be updated with more data
+    """
+    md5 = hashlib.md5()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            md5.update(chunk)
+    return md5.hexdigest() if as_hex else md5
+
+
+def is_md5_etag(etag):
+    """ETags of objects not uploaded with multipart uploads are MD5 of their content"""
+    return bool(etag) and re.match(r'^[0-9a-f]{32}$', etag) is not None
+
+
+def get_response_etag(response):
+    """Get ETag of response to compare with MD5 of the object or part sent or received
+
+    ETags of objects encrypted with SSE-KMS or SSE-C keys are not MD5 of their content.
+
+    :param requests.Response response:
+    :return: MD5 ETag or None
+    :rtype: str|None
+    """
+    headers = response.headers or {}
+    if headers.get('x-amz-server-side-encryption', '').startswith('aws:kms') or \
+            headers.get('x-amz-server-side-encryption-customer-algorithm'):
+        return None
+
+    etag = (headers.get('ETag') or '').strip('"')
+    return etag if is_md5_etag(etag) else None
+
+
+def get_signed_copy_source(url):
+    """Get copy source signed in pre-signed URL of copyObject or uploadPartCopy
+
+    The copy source has to be sent in x-amz-copy-source header exactly as it was signed.
+
+    :param str url:
+    :return: bucket and key of copied object or None if the URL does not sign it
+    :rtype: str|None
+    """
+    for name, value in parse_qsl(urlparse(url).query):
+        if name.lower() == 'x-amz-copy-source':
+            return value
+    return None
+
+
+def get_multipart_etag(part_etags):
+    """Get ETag S3 gives to object of multipart upload, MD5 of MD5s of its parts and number of parts
+
+    :param list[str] part_etags: ETags of parts ordered by part number
+    :return: ETag or None if ETags of parts are not MD5
+    :rtype: str|None
+    """
+    part_etags = [etag.strip('"') for etag in part_etags]
+    if not part_etags or not all(is_md5_etag(etag) for etag in part_etags):
+        return None
+
+    md5 = hashlib.md5(b''.join(bytes.fromhex(etag) for etag in part_etags))
+    return '{}-{}'.format(md5.hexdigest(), len(part_etags))
+
+
+def verify_checksum(name, checksum, etag):
+    """
+    :param str name: transferred file or part
+    :param str checksum: checksum of transferred bytes
+    :param str etag: ETag returned by storage provider, not verified if None
+    """
+    if etag and checksum != etag:
+        raise ChecksumMismatchError(
+            'Checksum of {} does not match its ETag: {} != {}. The data was corrupted during transfer'.format(
+                name, checksum, etag))
+
+
+class SyncState(object):
+
+    def __init__(self, path):
+        """Sizes, modification times and checksums of local files seen by earlier syncs
+
+        A file with the same size and modification time as recorded does not have to be
+        hashed again, and one recorded as synced with a remote object whose ETag did
+        not change since does not have to be compared at all. Used for uploads as well
+        as downloads.
+
+        :param str path: state file path
+        """
+        self.path = path
+        self.files = {}
+        self._lock = threading.Lock()
+
+        try:
+            with open(path) as f:
+                self.files = json.load(f)
+        except (IOError, ValueError):
+            pass
+
+    @classmethod
+    def open(cls, local_path, dataset_version_id, remote_path, directory=None):
+        """Open state of sync between local directory and path in dataset
+
+        :param str local_path:
+        :param str dataset_version_id:
+        :param str remote_path:
+        :param str directory: state directory, CONFIG_DIR_PATH/sync by default
+        :rtype: SyncState
+        """
+        if directory is None:
+            directory = os.path.join(config.CONFIG_DIR_PATH, 'sync')
+
+        # versions of a dataset share state, so syncing to a new version
+        # does not need to hash all files again
+        dataset_id, _, _ = dataset_version_id.partition(':')
+        name_data = json.dumps([os.path.abspath(local_path), dataset_id, remote_path])
+        name = hashlib.sha1(name_data.encode('utf-8')).hexdigest()
+        return cls(os.path.join(directory, '{}.json'.format(name)))
+
+    def get(self, name, size, mtime):
+        """Get state of the file if it was not changed since it was recorded
+
+        :param str name: file path relative to the synced directory
+        :param int size:
+        :param int mtime: modification time in nanoseconds
+        :rtype: dict
+        """
+        with self._lock:
+            state = self.files.get(name)
+        if state and (state['size'], state['mtime']) == (size, mtime):
+            return state
+        return {}
+
+    def update(self, name, size, mtime, **values):
+        with self._lock:
+            state = self.files.get(name)
+            if not state or (state['size'], state['mtime']) != (size, mtime):
+                state = self.files[name] = {'size': size, 'mtime': mtime}
+            state.update(values)
+
+    def matches(self, name, path, size, mtime, etag, trust_synced=False):
+        """Check if local file has the content of remote object with the ETag
+
+        Files are hashed only if their MD5 is not recorded and the ETag is a MD5 checksum.
+
+        :param str name: file path relative to the synced directory
+        :param str path: file path
+        :param int size:
+        :param int mtime: modification time in nanoseconds
+        :param str etag: ETag of remote object of the same size
+        :param bool trust_synced: consider file synced before unchanged regardless of the ETag
+        :rtype: bool
+        """
+        state = self.get(name, size, mtime)
+        if etag and state.get('etag') == etag:
+            return True
+        if trust_synced and state.get('synced'):
+            return True
+
+        if not is_md5_etag(etag):
+            # ETags of multipart uploads can not be compared with a checksum of the file
+            return False
+
+        md5 = state.get('md5') or file_md5(path)
+        matches = md5 == etag
+        self.update(name, size, mtime, md5=md5, **(dict(etag=etag, synced=True) if matches else {}))
+        return matches
+
+    def save(self):
+        with self._lock:
+            data = json.dumps(self.files)
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + '.tmp-%s' % uuid.uuid4()
+        with open(tmp_path, 'w') as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+
+
+class SyncPlan(object):
+
+    def __init__(self):
+        """Files to upload, copy from a base version and delete to sync a directory to a dataset version"""
+        self.uploads = []
+        self.copies = []
+        self.deletes = []
+        self.unchanged_count = 0
+
+    @property
+    def upload_size(self):
+        return sum(result['size'] for result in self.uploads)
+
+    def __repr__(self):
+        return 'SyncPlan(uploads={}, copies={}, deletes={}, unchanged_count={})'.format(
+            len(self.uploads), len(self.copies), len(self.deletes), self.unchanged_count)
+
+
+class SyncDatasetFilesCommand(PutDatasetFilesCommand):
+    COMPARE_ETAG = 'etag'
+    COMPARE_MTIME = 'mtime'
+
+    def __init__(self, *args, **kwargs):
+        super(SyncDatasetFilesCommand, self).__init__(*args, **kwargs)
+        self.state = None
+        self.target_path = None
+        self.compare = self.COMPARE_ETAG
+
+    def _file_uploaded(self, key, size, mtime, etag=None):
+        super(SyncDatasetFilesCommand, self)._file_uploaded(key, size, mtime, etag=etag)
+        self.state.update(key[len(self.target_path):], size, mtime, etag=etag, synced=True)
+
+    def _list_local_files(self, source_path):
+        files = {}
+        for dir_path, _, names in os.walk(source_path):
+            for name in names:
+                path = os.path.join(dir_path, name)
+                rel_path = os.path.relpath(path, source_path).replace(os.path.sep, '/')
+                stat = os.stat(path)
+
+                key = self.target_path + rel_path
+                files[key] = dict(
+                    key=key,
+                    name=rel_path,
+                    path=path,
+                    mimetype=mimetypes.guess_type(key)[0] or 'application/octet-stream',
+                    size=stat.st_size,
+                    mtime=stat.st_mtime_ns,
+                )
+        return files
+
+    def _is_unchanged(self, local, remote):
+        if local['size'] != int(remote.get('size', -1)):
+            return False
+
+        return self.state.matches(local['name'], local['path'], local['size'], local['mtime'], remote.get('etag'),
+                                  trust_synced=self.compare == self.COMPARE_MTIME)
+
+    def _get_plan(self, dataset_version_id, source_path, delete, base_dataset_version_id=None):
+        local_files = self._list_local_files(source_path)
+        plan = SyncPlan()
+
+        # remote listing is streamed, only local files are kept in memory
+        list_objects = self.list_objects(
+            dataset_version_id=base_dataset_version_id or dataset_version_id,
+            path=self.target_path,
+            recursive=True,
+            absolute=True,
+            max_keys=1000,
+        )
+        for results, _ in list_objects:
+            for remote in results:
+                local = local_files.pop('/' + remote['key'], None)
+                if local is None:
+                    # files of the base version are not in the target version
+                    if delete and not base_dataset_version_id:
+                        plan.deletes.append(remote)
+                elif self._is_unchanged(local, remote):
+                    if base_dataset_version_id:
+                        plan.copies.append(dict(local, change='=', etag=remote.get('etag')))
+                    else:
+                        plan.unchanged_count += 1
+                else:
+                    plan.uploads.append(dict(local, change='~'))
+
+        plan.uploads.extend(dict(local, change='+') for local in local_files.values())
+        plan.uploads.sort(key=lambda result: result['key'])
+        return plan
+
+    def _log_plan(self, plan):
+        for result in plan.uploads:
+            self.logger.log('{} {}'.format(result['change'], result['key']))
+        for result in plan.copies:
+            self.logger.log('{} {}'.format(result['change'], result['key']))
+        for result in plan.deletes:
+            self.logger.log('- /{}'.format(result['key']))
+
+        self.logger.log(
+            '{} files to upload ({} bytes), {} files to copy, {} files to delete, {} files unchanged'.format(
+                len(plan.uploads), plan.upload_size, len(plan.copies), len(plan.deletes), plan.unchanged_count))
+
+    @staticmethod
+    def get_copy_source(dataset_version_id, key):
+        """Get CopySource param of pre-sign calls referring to an object of a dataset version
+
+        The pre-signed URLs endpoint resolves it to the bucket and key of the object. The storage
+        provider gets the resolved copy source signed by the endpoint, see get_signed_copy_source.
+
+        :param str dataset_version_id:
+        :param str key:
+        :rtype: str
+        """
+        return '{}/{}'.format(dataset_version_id, key.lstrip('/'))
+
+    def _send_copy(self, url, headers):
+        response = self.sessions.get_session().put(url, headers=headers, timeout=PUT_TIMEOUT)
+        self.validate_s3_response(response)
+        return response
+
+    def _copy(self, url, copy_source, result):
+        call_with_retries(self._send_copy, url, {'x-amz-copy-source': copy_source})
+
+        self._file_uploaded(result['key'], result['size'], result['mtime'], etag=result.get('etag'))
+
+    def _copy_part(self, upload, part_number, url, copy_source, copy_source_range):
+        headers = {'x-amz-copy-source': copy_source, 'x-amz-copy-source-range': copy_source_range}
+        response = call_with_retries(self._send_copy, url, headers)
+
+        etag = ElementTree.fromstring(response.content).find('{' + S3_XMLNS + '}ETag').text
+        upload.add_part(part_number, etag.strip('"'))
+
+    def _copy_multipart(self, pool, dataset_version_id, copy_source, result):
+        """Copy object in parts, objects over MAX_COPY_OBJECT_SIZE can not be copied at once
+
+        :return: False if the copy source was not signed and the file has to be uploaded instead
+        :rtype: bool
+        """
+        size = result['size']
+        part_size = get_part_size(size, part_size=COPY_PART_SIZE)
+        part_count = math.ceil(size / part_size)
+        url = self._get_pre_signed_urls_url(dataset_version_id)
+        api_client = self._get_api_client()
+
+        response = call_s3_method(
+            api_client, url, dataset_version_id, 'createMultipartUpload', {'Key': result['key']})
+        if not response.ok:
+            raise ApplicationError('Unable to start copy of {}'.format(result['key']))
+        upload_id = response.json()[0]['url']['UploadId']
+
+        upload = MultipartUpload(api_client, url, dataset_version_id, result['key'], upload_id, part_count,
+                                 path=result['path'], size=size, mtime=result['mtime'],
+                                 on_complete=self._file_uploaded)
+        self._uploads.append(upload)
+
+        def get_copy_source_range(part_number):
+            first_byte = (part_number - 1) * part_size
+            return 'bytes={}-{}'.format(first_byte, min(first_byte + part_size, size) - 1)
+
+        pre_signed_batches = prefetch(self._pre_sign_parts(
+            dataset_version_id, result['key'], upload_id, list(range(1, part_count + 1)),
+            method='uploadPartCopy',
+            get_params=lambda part_number: dict(
+                CopySource=copy_source, CopySourceRange=get_copy_source_range(part_number)),
+            pool=pool,
+        ))
+        for pre_signed_parts in pre_signed_batches:
+            if pool.has_exception():
+                pre_signed_batches.close()
+                break
+
+            for part_number, pre_signed_url in pre_signed_parts:
+                signed_copy_source = get_signed_copy_source(pre_signed_url)
+                if signed_copy_source is None:
+                    pre_signed_batches.close()
+                    self._uploads.remove(upload)
+                    self._abort_upload(api_client, url, dataset_version_id, result['key'], upload_id)
+                    return False
+
+                if part_number == 1:
+                    self.progress.add(result['key'], size)
+                pool.put(self._copy_part,
+                         upload,
+                         part_number,
+                         pre_signed_url,
+                         copy_source=signed_copy_source,
+                         copy_source_range=get_copy_source_range(part_number))
+
+        return True
+
+    def _sign_and_copy(self, dataset_version_id, base_dataset_version_id, pool, results, update_status):
+        copy_sources = [self.get_copy_source(base_dataset_version_id, r['key']) for r in results]
+        small_results = [(r, c) for r, c in zip(results, copy_sources) if r['size'] <= MAX_COPY_OBJECT_SIZE]
+        large_results = [(r, c) for r, c in zip(results, copy_sources) if r['size'] > MAX_COPY_OBJECT_SIZE]
+
+        pre_signeds = []
+        if small_results:
+            pre_signeds = self.client.generate_pre_signed_s3_urls(
+                dataset_version_id,
+                calls=[dict(method='copyObject', params=dict(
+                    Key=r['key'], CopySource=c)) for r, c in small_results],
+            )
+
+        # files are uploaded when the endpoint did not sign their copy source
+        uploads = []
+        for pre_signed, (result, _) in zip(pre_signeds, small_results):
+            update_status()
+            signed_copy_source = get_signed_copy_source(pre_signed.url)
+            if signed_copy_source is None:
+                uploads.append(result)
+                continue
+
+            self.progress.add(result['key'], result['size'])
+            pool.put(self._copy, pre_signed.url, signed_copy_source, result)
+
+        for result, copy_source in large_results:
+            update_status()
+            if not self._copy_multipart(pool, dataset_version_id, copy_source, result):
+                uploads.append(result)
+
+        if uploads:
+            self.logger.debug('Copy source of {} files was not signed, uploading them'.format(len(uploads)))
+            self._sign_and_put(dataset_version_id, pool, uploads, update_status)
+
+    def execute(self, source_path, dataset_version_id, target_path='/', delete=False, dry_run=False,
+                compare=COMPARE_ETAG, part_size=None, base_dataset_version_id=None, progress_callback=None,
+                json_progress=False, max_bandwidth=None, verify_checksums=True):
+        """Upload new and changed files of a local directory and optionally delete remote files missing locally
+
+        With a base version, files are compared with files of the base version instead, and
+        unchanged ones are copied from it on the storage provider side instead of being uploaded.
+
+        :param str source_path: local directory
+        :param str dataset_version_id:
+        :param str target_path: dataset path to sync the directory to
+        :param bool delete: delete files of the dataset path which do not exist locally
+        :param bool dry_run: only print the plan
+        :param str compare: "etag" to compare files of the same size by ETag/MD5, "mtime" to also
+            consider unchanged files with the size and modification time they were synced with before
+        :param int part_size: size of parts of multipart uploads in bytes
+        :param str base_dataset_version_id: dataset version to copy unchanged files from
+        :param callable progress_callback: called with progress events, see TransferProgress
+        :param bool json_progress: log progress events as JSON lines instead of showing a status line
+        :param int|BandwidthLimiter max_bandwidth: max bytes per second uploaded by all workers
+        :param bool verify_checksums: compare MD5 of uploaded files and parts with their ETags
+        :returns: plan of the sync
+        :rtype: SyncPlan
+        """
+        if not os.path.isdir(source_path):
+            raise ApplicationError('Invalid source path: ' + source_path)
+
+        self.assert_supported(dataset_version_id)
+        dataset_version_id = self.resolve_dataset_version_id(dataset_version_id)
+        if base_dataset_version_id:
+            base_dataset_version_id = self.resolve_dataset_version_id(base_dataset_version_id)
+
+        self.part_size = part_size
+        self.compare = compare
+        self.progress_callback = progress_callback
+        self.json_progress = json_progress
+        self.upload_limiter = get_bandwidth_limiter(max_bandwidth)
+        self.verify_checksums = verify_checksums
+        self.target_path = self.normalize_path(target_path)
+        if not self.target_path.endswith('/'):
+            self.target_path += '/'
+        self.state = SyncState.open(source_path, dataset_version_id, self.target_path)
+
+        with halo.Halo(text='Comparing files', spinner='dots'):
+            plan = self._get_plan(dataset_version_id, os.path.abspath(source_path), delete,
+                                  base_dataset_version_id=base_dataset_version_id)
+        self.state.save()
+
+        self._log_plan(plan)
+        if dry_run or not (plan.uploads or plan.copies or plan.deletes):
+            return plan
+
+        status_text = 'Syncing files'
+        try:
+            with self._show_progress(status_text) as status:
+                with self.sessions, WorkerPool() as pool:
+                    def update_status():
+                        status.text = '{}: {}'.format(status_text, self.progress.format())
+
+                    self._put_results(dataset_version_id, pool, plan.uploads, update_status)
+
+                    for i in range(0, len(plan.copies), pool.worker_count):
+                        self._sign_and_copy(dataset_version_id, base_dataset_version_id, pool,
+                                            plan.copies[i:i + pool.worker_count], update_status)
+
+                    # every pre-sign request covers a single DeleteObjects batch
+                    for i in range(0, len(plan.deletes), DELETE_OBJECTS_BATCH_SIZE):
+                        self._sign_and_delete(dataset_version_id, pool, plan.deletes[i:i + DELETE_OBJECTS_BATCH_SIZE],
+                                              update_status)
+        finally:
+            self._abort_incomplete_uploads()
+            self.state.save()
+
+        self._raise_upload_errors()
+        self._raise_delete_errors()
 
-                        for pre_signed in pre_signeds:
-                            update_status()
-                            pool.put(self._delete, url=pre_signed.url)
+        self.logger.log('Synced {} to dataset version: {}'.format(source_path, dataset_version_id))
+        return plan
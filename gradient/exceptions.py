@@ -42,5 +42,9 @@ class WrongPathError(ApplicationError):
     pass
 
 
+class ChecksumMismatchError(ApplicationError):
+    pass
+
+
 class MutuallyExclusiveParametersUsedError(Exception):
     pass
@@ -88,6 +88,9 @@ setup(
             'sphinx-click',
             'recommonmark'
         ],
+        "async": [
+            'aiohttp',
+        ],
     },
     cmdclass={
         'verify': VerifyVersionCommand,
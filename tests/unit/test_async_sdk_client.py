@@ -0,0 +1,79 @@
+import asyncio
+import copy
+import time
+
+import mock
+import pytest
+
+from gradient.api_sdk import AsyncSdkClient, ResourceFetchingError
+from gradient.api_sdk.clients import async_http_client
+from tests import example_responses
+
+web = pytest.importorskip("aiohttp.web")
+
+
+async def _start_server(handler):
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, "http://127.0.0.1:{}".format(port)
+
+
+class TestAsyncSdkClient(object):
+    def test_should_get_notebooks_concurrently_over_one_pool(self):
+        requests_received = []
+
+        async def handler(request):
+            requests_received.append(await request.json())
+            await asyncio.sleep(0.2)
+            return web.json_response(copy.deepcopy(example_responses.NOTEBOOK_GET_RESPONSE))
+
+        async def run():
+            runner, url = await _start_server(handler)
+            try:
+                with mock.patch("gradient.api_sdk.config.config.CONFIG_HOST", url):
+                    async with AsyncSdkClient(api_key="some_key") as client:
+                        start = time.time()
+                        notebooks = await asyncio.gather(*[client.notebooks.get(id="n{}".format(i))
+                                                           for i in range(50)])
+                        return notebooks, time.time() - start
+            finally:
+                await runner.cleanup()
+
+        notebooks, elapsed = asyncio.run(run())
+
+        assert len(notebooks) == 50
+        assert notebooks[0].name == example_responses.NOTEBOOK_GET_RESPONSE["name"]
+        assert sorted(r["notebookId"] for r in requests_received) == sorted("n{}".format(i) for i in range(50))
+        assert elapsed < 2
+
+    def test_should_raise_sdk_error_on_failed_response(self):
+        async def handler(request):
+            return web.json_response({"error": {"message": "Not found"}}, status=404)
+
+        async def run():
+            runner, url = await _start_server(handler)
+            try:
+                with mock.patch("gradient.api_sdk.config.config.CONFIG_HOST", url):
+                    async with AsyncSdkClient(api_key="some_key") as client:
+                        await client.projects.delete("prq70zy79")
+            finally:
+                await runner.cleanup()
+
+        with pytest.raises(ResourceFetchingError) as e:
+            asyncio.run(run())
+
+        assert "Not found" in str(e.value)
+
+
+class TestAsyncApi(object):
+    def test_should_encode_params_like_requests(self):
+        params = {"limit": 20, "skip": None, "tagFilter": ["a", "b"], "flag": True}
+
+        prepared = async_http_client.AsyncAPI._prepare_params(params)
+
+        assert prepared == [("limit", "20"), ("tagFilter", "a"), ("tagFilter", "b"), ("flag", "True")]
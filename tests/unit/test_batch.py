@@ -0,0 +1,40 @@
+import mock
+
+from gradient.api_sdk import DatasetsClient, sdk_exceptions
+from gradient.api_sdk.batch import run_many
+from tests import MockResponse
+
+
+class TestRunMany(object):
+    def test_should_keep_order_of_items_and_return_errors(self):
+        def fn(item):
+            if item == 3:
+                raise ValueError("wrong item")
+            return item * 2
+
+        results = run_many(fn, range(6), max_workers=3)
+
+        assert [result.item for result in results] == list(range(6))
+        assert [result.result for result in results if result.ok] == [0, 2, 4, 8, 10]
+        assert isinstance(results[3].error, ValueError)
+        assert run_many(fn, [], max_workers=3) == []
+
+
+class TestGetMany(object):
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    def test_should_get_every_dataset(self, get_patched):
+        def get(url, **kwargs):
+            dataset_id = url.rsplit("/", 1)[-1]
+            if dataset_id == "missing":
+                return MockResponse({"error": {"message": "Not found"}}, status_code=404)
+            return MockResponse({"id": dataset_id, "name": "name " + dataset_id})
+
+        get_patched.side_effect = get
+        client = DatasetsClient("some_key")
+
+        results = client.get_many(["ds1", "missing", "ds3"], max_workers=2)
+
+        assert [result.item for result in results] == ["ds1", "missing", "ds3"]
+        assert results[0].result.name == "name ds1"
+        assert results[2].result.name == "name ds3"
+        assert isinstance(results[1].error, sdk_exceptions.ResourceFetchingError)
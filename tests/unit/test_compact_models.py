@@ -0,0 +1,43 @@
+import copy
+import pickle
+
+from gradient.api_sdk import serializers
+from gradient.api_sdk.models import LogRow, LogRows, get_slotted_class
+from gradient.api_sdk.models.machine import Machine
+from tests import example_responses
+
+
+class TestSlottedModels(object):
+    def test_slotted_instances_should_behave_like_model_instances(self):
+        machine_dict = example_responses.LIST_MACHINES_RESPONSE[0]
+        schema = serializers.MachineSchema()
+
+        machine = schema.get_instance(copy.deepcopy(machine_dict))
+        slotted_machine = schema.get_instance(copy.deepcopy(machine_dict), slotted=True)
+
+        assert type(slotted_machine) is get_slotted_class(Machine)
+        assert isinstance(slotted_machine, Machine)
+        assert not hasattr(slotted_machine, "__dict__") or not slotted_machine.__dict__
+        assert slotted_machine == machine and machine == slotted_machine
+        assert repr(slotted_machine) == repr(machine)
+        assert pickle.loads(pickle.dumps(slotted_machine)) == machine
+
+        slotted_machine.name = "other name"
+        assert slotted_machine != machine
+
+    def test_should_return_not_attrs_classes_unchanged(self):
+        assert get_slotted_class(LogRow) is LogRow
+
+
+class TestLogRows(object):
+    def test_should_work_like_list_of_log_rows(self):
+        rows = [LogRow(1, "first", "2020-05-11T11:27:56.552Z"), LogRow(2, "second", "2020-05-11T11:27:57.552Z")]
+
+        log_rows = LogRows(rows)
+
+        assert len(log_rows) == 2
+        assert log_rows[1] == rows[1]
+        assert log_rows[-1].message == "second"
+        assert list(log_rows) == rows
+        assert log_rows[:1] == rows[:1]
+        assert log_rows == rows
@@ -0,0 +1,55 @@
+import copy
+
+import marshmallow
+import pytest
+
+from gradient.api_sdk import serializers
+from gradient.api_sdk.serializers.base import BaseSchema
+from gradient.api_sdk.serializers.compiled_loader import FALLBACK, compile_loader
+from tests import example_responses
+
+CASES = [
+    (serializers.NotebookSchema, example_responses.NOTEBOOKS_LIST_RESPONSE_JSON["notebookList"]),
+    (serializers.MachineSchema, example_responses.LIST_MACHINES_RESPONSE),
+    (serializers.Model, example_responses.LIST_MODELS_RESPONSE_JSON["modelList"]),
+    (serializers.DatasetVersionSchema, example_responses.LIST_DATASET_VERSIONS_RESPONSE),
+    (serializers.LogRowSchema, example_responses.DEPLOYMENTS_LOGS_RESPONSE),
+    (serializers.Project, example_responses.LIST_PROJECTS_RESPONSE["data"]),
+]
+
+
+class SomeSchema(BaseSchema):
+    MODEL = dict
+
+    name = marshmallow.fields.Str(required=True)
+    count = marshmallow.fields.Int(load_from="itemCount")
+    enabled = marshmallow.fields.Bool(missing=False)
+    nullable = marshmallow.fields.Str(allow_none=True)
+
+
+class TestCompiledLoader(object):
+    @pytest.mark.parametrize("schema_cls,items", CASES)
+    def test_should_load_the_same_data_as_marshmallow(self, schema_cls, items):
+        loader = compile_loader(schema_cls())
+        assert loader is not None
+
+        for item in items:
+            assert loader(copy.deepcopy(item)) == schema_cls().load(copy.deepcopy(item)).data
+
+    @pytest.mark.parametrize("item", [
+        {"name": "some_name", "itemCount": 3, "nullable": None},
+        {"name": "some_name", "count": "3", "enabled": "true"},
+        {"name": 12, "itemCount": "not a number", "enabled": None, "nullable": "value"},
+        {"itemCount": 3},
+    ])
+    def test_should_handle_conversions_defaults_and_invalid_values_like_marshmallow(self, item):
+        loader = compile_loader(SomeSchema())
+
+        assert loader(dict(item)) == SomeSchema().load(dict(item)).data
+
+    def test_should_fall_back_to_marshmallow(self):
+        loader = compile_loader(SomeSchema())
+
+        assert loader(None) is FALLBACK
+        assert compile_loader(SomeSchema(strict=True)) is None
+        assert SomeSchema(only=("name",)).get_instance({"name": "some_name", "itemCount": 3}) == {"name": "some_name"}
@@ -0,0 +1,838 @@
+import hashlib
+import os
+import threading
+from urllib.parse import parse_qsl, quote
+from xml.etree import ElementTree
+
+import mock
+import pytest
+import requests
+
+from gradient.commands import datasets as commands
+from gradient.exceptions import ApplicationError, ChecksumMismatchError
+from tests import MockResponse
+
+DATASET_VERSION_ID = "dsttn2y7j1ux882:mbpg8hp"
+BASE_DATASET_VERSION_ID = "dsttn2y7j1ux882:base"
+
+
+class FakeDownloadResponse(MockResponse):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    @property
+    def text(self):
+        return self.content.decode() if isinstance(self.content, bytes) else self.content
+
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+
+class FakeS3(object):
+    """Storage provider pre-signing calls as URLs with parameters and keeping uploaded objects"""
+
+    def __init__(self):
+        # objects of DATASET_VERSION_ID
+        self.objects = {}
+        # objects of other dataset versions
+        self.versions = {}
+        # the pre-signed URLs endpoint signs copy sources resolved to bucket and key
+        self.sign_copy_source = True
+        self.parts = {}
+        self.api_calls = []
+        self.pre_sign_batches = []
+        self.copies = []
+        self.downloads = []
+        self.page_size = None
+        self.delete_requests = []
+        # number of transient failures of next requests of a key
+        self.failures = {}
+        self.protected_keys = set()
+        # keys of objects corrupted when they are uploaded or downloaded
+        self.corrupt_keys = set()
+        # keys of objects which can not be uploaded
+        self.rejected_keys = set()
+        self.etags = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def corrupt(data):
+        return data[:-1] + bytes([data[-1] ^ 1]) if data else data
+
+    def get_etag(self, key, objects=None):
+        objects = self.objects if objects is None else objects
+        return (objects is self.objects and self.etags.get(key)) or hashlib.md5(objects[key]).hexdigest()
+
+    def get_objects(self, dataset_version_id):
+        return self.objects if dataset_version_id == DATASET_VERSION_ID else self.versions[dataset_version_id]
+
+    @staticmethod
+    def resolve_copy_source(copy_source):
+        dataset_version_id, _, key = copy_source.partition("/")
+        return "bucket/{}/{}".format(dataset_version_id.replace(":", "/"), key)
+
+    def mount(self, prefix, adapter):
+        pass
+
+    def close(self):
+        pass
+
+    def post(self, url, json=None, data=None, **kwargs):
+        if url and url.startswith("s3://deleteObjects/"):
+            return self.delete_objects(data)
+
+        results = []
+        for call in json["calls"]:
+            with self.lock:
+                self.api_calls.append(call)
+            params = call["params"]
+
+            if call["method"] == "createMultipartUpload":
+                results.append({"url": {"UploadId": "upload-" + params["Key"]}})
+            elif call["method"] == "completeMultipartUpload":
+                parts = params["MultipartUpload"]["Parts"]
+                with self.lock:
+                    part_datas = [self.parts[(params["UploadId"], part["PartNumber"])] for part in parts]
+                    self.objects[params["Key"]] = b"".join(part_datas)
+                    md5 = hashlib.md5(b"".join(hashlib.md5(data).digest() for data in part_datas))
+                    self.etags[params["Key"]] = "{}-{}".format(md5.hexdigest(), len(parts))
+                results.append({"url": {"ETag": '"{}"'.format(self.etags[params["Key"]])}})
+            elif call["method"] == "deleteObjects":
+                results.append({"url": "s3://deleteObjects/?delete"})
+            else:
+                url = "s3://{}/{}?part={}".format(call["method"], params["Key"], params.get("PartNumber", ""))
+                if "CopySource" in params and self.sign_copy_source:
+                    url += "&x-amz-copy-source=" + quote(self.resolve_copy_source(params["CopySource"]), safe="")
+                results.append({"url": url})
+
+        return MockResponse(results)
+
+    def generate_pre_signed_s3_urls(self, dataset_version_id, calls):
+        with self.lock:
+            self.pre_sign_batches.append([call["method"] for call in calls])
+        return [mock.Mock(url=result["url"]) for result in self.post(None, json={"calls": calls}).json()]
+
+    def put(self, url, data=b"", headers=None, **kwargs):
+        if hasattr(data, "read"):
+            # bodies are sent in blocks like http.client does
+            data = b"".join(iter(lambda: data.read(8), b""))
+        data = data if isinstance(data, bytes) else data.encode()
+        method, _, rest = url[len("s3://"):].partition("/")
+        key, _, query = rest.partition("?")
+        query = dict(parse_qsl(query, keep_blank_values=True))
+        part_number = query["part"]
+        with self.lock:
+            if self.failures.get(key):
+                self.failures[key] -= 1
+                return MockResponse(status_code=503, content="SlowDown")
+            if key in self.rejected_keys:
+                return FakeDownloadResponse(status_code=403, content=b"AccessDenied")
+        if key in self.corrupt_keys:
+            data = self.corrupt(data)
+        with self.lock:
+            if method in ("copyObject", "uploadPartCopy"):
+                copy_source = headers["x-amz-copy-source"]
+                assert copy_source == query["x-amz-copy-source"]
+                self.copies.append((copy_source, key))
+                _, dataset_id, version, source_key = copy_source.split("/", 3)
+                data = self.get_objects("{}:{}".format(dataset_id, version))["/" + source_key]
+                if method == "uploadPartCopy":
+                    first_byte, _, last_byte = headers["x-amz-copy-source-range"][len("bytes="):].partition("-")
+                    data = data[int(first_byte):int(last_byte) + 1]
+
+            if method in ("uploadPart", "uploadPartCopy"):
+                self.parts[("upload-" + key, int(part_number))] = data
+            else:
+                self.objects[key] = data
+                self.etags.pop(key, None)
+
+        etag = hashlib.md5(data).hexdigest()
+        content = '<CopyPartResult xmlns="{}"><ETag>"{}"</ETag></CopyPartResult>'.format(commands.S3_XMLNS, etag)
+        return MockResponse(status_code=200, headers={"ETag": '"{}"'.format(etag)}, content=content)
+
+    def get(self, url, headers=None, **kwargs):
+        key = url[len("s3://getObject/"):].partition("?")[0]
+        with self.lock:
+            self.downloads.append((key, (headers or {}).get("Range")))
+            data = self.objects["/" + key]
+            response_headers = {"ETag": '"{}"'.format(self.get_etag("/" + key))}
+            if key in self.corrupt_keys:
+                data = self.corrupt(data)
+            if self.failures.get(key):
+                self.failures[key] -= 1
+                if headers and "Range" in headers:
+                    raise requests.exceptions.ConnectionError("Connection reset by peer")
+                return FakeDownloadResponse(status_code=503, content=b"SlowDown")
+
+        if headers and "Range" in headers:
+            first_byte, _, last_byte = headers["Range"][len("bytes="):].partition("-")
+            last_byte = int(last_byte) if last_byte else len(data) - 1
+            return FakeDownloadResponse(status_code=206, content=data[int(first_byte):last_byte + 1],
+                                        headers=response_headers)
+        return FakeDownloadResponse(status_code=200, content=data, headers=response_headers)
+
+    def delete_objects(self, data):
+        ns = {"s3": commands.S3_XMLNS}
+        errors = []
+        with self.lock:
+            self.delete_requests.append(data)
+            for key in ElementTree.fromstring(data).findall("s3:Object/s3:Key", ns):
+                if key.text in self.protected_keys:
+                    errors.append('<Error><Key>{}</Key><Code>AccessDenied</Code><Message>Access Denied</Message>'
+                                  '</Error>'.format(key.text))
+                else:
+                    self.objects.pop("/" + key.text, None)
+
+        content = '<DeleteResult xmlns="{}">{}</DeleteResult>'.format(commands.S3_XMLNS, "".join(errors))
+        return MockResponse(status_code=200, content=content)
+
+    def list_objects(self, dataset_version_id, path="/", **kwargs):
+        objects = self.get_objects(dataset_version_id)
+        results = [
+            {"key": key.lstrip("/"), "size": str(len(data)), "etag": self.get_etag(key, objects)}
+            for key, data in sorted(objects.items()) if key.startswith(path)
+        ]
+        page_size = self.page_size or len(results) or 1
+        for i in range(0, max(len(results), 1), page_size):
+            yield results[i:i + page_size], i + page_size < len(results)
+
+
+@mock.patch("gradient.commands.datasets.MULTIPART_CHUNK_SIZE", 10)
+@mock.patch("gradient.commands.datasets.MIN_PART_SIZE", 1)
+@mock.patch("gradient.commands.datasets.PART_UPLOAD_SECONDS", 0)
+@mock.patch("gradient.commands.datasets.PART_PRE_SIGN_BATCH_SIZE", 4)
+class TestPutDatasetFiles(object):
+    LARGE_CONTENT = bytes(range(95))
+
+    @pytest.fixture
+    def source_dir(self, tmpdir):
+        source_dir = tmpdir.mkdir("source")
+        source_dir.join("large.bin").write_binary(self.LARGE_CONTENT)
+        source_dir.join("small.txt").write_binary(b"small")
+        return source_dir
+
+    @pytest.fixture
+    def journal_dir(self, tmpdir):
+        config_dir = tmpdir.mkdir("config")
+        with mock.patch("gradient.commands.datasets.config.CONFIG_DIR_PATH", str(config_dir)):
+            yield str(config_dir.join("transfers"))
+
+    def execute(self, s3, source_dir, **kwargs):
+        command = commands.PutDatasetFilesCommand(api_key="some_key")
+        command._get_api_client = lambda: s3
+        command.client = s3
+
+        with mock.patch("gradient.commands.datasets.requests.Session") as session_patched, \
+                mock.patch.object(command, "assert_supported"):
+            session_patched.return_value = s3
+            command.execute(DATASET_VERSION_ID, [str(source_dir) + "/"], "/data", **kwargs)
+
+    def start_journal(self, s3, source_dir, journal_dir):
+        journal = commands.UploadJournal.open(DATASET_VERSION_ID, [str(source_dir) + "/"], "/data/",
+                                              directory=journal_dir)
+        small_stat = os.stat(str(source_dir.join("small.txt")))
+        journal.file_done("/data/small.txt", small_stat.st_size, small_stat.st_mtime_ns)
+
+        large_stat = os.stat(str(source_dir.join("large.bin")))
+        journal.upload_started("/data/large.bin", "upload-/data/large.bin", large_stat.st_size,
+                               large_stat.st_mtime_ns, 10)
+        for part_number in range(1, 4):
+            s3.parts[("upload-/data/large.bin", part_number)] = \
+                self.LARGE_CONTENT[(part_number - 1) * 10:part_number * 10]
+            journal.part_done("/data/large.bin", "upload-/data/large.bin", part_number, "etag")
+        journal.close()
+        return journal
+
+    def test_should_upload_parts_of_large_file_in_parallel_and_complete_upload(self, source_dir, journal_dir, capsys):
+        s3 = FakeS3()
+        events = []
+
+        self.execute(s3, source_dir, progress_callback=events.append)
+
+        assert s3.objects == {"/data/large.bin": self.LARGE_CONTENT, "/data/small.txt": b"small"}
+        complete_calls = [call for call in s3.api_calls if call["method"] == "completeMultipartUpload"]
+        assert len(complete_calls) == 1
+        assert [part["PartNumber"] for part in complete_calls[0]["params"]["MultipartUpload"]["Parts"]] == \
+            list(range(1, 11))
+        assert s3.pre_sign_batches == [["putObject"], ["uploadPart"] * 4, ["uploadPart"] * 4, ["uploadPart"] * 2]
+        assert not os.listdir(journal_dir)
+        assert sorted(event["key"] for event in events if event["event"] == "file_done") == \
+            ["/data/large.bin", "/data/small.txt"]
+        assert events[-1]["event"] == "finished"
+        assert (events[-1]["bytes_done"], events[-1]["bytes_total"], events[-1]["files_done"]) == (100, 100, 2)
+        assert "Uploaded part" not in capsys.readouterr().out
+
+    def test_should_limit_bandwidth_of_all_uploads(self, source_dir, journal_dir):
+        s3 = FakeS3()
+        limiter = mock.Mock()
+
+        self.execute(s3, source_dir, max_bandwidth=limiter)
+
+        assert s3.objects == {"/data/large.bin": self.LARGE_CONTENT, "/data/small.txt": b"small"}
+        assert sum(call[0][0] for call in limiter.consume.call_args_list) == 100
+
+    @mock.patch.object(commands.TRANSFER_RETRY_POLICY, "backoff_factor", 0)
+    def test_should_stream_parts_from_file_again_when_retrying_them(self, source_dir, journal_dir):
+        s3 = FakeS3()
+        s3.failures = {"/data/large.bin": 3}
+        events = []
+
+        self.execute(s3, source_dir, progress_callback=events.append)
+
+        assert s3.objects == {"/data/large.bin": self.LARGE_CONTENT, "/data/small.txt": b"small"}
+        assert s3.failures == {"/data/large.bin": 0}
+        assert (events[-1]["bytes_done"], events[-1]["bytes_total"], events[-1]["bytes_in_flight"]) == (100, 100, 0)
+
+    def test_should_raise_error_when_upload_is_rejected(self, source_dir, journal_dir):
+        s3 = FakeS3()
+        s3.rejected_keys = {"/data/small.txt"}
+
+        with pytest.raises(ApplicationError, match="Failed to upload 1 files:\n/data/small.txt: .*403"):
+            self.execute(s3, source_dir, resume=False)
+
+        assert s3.objects == {"/data/large.bin": self.LARGE_CONTENT}
+
+    def test_should_fail_and_keep_files_corrupted_during_upload_pending(self, source_dir, journal_dir):
+        s3 = FakeS3()
+        s3.corrupt_keys = {"/data/small.txt"}
+
+        with pytest.raises(ChecksumMismatchError) as exc_info:
+            self.execute(s3, source_dir)
+
+        assert "Checksum of {} does not match its ETag".format(source_dir.join("small.txt")) in str(exc_info.value)
+        assert str(exc_info.value).endswith("\nRun the command again to resume the upload")
+        assert os.listdir(journal_dir)
+
+        s3.corrupt_keys = set()
+        s3.pre_sign_batches = []
+        self.execute(s3, source_dir)
+
+        assert s3.objects["/data/small.txt"] == b"small"
+        assert s3.pre_sign_batches == [["putObject"]]
+
+    def test_should_fail_upload_of_corrupted_file_without_journal(self, source_dir, journal_dir):
+        s3 = FakeS3()
+        s3.corrupt_keys = {"/data/small.txt"}
+
+        with pytest.raises(ChecksumMismatchError, match="Failed to upload 1 files:\n/data/small.txt: Checksum"):
+            self.execute(s3, source_dir, resume=False)
+
+        assert not os.path.exists(journal_dir)
+
+    def test_should_fail_upload_of_file_with_corrupted_part(self, source_dir, journal_dir):
+        s3 = FakeS3()
+        s3.corrupt_keys = {"/data/large.bin"}
+
+        with pytest.raises(ChecksumMismatchError, match="Checksum of part [0-9]+ of .*large.bin"):
+            self.execute(s3, source_dir)
+
+        assert "/data/large.bin" not in s3.objects
+
+    def test_should_abort_failed_upload_which_can_not_be_resumed(self, source_dir, journal_dir):
+        s3 = FakeS3()
+        s3.corrupt_keys = {"/data/large.bin"}
+
+        with pytest.raises(ChecksumMismatchError):
+            self.execute(s3, source_dir, resume=False)
+
+        abort_calls = [call for call in s3.api_calls if call["method"] == "abortMultipartUpload"]
+        assert [call["params"] for call in abort_calls] == \
+            [{"Key": "/data/large.bin", "UploadId": "upload-/data/large.bin"}]
+
+    def test_should_abort_journaled_upload_of_file_uploaded_at_once_now(self, source_dir, journal_dir):
+        s3 = FakeS3()
+        journal = self.start_journal(s3, source_dir, journal_dir)
+
+        self.execute(s3, source_dir, part_size=100)
+
+        abort_calls = [call for call in s3.api_calls if call["method"] == "abortMultipartUpload"]
+        assert [call["params"]["UploadId"] for call in abort_calls] == ["upload-/data/large.bin"]
+        assert s3.pre_sign_batches == [["putObject"]]
+        assert s3.objects == {"/data/large.bin": self.LARGE_CONTENT}
+        assert not os.path.exists(journal.path)
+
+    def test_should_stop_pre_signing_parts_after_a_part_failed(self):
+        s3 = FakeS3()
+        command = commands.PutDatasetFilesCommand(api_key="some_key")
+        command.client = s3
+        pool = mock.Mock()
+        pool.has_exception.side_effect = [False, True]
+
+        batches = list(command._pre_sign_parts(DATASET_VERSION_ID, "/data/large.bin", "upload-/data/large.bin",
+                                               list(range(1, 11)), pool=pool))
+
+        assert [[part_number for part_number, _ in batch] for batch in batches] == [[1, 2, 3, 4]]
+        assert s3.pre_sign_batches == [["uploadPart"] * 4]
+
+    def test_should_resume_upload_recorded_in_journal(self, source_dir, journal_dir):
+        s3 = FakeS3()
+        journal = self.start_journal(s3, source_dir, journal_dir)
+        events = []
+
+        self.execute(s3, source_dir, progress_callback=events.append)
+
+        assert s3.objects == {"/data/large.bin": self.LARGE_CONTENT}
+        assert s3.pre_sign_batches == [["uploadPart"] * 4, ["uploadPart"] * 3]
+        assert not os.path.exists(journal.path)
+        assert (events[-1]["bytes_done"], events[-1]["bytes_total"], events[-1]["bytes_in_flight"]) == (95, 95, 0)
+
+    def test_should_abort_stale_uploads_when_requested(self, source_dir, journal_dir):
+        s3 = FakeS3()
+        self.start_journal(s3, source_dir, journal_dir)
+
+        self.execute(s3, source_dir, abort_stale_uploads=True)
+
+        assert [call["method"] for call in s3.api_calls][:2] == ["abortMultipartUpload", "createMultipartUpload"]
+        assert s3.objects == {"/data/large.bin": self.LARGE_CONTENT}
+        assert s3.pre_sign_batches == [["uploadPart"] * 4, ["uploadPart"] * 4, ["uploadPart"] * 2]
+
+
+class TestGetDatasetFiles(object):
+    def execute(self, s3, tmpdir, source_paths, **kwargs):
+        command = commands.GetDatasetFilesCommand(api_key="some_key", logger=mock.MagicMock())
+        command.client = s3
+        command.list_objects = s3.list_objects
+
+        with mock.patch("gradient.commands.datasets.requests.Session") as session_patched, \
+                mock.patch("gradient.commands.datasets.config.CONFIG_DIR_PATH", str(tmpdir.join("config"))), \
+                mock.patch.object(command, "assert_supported"), \
+                mock.patch.object(command, "resolve_dataset_version_id", lambda dataset_version_id: dataset_version_id):
+            session_patched.return_value = s3
+            command.execute(DATASET_VERSION_ID, source_paths, str(tmpdir.join("target")), **kwargs)
+
+        return session_patched
+
+    @mock.patch("gradient.commands.datasets.RANGED_DOWNLOAD_THRESHOLD", 10)
+    @mock.patch("gradient.commands.datasets.DOWNLOAD_PART_SIZE", 4)
+    def test_should_download_large_objects_in_ranges(self, tmpdir):
+        s3 = FakeS3()
+        s3.objects = {"/data/large.bin": bytes(range(95)), "/data/small.txt": b"small"}
+
+        self.execute(s3, tmpdir, ["/data/"])
+
+        target_dir = tmpdir.join("target")
+        assert sorted(os.listdir(str(target_dir))) == ["large.bin", "small.txt"]
+        assert target_dir.join("large.bin").read_binary() == bytes(range(95))
+        assert target_dir.join("small.txt").read_binary() == b"small"
+        assert len([key for key, byte_range in s3.downloads if key == "data/large.bin" and byte_range]) == 24
+        assert not tmpdir.join("config").exists()
+
+    @mock.patch("gradient.commands.datasets.RANGED_DOWNLOAD_THRESHOLD", 10)
+    @mock.patch("gradient.commands.datasets.DOWNLOAD_PART_SIZE", 4)
+    def test_should_limit_bandwidth_of_all_downloads(self, tmpdir):
+        s3 = FakeS3()
+        s3.objects = {"/data/large.bin": bytes(range(95)), "/data/small.txt": b"small"}
+        limiter = mock.Mock()
+
+        self.execute(s3, tmpdir, ["/data/"], max_bandwidth=limiter)
+
+        assert tmpdir.join("target", "large.bin").read_binary() == bytes(range(95))
+        assert sum(call[0][0] for call in limiter.consume.call_args_list) == 100
+
+    @mock.patch("gradient.commands.datasets.RANGED_DOWNLOAD_THRESHOLD", 10)
+    @mock.patch("gradient.commands.datasets.DOWNLOAD_PART_SIZE", 4)
+    def test_should_download_objects_of_all_listed_pages(self, tmpdir):
+        s3 = FakeS3()
+        s3.page_size = 2
+        s3.objects = {"/data/{}.txt".format(i): str(i).encode() for i in range(7)}
+        s3.objects["/other/file.txt"] = b"other"
+
+        self.execute(s3, tmpdir, ["/data/", "/other/"])
+
+        target_dir = tmpdir.join("target")
+        assert sorted(os.listdir(str(target_dir))) == ["{}.txt".format(i) for i in range(7)] + ["file.txt"]
+        assert target_dir.join("6.txt").read_binary() == b"6"
+        assert len(s3.pre_sign_batches) == 5
+
+    @mock.patch("gradient.commands.datasets.RANGED_DOWNLOAD_THRESHOLD", 10)
+    @mock.patch("gradient.commands.datasets.DOWNLOAD_PART_SIZE", 4)
+    @mock.patch.object(commands.TRANSFER_RETRY_POLICY, "backoff_factor", 0)
+    def test_should_retry_transient_failures_and_reuse_sessions_of_workers(self, tmpdir):
+        s3 = FakeS3()
+        s3.objects = {"/data/{}.txt".format(i): str(i).encode() for i in range(40)}
+        s3.objects["/data/large.bin"] = bytes(range(95))
+        s3.failures = {"data/7.txt": 2, "data/large.bin": 1}
+        events = []
+
+        session_patched = self.execute(s3, tmpdir, ["/data/"], progress_callback=events.append)
+
+        target_dir = tmpdir.join("target")
+        assert target_dir.join("7.txt").read_binary() == b"7"
+        assert target_dir.join("large.bin").read_binary() == bytes(range(95))
+        assert len([key for key, _ in s3.downloads if key == "data/7.txt"]) == 3
+        assert session_patched.call_count <= 16
+        assert (events[-1]["bytes_done"], events[-1]["files_done"]) == (95 + 40 + 30, 41)
+
+    @mock.patch.object(commands.TRANSFER_RETRY_POLICY, "backoff_factor", 0)
+    def test_should_fail_after_last_attempt(self, tmpdir):
+        s3 = FakeS3()
+        s3.objects = {"/data/file.txt": b"content"}
+        s3.failures = {"data/file.txt": 5}
+
+        with pytest.raises(ApplicationError, match="503"):
+            self.execute(s3, tmpdir, ["/data/"])
+
+        assert len(s3.downloads) == 5
+
+    def test_should_fail_download_of_corrupted_file(self, tmpdir):
+        s3 = FakeS3()
+        s3.objects = {"/data/file.txt": b"content"}
+        s3.corrupt_keys = {"data/file.txt"}
+
+        with pytest.raises(ChecksumMismatchError, match="Checksum of data/file.txt does not match its ETag"):
+            self.execute(s3, tmpdir, ["/data/"])
+
+        assert os.listdir(str(tmpdir.join("target"))) == []
+
+        self.execute(s3, tmpdir, ["/data/"], verify_checksums=False)
+
+        assert tmpdir.join("target", "file.txt").read_binary() == b"contenu"
+
+    def test_should_download_again_complete_leftovers_not_matching_etag(self, tmpdir):
+        s3 = FakeS3()
+        s3.objects = {"/data/same.txt": b"same", "/data/other.txt": b"other"}
+        target_dir = tmpdir.mkdir("target")
+        for name, content in (("same.txt", b"same"), ("other.txt", b"otheR")):
+            etag = hashlib.md5(s3.objects["/data/" + name]).hexdigest()
+            with open(commands.get_tmp_path(str(target_dir.join(name)), etag), "wb") as f:
+                f.write(content)
+
+        self.execute(s3, tmpdir, ["/data/"])
+
+        assert sorted(os.listdir(str(target_dir))) == ["other.txt", "same.txt"]
+        assert target_dir.join("other.txt").read_binary() == b"other"
+        assert target_dir.join("same.txt").read_binary() == b"same"
+        assert s3.downloads == [("data/other.txt", None)]
+
+    @mock.patch("gradient.commands.datasets.RANGED_DOWNLOAD_THRESHOLD", 10)
+    @mock.patch("gradient.commands.datasets.DOWNLOAD_PART_SIZE", 4)
+    def test_should_skip_downloaded_files_and_resume_partial_downloads(self, tmpdir):
+        s3 = FakeS3()
+        s3.objects = {
+            "/data/large.bin": bytes(range(95)),
+            "/data/small.txt": b"small text",
+            "/data/same.txt": b"same",
+        }
+        target_dir = tmpdir.mkdir("target")
+        target_dir.join("same.txt").write_binary(b"same")
+        small_tmp_path = commands.get_tmp_path(str(target_dir.join("small.txt")), hashlib.md5(b"small text").hexdigest())
+        with open(small_tmp_path, "wb") as f:
+            f.write(b"small")
+        large_path = str(target_dir.join("large.bin"))
+        download = commands.RangedDownload(large_path, 95, [(0, 3), (4, 7)], etag=hashlib.md5(bytes(range(95))).hexdigest())
+        download.write(bytes(range(4)), 0)
+        download.range_done(0, 3)
+        download.abort()
+
+        self.execute(s3, tmpdir, ["/data/"], skip_existing=True)
+
+        assert sorted(os.listdir(str(target_dir))) == ["large.bin", "same.txt", "small.txt"]
+        assert target_dir.join("large.bin").read_binary() == bytes(range(95))
+        assert target_dir.join("small.txt").read_binary() == b"small text"
+        assert ("data/small.txt", "bytes=5-") in s3.downloads
+        assert ("data/large.bin", "bytes=0-3") not in s3.downloads
+        assert not [key for key, _ in s3.downloads if key == "data/same.txt"]
+
+        s3.downloads = []
+        self.execute(s3, tmpdir, ["/data/"], skip_existing=True)
+
+        assert s3.downloads == []
+
+
+class TestDeleteDatasetFiles(object):
+    @mock.patch("gradient.commands.datasets.DELETE_OBJECTS_BATCH_SIZE", 2)
+    def test_should_delete_objects_in_batches_and_report_files_not_deleted(self):
+        s3 = FakeS3()
+        s3.objects = {"/data/{}.txt".format(i): b"content" for i in range(5)}
+        s3.objects["/other/file.txt"] = b"other"
+        s3.protected_keys = {"data/3.txt"}
+        command = commands.DeleteDatasetFilesCommand(api_key="some_key")
+        command.client = s3
+        command.list_objects = s3.list_objects
+
+        with mock.patch("gradient.commands.datasets.requests.Session") as session_patched, \
+                mock.patch.object(command, "assert_supported"):
+            session_patched.return_value = s3
+            with pytest.raises(ApplicationError, match="Failed to delete 1 files:\ndata/3.txt: AccessDenied Access Denied"):
+                command.execute(DATASET_VERSION_ID, ["/data/"])
+
+        assert s3.objects == {"/data/3.txt": b"content", "/other/file.txt": b"other"}
+        assert len(s3.delete_requests) == 3
+        assert s3.pre_sign_batches == [["deleteObjects"] * 3]
+
+
+class TestSyncDatasetFiles(object):
+    @pytest.fixture
+    def source_dir(self, tmpdir):
+        source_dir = tmpdir.mkdir("source")
+        source_dir.join("same.txt").write_binary(b"same")
+        source_dir.mkdir("sub").join("changed.txt").write_binary(b"new content")
+        source_dir.join("new.txt").write_binary(b"new")
+        return source_dir
+
+    def execute(self, s3, source_dir, tmpdir, **kwargs):
+        command = commands.SyncDatasetFilesCommand(api_key="some_key", logger=mock.MagicMock())
+        command._get_api_client = lambda: s3
+        command.client = s3
+        command.list_objects = s3.list_objects
+
+        with mock.patch("gradient.commands.datasets.requests.Session") as session_patched, \
+                mock.patch("gradient.commands.datasets.config.CONFIG_DIR_PATH", str(tmpdir.join("config"))), \
+                mock.patch.object(command, "assert_supported"), \
+                mock.patch.object(command, "resolve_dataset_version_id", lambda dataset_version_id: dataset_version_id):
+            session_patched.return_value = s3
+            return command.execute(str(source_dir), DATASET_VERSION_ID, "/data", **kwargs)
+
+    @mock.patch("gradient.commands.datasets.MAX_COPY_OBJECT_SIZE", 5)
+    @mock.patch("gradient.commands.datasets.COPY_PART_SIZE", 4)
+    @mock.patch("gradient.commands.datasets.MIN_PART_SIZE", 1)
+    def test_should_copy_unchanged_files_from_base_version(self, source_dir, tmpdir):
+        source_dir.join("large.bin").write_binary(b"0123456789")
+        s3 = FakeS3()
+        s3.versions[BASE_DATASET_VERSION_ID] = {
+            "/data/same.txt": b"same",
+            "/data/large.bin": b"0123456789",
+            "/data/sub/changed.txt": b"old content",
+            "/data/removed.txt": b"removed",
+        }
+
+        plan = self.execute(s3, source_dir, tmpdir, base_dataset_version_id=BASE_DATASET_VERSION_ID)
+
+        assert [result["key"] for result in plan.copies] == ["/data/large.bin", "/data/same.txt"]
+        assert [result["key"] for result in plan.uploads] == ["/data/new.txt", "/data/sub/changed.txt"]
+        assert plan.deletes == []
+        assert sorted(s3.copies) == [
+            ("bucket/dsttn2y7j1ux882/base/data/large.bin", "/data/large.bin"),
+            ("bucket/dsttn2y7j1ux882/base/data/large.bin", "/data/large.bin"),
+            ("bucket/dsttn2y7j1ux882/base/data/large.bin", "/data/large.bin"),
+            ("bucket/dsttn2y7j1ux882/base/data/same.txt", "/data/same.txt"),
+        ]
+        assert s3.objects == {
+            "/data/same.txt": b"same",
+            "/data/large.bin": b"0123456789",
+            "/data/sub/changed.txt": b"new content",
+            "/data/new.txt": b"new",
+        }
+
+    @mock.patch("gradient.commands.datasets.MAX_COPY_OBJECT_SIZE", 5)
+    @mock.patch("gradient.commands.datasets.COPY_PART_SIZE", 4)
+    @mock.patch("gradient.commands.datasets.MIN_PART_SIZE", 1)
+    def test_should_upload_unchanged_files_when_copy_source_is_not_signed(self, source_dir, tmpdir):
+        source_dir.join("large.bin").write_binary(b"0123456789")
+        s3 = FakeS3()
+        s3.sign_copy_source = False
+        s3.versions[BASE_DATASET_VERSION_ID] = {"/data/same.txt": b"same", "/data/large.bin": b"0123456789"}
+        events = []
+
+        self.execute(s3, source_dir, tmpdir, base_dataset_version_id=BASE_DATASET_VERSION_ID,
+                     progress_callback=events.append)
+
+        assert s3.copies == []
+        assert [call["params"]["UploadId"] for call in s3.api_calls if call["method"] == "abortMultipartUpload"] == \
+            ["upload-/data/large.bin"]
+        assert s3.objects == {
+            "/data/same.txt": b"same",
+            "/data/large.bin": b"0123456789",
+            "/data/sub/changed.txt": b"new content",
+            "/data/new.txt": b"new",
+        }
+        assert (events[-1]["files_done"], events[-1]["files_total"]) == (4, 4)
+
+    def test_should_upload_new_and_changed_files_and_delete_remote_extras(self, source_dir, tmpdir):
+        s3 = FakeS3()
+        s3.objects = {
+            "/data/same.txt": b"same",
+            "/data/sub/changed.txt": b"old content",
+            "/data/removed.txt": b"removed",
+            "/other/file.txt": b"other",
+        }
+
+        plan = self.execute(s3, source_dir, tmpdir, delete=True, dry_run=True)
+
+        assert [(result["change"], result["key"]) for result in plan.uploads] == \
+            [("+", "/data/new.txt"), ("~", "/data/sub/changed.txt")]
+        assert [result["key"] for result in plan.deletes] == ["data/removed.txt"]
+        assert plan.unchanged_count == 1
+        assert s3.objects["/data/sub/changed.txt"] == b"old content"
+
+        self.execute(s3, source_dir, tmpdir, delete=True)
+
+        assert s3.objects == {
+            "/data/same.txt": b"same",
+            "/data/sub/changed.txt": b"new content",
+            "/data/new.txt": b"new",
+            "/other/file.txt": b"other",
+        }
+
+        plan = self.execute(s3, source_dir, tmpdir, delete=True)
+        assert (plan.uploads, plan.deletes, plan.unchanged_count) == ([], [], 3)
+
+    def test_should_raise_error_and_not_record_files_rejected_by_storage_provider(self, source_dir, tmpdir):
+        s3 = FakeS3()
+        s3.objects = {"/data/same.txt": b"same"}
+        s3.rejected_keys = {"/data/new.txt"}
+
+        with pytest.raises(ApplicationError, match="Failed to upload 1 files:\n/data/new.txt: .*403"):
+            self.execute(s3, source_dir, tmpdir)
+
+        assert sorted(s3.objects) == ["/data/same.txt", "/data/sub/changed.txt"]
+
+        s3.rejected_keys = set()
+        plan = self.execute(s3, source_dir, tmpdir)
+
+        assert [result["key"] for result in plan.uploads] == ["/data/new.txt"]
+        assert s3.objects["/data/new.txt"] == b"new"
+
+    @mock.patch("gradient.commands.datasets.DELETE_OBJECTS_BATCH_SIZE", 2)
+    def test_should_pre_sign_deletes_of_remote_extras_in_batches(self, source_dir, tmpdir):
+        s3 = FakeS3()
+        s3.objects = {"/data/removed-{}.txt".format(i): b"removed" for i in range(5)}
+        s3.objects.update({"/data/same.txt": b"same", "/data/sub/changed.txt": b"new content", "/data/new.txt": b"new"})
+
+        self.execute(s3, source_dir, tmpdir, delete=True)
+
+        assert sorted(s3.objects) == ["/data/new.txt", "/data/same.txt", "/data/sub/changed.txt"]
+        assert s3.pre_sign_batches == [["deleteObjects"]] * 3
+        assert len(s3.delete_requests) == 3
+
+    @mock.patch("gradient.commands.datasets.MIN_PART_SIZE", 1)
+    @mock.patch("gradient.commands.datasets.PART_UPLOAD_SECONDS", 0)
+    def test_should_record_etags_of_multipart_uploads_computed_from_parts(self, source_dir, tmpdir):
+        source_dir.join("large.bin").write_binary(bytes(range(95)))
+        s3 = FakeS3()
+
+        self.execute(s3, source_dir, tmpdir, part_size=10)
+
+        assert s3.objects["/data/large.bin"] == bytes(range(95))
+        assert s3.etags["/data/large.bin"].endswith("-10")
+
+        with mock.patch("gradient.commands.datasets.file_md5") as file_md5:
+            plan = self.execute(s3, source_dir, tmpdir, part_size=10)
+
+        assert (plan.uploads, plan.unchanged_count) == ([], 4)
+        file_md5.assert_not_called()
+
+
+class TestCreateDatasetVersion(object):
+    @mock.patch("gradient.commands.datasets.api_sdk.clients.DatasetVersionsClient")
+    @mock.patch("gradient.commands.datasets.SyncDatasetFilesCommand")
+    def test_should_commit_version_derived_from_base_version(self, sync_command_patched, client_patched, tmpdir):
+        client_patched.return_value.create.return_value = "new"
+        client_patched.return_value.get.return_value.is_committed = False
+        command = commands.CreateDatasetVersionCommand(api_key="some_key", logger=mock.MagicMock())
+
+        command.execute("dsttn2y7j1ux882", source_paths=[str(tmpdir)],
+                        base_dataset_version_id="dsttn2y7j1ux882:base")
+
+        sync_command_patched.return_value.execute.assert_called_once_with(
+            str(tmpdir), "dsttn2y7j1ux882:new", target_path="/" + os.path.basename(str(tmpdir)),
+            base_dataset_version_id="dsttn2y7j1ux882:base")
+        client_patched.return_value.update.assert_called_once_with("dsttn2y7j1ux882:new", is_committed=True)
+
+    @mock.patch("gradient.commands.datasets.api_sdk.clients.DatasetVersionsClient")
+    @mock.patch("gradient.commands.datasets.PutDatasetFilesCommand")
+    def test_should_not_commit_version_with_files_not_uploaded(self, put_command_patched, client_patched, tmpdir):
+        client_patched.return_value.create.return_value = "new"
+        put_command_patched.return_value.execute.side_effect = ApplicationError("1 files were not uploaded.")
+        command = commands.CreateDatasetVersionCommand(api_key="some_key", logger=mock.MagicMock())
+
+        with pytest.raises(ApplicationError):
+            command.execute("dsttn2y7j1ux882", source_paths=[str(tmpdir)])
+
+        assert "gradient datasets files put --id dsttn2y7j1ux882:new --source-path {}".format(tmpdir) in \
+            put_command_patched.return_value.resume_hint
+        client_patched.return_value.update.assert_not_called()
+
+
+class TestWorkerPool(object):
+    def test_should_raise_exception_of_failed_task_after_dropping_queued_work(self):
+        def fail():
+            raise ValueError("task failed")
+
+        with pytest.raises(ValueError, match="task failed"):
+            with commands.WorkerPool(count=2) as pool:
+                pool.put(fail)
+                for _ in range(10):
+                    pool.put(lambda: None)
+
+
+class TestPrefetch(object):
+    def test_should_yield_items_and_raise_exceptions_of_iterable(self):
+        def items():
+            yield 1
+            yield 2
+            raise ValueError("broken iterable")
+
+        results = []
+        with pytest.raises(ValueError, match="broken iterable"):
+            for item in commands.prefetch(items()):
+                results.append(item)
+
+        assert results == [1, 2]
+
+    def test_should_stop_iterating_when_consumer_stops(self):
+        produced = []
+        closed = threading.Event()
+
+        def items():
+            try:
+                for i in range(100):
+                    produced.append(i)
+                    yield i
+            finally:
+                closed.set()
+
+        for item in commands.prefetch(items()):
+            break
+
+        assert closed.wait(5)
+        assert len(produced) < 100
+
+
+class TestTransferProgress(object):
+    def test_should_report_bytes_throughput_and_eta(self):
+        now = [0.0]
+        events = []
+        progress = commands.TransferProgress(callback=events.append, clock=lambda: now[0])
+        progress.add("a", 100)
+        progress.add("b", 300)
+
+        now[0] = 2.0
+        progress.update("a", 60)
+        progress.update("b", 20)
+        now[0] = 4.0
+        progress.update("b", -20)
+        progress.file_done("a", 100)
+
+        stats = progress.get_stats()
+        assert (stats["bytes_done"], stats["bytes_total"], stats["bytes_in_flight"]) == (100, 400, 0)
+        assert (stats["files_done"], stats["files_total"]) == (1, 2)
+        assert stats["throughput"] == 25
+        assert stats["eta"] == 12
+        assert [event["event"] for event in events] == ["progress", "progress", "file_done"]
+        assert progress.format() == "100B of 400B (1 of 2 files), 25B/s, ETA 0:00:12"
+
+    @pytest.mark.parametrize("size,expected", [(999, "999B"), (1500, "1.5KB"), (2 * 10 ** 9, "2.0GB")])
+    def test_should_format_byte_size(self, size, expected):
+        assert commands.format_byte_size(size) == expected
+
+
+class TestGetPartSize(object):
+    @pytest.mark.parametrize("size,part_size,throughput,expected", [
+        (10 ** 9, None, None, commands.MULTIPART_CHUNK_SIZE),
+        (10 ** 9, None, 50e6, 50e6 * commands.PART_UPLOAD_SECONDS),
+        (10 ** 9, 1, None, commands.MIN_PART_SIZE),
+        (10 ** 9, 64 * 10 ** 6, 50e6, 64 * 10 ** 6),
+        (10 ** 12, None, None, 10 ** 8),
+        (10 ** 13, None, 10e9, commands.MAX_PART_SIZE),
+    ])
+    def test_should_keep_part_size_within_s3_limits(self, size, part_size, throughput, expected):
+        assert commands.get_part_size(size, part_size=part_size, throughput=throughput) == expected
+
+    def test_should_raise_error_when_file_can_not_fit_in_max_part_count(self):
+        with pytest.raises(ApplicationError):
+            commands.get_part_size(commands.MAX_PART_SIZE * commands.MAX_PART_COUNT + 1)
@@ -0,0 +1,104 @@
+import threading
+import time
+
+from gradient.api_sdk import rate_limiter
+from gradient.api_sdk.logger import MuteLogger
+from gradient.api_sdk.repositories import GetNotebook, ListNotebookLogs
+from tests import MockResponse
+
+
+class TestAdaptiveRateLimiter(object):
+    def test_should_shrink_on_throttling_and_grow_on_success(self):
+        limiter = rate_limiter.AdaptiveRateLimiter(initial_limit=8, decrease_cooldown=0)
+
+        limiter.acquire()
+        limiter.release(response=MockResponse(status_code=429))
+        assert limiter.limit == 4
+
+        for _ in range(5):
+            limiter.acquire()
+            limiter.release(response=MockResponse(status_code=200))
+        assert limiter.limit == 5
+
+    def test_should_shrink_once_per_cooldown(self):
+        limiter = rate_limiter.AdaptiveRateLimiter(initial_limit=16, decrease_cooldown=60)
+
+        for _ in range(3):
+            limiter.acquire()
+            limiter.release(response=MockResponse(status_code=503))
+
+        assert limiter.limit == 8
+
+    def test_should_not_exceed_limit_of_concurrent_requests(self):
+        limiter = rate_limiter.AdaptiveRateLimiter(initial_limit=3, max_limit=3)
+        in_flight = []
+        max_in_flight = []
+        lock = threading.Lock()
+
+        def send():
+            slot = limiter.acquire()
+            with lock:
+                in_flight.append(1)
+                max_in_flight.append(len(in_flight))
+            time.sleep(0.01)
+            with lock:
+                in_flight.pop()
+            limiter.release(slot, MockResponse(status_code=200))
+
+        threads = [threading.Thread(target=send) for _ in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert max(max_in_flight) <= 3
+
+
+class TestLockFileSlots(object):
+    def test_should_share_slots_between_instances(self, tmpdir):
+        first = rate_limiter.LockFileSlots(str(tmpdir), "api.paperspace.io")
+        second = rate_limiter.LockFileSlots(str(tmpdir), "api.paperspace.io")
+
+        first_slot = first.acquire(2)
+        second_slot = second.acquire(2)
+
+        assert {first_slot, second_slot} == {0, 1}
+        assert second._try_acquire(2) is None
+
+        first.release(first_slot)
+        assert second._try_acquire(2) == first_slot
+
+
+class TestRateLimiterRegistry(object):
+    def test_repositories_should_share_limiter_of_the_same_host(self):
+        get_notebook = GetNotebook("some_key", logger=MuteLogger())
+        other_get_notebook = GetNotebook("some_key", logger=MuteLogger())
+        list_logs = ListNotebookLogs("some_key", logger=MuteLogger())
+
+        limiter = get_notebook._get_client().rate_limiter
+
+        assert other_get_notebook._get_client().rate_limiter is limiter
+        assert list_logs._get_client().rate_limiter is not limiter
+
+
+class TestBandwidthLimiter(object):
+    def test_should_wait_until_debt_of_transferred_bytes_is_paid_back(self):
+        now = [0.0]
+        delays = []
+
+        def sleep(delay):
+            delays.append(delay)
+            now[0] += delay
+
+        limiter = rate_limiter.BandwidthLimiter(100, clock=lambda: now[0], sleep=sleep)
+
+        limiter.consume(100)
+        assert delays == []
+
+        limiter.consume(50)
+        limiter.consume(150)
+        assert delays == [0.5, 1.5]
+
+        now[0] += 10
+        limiter.consume(100)
+        assert delays == [0.5, 1.5]
@@ -0,0 +1,71 @@
+import mock
+
+from gradient.api_sdk import logger as sdk_logger
+from gradient.clilogger import CliLogger
+from gradient.api_sdk.clients import http_client
+from tests import MockResponse
+
+
+class ListLogger(sdk_logger.Logger):
+    def __init__(self):
+        self.messages = []
+
+    def log(self, msg, *args, **kwargs):
+        pass
+
+    def warning(self, msg, *args, **kwargs):
+        pass
+
+    def error(self, msg, *args, **kwargs):
+        pass
+
+    def debug(self, msg, *args, **kwargs):
+        self.messages.append(msg)
+
+
+class TestRequestLogging(object):
+    @mock.patch("gradient.api_sdk.clients.http_client.sdk_logger.RequestLogRecord")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    def test_should_not_build_log_records_when_debug_is_disabled(self, get_patched, record_patched):
+        get_patched.return_value = MockResponse({"a": 1})
+        api = http_client.API("https://api.paperspace.io", api_key="secret_key", logger=sdk_logger.MuteLogger())
+
+        api.get("/some/url", params={"a": 1})
+
+        record_patched.assert_not_called()
+
+    @mock.patch("gradient.api_sdk.clients.http_client.sdk_logger.RequestLogRecord")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    @mock.patch("gradient.clilogger.config.DEBUG", False)
+    def test_should_not_build_log_records_for_cli_logger_when_debug_is_off(self, get_patched, record_patched):
+        get_patched.return_value = MockResponse({"a": 1})
+        api = http_client.API("https://api.paperspace.io", api_key="secret_key", logger=CliLogger())
+
+        api.get("/some/url", params={"a": 1})
+
+        record_patched.assert_not_called()
+
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.post")
+    def test_should_log_request_and_response_with_redacted_api_key(self, post_patched):
+        post_patched.return_value = MockResponse({"a": 1}, content=b'{"a": 1}')
+        logger = ListLogger()
+        api = http_client.API("https://api.paperspace.io", api_key="secret_key", logger=logger)
+
+        api.post("/some/url", json={"b": 2})
+
+        request_record, response_record = logger.messages
+        assert request_record.to_dict()["headers"]["X-API-Key"] == "<redacted>"
+        assert request_record.to_dict()["json"] == {"b": 2}
+        assert "secret_key" not in str(request_record)
+        assert "https://api.paperspace.io/some/url" in str(request_record)
+        assert response_record.to_dict()["status_code"] == 200
+        assert response_record.elapsed >= 0
+        assert "Response status code: 200" in str(response_record)
+        post_patched.assert_called_once_with(
+            "https://api.paperspace.io/some/url",
+            json={"b": 2},
+            params=None,
+            headers=api.headers,
+            files=None,
+            data=None,
+        )
@@ -0,0 +1,84 @@
+import json
+
+import mock
+
+from gradient.api_sdk import ResponseCache, repositories
+from gradient.api_sdk.logger import MuteLogger
+from tests import MockResponse
+
+DATASET = {"id": "dsr8k5qzn401lb5", "name": "some_name", "description": None, "storageProvider": None}
+
+
+def dataset_response(status_code=200, etag="v1"):
+    return MockResponse(DATASET, status_code=status_code, content=json.dumps(DATASET), headers={"ETag": etag})
+
+
+class TestResponseCache(object):
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    def test_should_return_cached_response_until_ttl_expires(self, get_patched, tmpdir):
+        get_patched.return_value = dataset_response()
+        cache = ResponseCache(directory=str(tmpdir))
+        repository = repositories.GetDataset("some_key", logger=MuteLogger(), response_cache=cache)
+
+        first = repository.get(id="dsr8k5qzn401lb5")
+        second = repository.get(id="dsr8k5qzn401lb5")
+
+        assert get_patched.call_count == 1
+        assert first.name == second.name == "some_name"
+
+        # other process using the same cache directory
+        other_repository = repositories.GetDataset("some_key", logger=MuteLogger(),
+                                                   response_cache=ResponseCache(directory=str(tmpdir)))
+        other_repository.get(id="dsr8k5qzn401lb5")
+        assert get_patched.call_count == 1
+
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    def test_should_revalidate_expired_response_with_etag(self, get_patched, tmpdir):
+        get_patched.side_effect = [dataset_response(), MockResponse(status_code=304)]
+        cache = ResponseCache(directory=str(tmpdir))
+        repository = repositories.GetDataset("some_key", logger=MuteLogger(), response_cache=cache)
+        repository.get(id="dsr8k5qzn401lb5")
+
+        with mock.patch("gradient.api_sdk.response_cache.time.time", return_value=2 ** 40):
+            dataset = repository.get(id="dsr8k5qzn401lb5")
+
+        assert dataset.name == "some_name"
+        assert get_patched.call_args[1]["headers"]["If-None-Match"] == "v1"
+
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    def test_should_revalidate_with_the_request_repository_fetched_with(self, get_patched, tmpdir):
+        get_patched.side_effect = [dataset_response(), MockResponse(status_code=304)]
+        repository = repositories.GetDataset("some_key", logger=MuteLogger(),
+                                             response_cache=ResponseCache(directory=str(tmpdir)))
+
+        with mock.patch.object(repository, "_send_request", wraps=repository._send_request) as send_patched:
+            repository.get(id="dsr8k5qzn401lb5")
+            with mock.patch("gradient.api_sdk.response_cache.time.time", return_value=2 ** 40):
+                repository.get(id="dsr8k5qzn401lb5")
+
+        assert send_patched.call_count == 2
+        assert send_patched.call_args[1]["headers"] == {"If-None-Match": "v1"}
+
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.delete")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    def test_should_invalidate_family_when_resource_changes(self, get_patched, delete_patched, tmpdir):
+        get_patched.return_value = dataset_response()
+        delete_patched.return_value = MockResponse({}, status_code=200)
+        cache = ResponseCache(directory=str(tmpdir))
+        get_repository = repositories.GetDatasetRef("some_key", logger=MuteLogger(), response_cache=cache)
+        delete_repository = repositories.DeleteDatasetVersion("some_key", logger=MuteLogger(), response_cache=cache)
+
+        get_repository.get(id="dsr8k5qzn401lb5:latest")
+        delete_repository.delete("dsr8k5qzn401lb5:abc")
+        get_repository.get(id="dsr8k5qzn401lb5:latest")
+
+        assert get_patched.call_count == 2
+
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    def test_should_not_cache_without_cache_or_ttl(self, get_patched):
+        get_patched.return_value = dataset_response()
+        repository = repositories.GetDataset("some_key", logger=MuteLogger())
+        repository.get(id="dsr8k5qzn401lb5")
+        repository.get(id="dsr8k5qzn401lb5")
+
+        assert get_patched.call_count == 2
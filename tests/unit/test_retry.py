@@ -0,0 +1,83 @@
+import mock
+import requests
+
+from gradient.api_sdk import RetryPolicy, repositories
+from gradient.api_sdk.clients import http_client
+from gradient.api_sdk.logger import MuteLogger
+from tests import MockResponse
+
+
+class TestRetryPolicy(object):
+    def test_should_retry_idempotent_methods_only_by_default(self):
+        policy = RetryPolicy()
+
+        assert policy.get_retry_delay("GET", 0, MockResponse(status_code=503)) is not None
+        assert policy.get_retry_delay("POST", 0, MockResponse(status_code=503)) is None
+        assert RetryPolicy(retry_all_methods=True).get_retry_delay("POST", 0, MockResponse(status_code=503)) \
+            is not None
+
+    def test_should_not_retry_not_transient_errors_and_after_max_retries(self):
+        policy = RetryPolicy(max_retries=2)
+
+        assert policy.get_retry_delay("GET", 0, MockResponse(status_code=404)) is None
+        assert policy.get_retry_delay("GET", 2, MockResponse(status_code=503)) is None
+
+    def test_should_limit_backoff_with_jitter(self):
+        policy = RetryPolicy(backoff_factor=1, max_backoff=5)
+
+        for attempt in range(10):
+            delay = policy.get_retry_delay("GET", 0)
+            assert 0 <= delay <= 1
+            assert 0 <= policy.get_backoff(attempt) <= 5
+
+    def test_should_honour_retry_after_header(self):
+        policy = RetryPolicy(max_retry_after=60)
+
+        assert policy.get_retry_delay("GET", 0, MockResponse(status_code=429, headers={"Retry-After": "7"})) == 7
+        assert policy.get_retry_delay("GET", 0, MockResponse(status_code=429, headers={"Retry-After": "600"})) == 60
+        assert policy.get_retry_delay(
+            "GET", 0, MockResponse(status_code=503, headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})) == 0
+
+
+class TestApiRetries(object):
+    @mock.patch("gradient.api_sdk.clients.http_client.time.sleep")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    def test_should_retry_transient_failures(self, get_patched, sleep_patched):
+        get_patched.side_effect = [
+            requests.exceptions.ConnectionError("connection reset"),
+            MockResponse(status_code=502),
+            MockResponse({"id": 1}),
+        ]
+        api = http_client.API("https://api.paperspace.io", retry_policy=RetryPolicy())
+
+        response = api.get("/some/url")
+
+        assert response.status_code == 200
+        assert get_patched.call_count == 3
+        assert sleep_patched.call_count == 2
+
+    @mock.patch("gradient.api_sdk.clients.http_client.time.sleep")
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    def test_should_return_last_response_when_retries_are_exhausted(self, get_patched, sleep_patched):
+        get_patched.return_value = MockResponse(status_code=503)
+        api = http_client.API("https://api.paperspace.io", retry_policy=RetryPolicy(max_retries=2))
+
+        response = api.get("/some/url")
+
+        assert response.status_code == 503
+        assert get_patched.call_count == 3
+
+
+class TestRepositoriesRetryPolicy(object):
+    def test_only_reading_repositories_should_retry_by_default(self):
+        get_repository = repositories.GetNotebook("some_key", logger=MuteLogger())
+        create_repository = repositories.CreateNotebook("some_key", logger=MuteLogger())
+
+        assert get_repository._get_client().retry_policy is not None
+        assert create_repository._get_client().retry_policy is None
+
+    def test_explicit_retry_policy_should_be_used_by_creating_repositories(self):
+        policy = RetryPolicy(retry_all_methods=True)
+        create_repository = repositories.CreateNotebook("some_key", logger=MuteLogger(), retry_policy=policy)
+
+        assert create_repository._get_client().retry_policy is policy
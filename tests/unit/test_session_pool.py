@@ -0,0 +1,67 @@
+import threading
+
+import mock
+
+from gradient.api_sdk import SdkClient, repositories
+from gradient.api_sdk.clients import http_client
+
+
+class TestSessionPool(object):
+    def test_should_reuse_session_for_the_same_api_url(self):
+        pool = http_client.SessionPool(pool_size=4)
+
+        session = pool.get_session("https://api.paperspace.io")
+
+        assert pool.get_session("https://api.paperspace.io") is session
+        assert pool.get_session("https://logs.paperspace.io") is not session
+
+    def test_should_close_all_sessions_when_leaving_context(self):
+        with mock.patch("gradient.api_sdk.clients.http_client.requests.Session.close") as close_patched:
+            with http_client.SessionPool() as pool:
+                pool.get_session("https://api.paperspace.io")
+                pool.get_session("https://logs.paperspace.io")
+
+        assert close_patched.call_count == 2
+
+    def test_api_should_send_requests_through_pooled_session(self):
+        pool = http_client.SessionPool()
+        session = pool.get_session("https://api.paperspace.io")
+        api = http_client.API("https://api.paperspace.io", api_key="some_key", session_pool=pool)
+
+        with mock.patch.object(session, "get") as get_patched:
+            api.get("/notebooks/getNotebook", params={"a": 1})
+
+        get_patched.assert_called_once_with(
+            "https://api.paperspace.io/notebooks/getNotebook",
+            params={"a": 1},
+            headers=api.headers,
+            json=None,
+        )
+
+
+class TestThreadLocalSessionPool(object):
+    def test_should_keep_one_session_per_thread(self):
+        pool = http_client.ThreadLocalSessionPool()
+        session = pool.get_session()
+        sessions = []
+
+        thread = threading.Thread(target=lambda: sessions.append(pool.get_session()))
+        thread.start()
+        thread.join()
+
+        assert pool.get_session("https://other.host") is session
+        assert sessions[0] is not session
+
+        pool.close()
+        assert pool.get_session() is not session
+
+
+class TestSdkClientSessionPool(object):
+    def test_should_share_one_pool_between_all_repositories(self):
+        with SdkClient(api_key="some_key", pool_size=2) as client:
+            notebooks_repository = client.notebooks.build_repository(repositories.GetNotebook)
+            machines_repository = client.machines.build_repository(repositories.GetMachine)
+
+            assert notebooks_repository.session_pool is client.session_pool
+            assert machines_repository.session_pool is client.session_pool
+            assert client.session_pool.pool_size == 2
@@ -0,0 +1,65 @@
+import threading
+import time
+
+import mock
+import pytest
+
+from gradient.api_sdk import repositories
+from gradient.api_sdk.logger import MuteLogger
+from gradient.api_sdk.singleflight import SingleFlight
+from tests import MockResponse
+
+DATASET = {"id": "dsr8k5qzn401lb5", "name": "some_name", "description": None, "storageProvider": None}
+
+
+def run_concurrently(fn, n):
+    results = [None] * n
+
+    def target(i):
+        try:
+            results[i] = fn()
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(n)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+class TestSingleFlight(object):
+    def test_should_not_keep_finished_calls(self):
+        group = SingleFlight()
+
+        with pytest.raises(ValueError):
+            group.do("key", mock.MagicMock(side_effect=ValueError("error")))
+
+        assert group.do("key", lambda: "result") == "result"
+        assert group._calls == {}
+
+    @mock.patch("gradient.api_sdk.clients.http_client.requests.get")
+    def test_concurrent_identical_gets_should_send_one_request(self, get_patched):
+        started = threading.Event()
+        release = threading.Event()
+
+        def get(*args, **kwargs):
+            started.set()
+            release.wait(5)
+            return MockResponse(DATASET)
+
+        get_patched.side_effect = get
+        leader = threading.Thread(
+            target=lambda: repositories.GetDataset("some_key", logger=MuteLogger()).get(id="dsr8k5qzn401lb5"))
+        leader.start()
+        started.wait(5)
+
+        threads, results = run_concurrently(
+            lambda: repositories.GetDataset("some_key", logger=MuteLogger()).get(id="dsr8k5qzn401lb5"), 4)
+        time.sleep(0.2)
+        release.set()
+        leader.join()
+        for thread in threads:
+            thread.join()
+
+        assert [dataset.name for dataset in results] == ["some_name"] * 4
+        assert get_patched.call_count == 1